@@ -0,0 +1,118 @@
+// FOI request search over the prebuilt index shards written by build_search_index() (docs/search_index)
+// only the term/record shards a query needs are downloaded, each at most once per page view
+(function () {
+    "use strict";
+
+    var STOPWORDS = ["a", "an", "and", "are", "as", "at", "by", "for", "from", "in", "is", "of", "on", "or", "the", "to", "with"];
+    var MAX_RESULTS = 100;
+    var shardCache = {};
+
+    function loadShard(base, path) {
+        if (!shardCache[path]) {
+            shardCache[path] = fetch(base + path)
+                .then(function (response) { return response.ok ? response.json() : {}; })
+                .catch(function () { return {}; });
+        }
+        return shardCache[path];
+    }
+
+    // same rules as search_tokens() in the scrape tool, keeping status:/year: filters
+    function tokenise(query) {
+        return query.toLowerCase().replace(/[^\x00-\x7f]/g, "").split(/[^a-z0-9:]+/).filter(function (token) {
+            return token.length > 1 && STOPWORDS.indexOf(token) === -1;
+        });
+    }
+
+    // ids for token, last (still being typed) token also matches as a prefix
+    function lookupToken(base, token, isPrefix) {
+        return loadShard(base, "terms/" + token.slice(0, 2) + ".json").then(function (terms) {
+            var ids = {};
+            Object.keys(terms).forEach(function (term) {
+                if (term === token || (isPrefix && term.indexOf(token) === 0)) {
+                    terms[term].forEach(function (id) { ids[id] = true; });
+                }
+            });
+            return ids;
+        });
+    }
+
+    function escapeHtml(text) {
+        return String(text).replace(/[&<>"]/g, function (c) {
+            return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c];
+        });
+    }
+
+    function sortableDate(date) {
+        var parts = date.split("/"); // dd/mm/yyyy
+        return parts.length === 3 ? parts[2] + parts[1] + parts[0] : "";
+    }
+
+    function search(container, query) {
+        var base = container.getAttribute("data-index");
+        var summary = container.querySelector("#foi-search-summary");
+        var results = container.querySelector("#foi-search-results");
+        var tokens = tokenise(query);
+
+        if (!tokens.length) {
+            summary.textContent = "";
+            results.innerHTML = "";
+            return;
+        }
+
+        Promise.all(tokens.map(function (token, i) {
+            return lookupToken(base, token, i === tokens.length - 1);
+        })).then(function (idSets) {
+            // records matching every token
+            var ids = Object.keys(idSets[0]).filter(function (id) {
+                return idSets.every(function (set) { return set[id]; });
+            });
+
+            var shards = {};
+            ids.forEach(function (id) { shards[id.charAt(0)] = true; });
+
+            return Promise.all(Object.keys(shards).map(function (key) {
+                return loadShard(base, "records/" + key + ".json");
+            })).then(function (recordShards) {
+                var records = [];
+                ids.forEach(function (id) {
+                    recordShards.forEach(function (shard) { if (shard[id]) { records.push(shard[id]); } });
+                });
+                return records;
+            });
+        }).then(function (records) {
+            if (tokenise(container.querySelector("#foi-search-input").value).join(" ") !== tokens.join(" ")) {
+                return; // query changed while shards were loading
+            }
+
+            records.sort(function (a, b) { return sortableDate(b[3]).localeCompare(sortableDate(a[3])); });
+            summary.textContent = records.length + " matching requests" + (records.length > MAX_RESULTS ? ", showing newest " + MAX_RESULTS : "");
+
+            var rows = records.slice(0, MAX_RESULTS).map(function (record) {
+                return "<tr><td>" + escapeHtml(record[3]) + "</td><td>" + escapeHtml(record[2]) + "</td><td>" + escapeHtml(record[1]) +
+                    "</td><td>" + escapeHtml(record[0]) + "</td><td><a href=\"" + escapeHtml(record[4]) + "\" target=\"_blank\">View FOI</a></td></tr>";
+            });
+            results.innerHTML = rows.length ? "<table><thead><tr><th>Request Date</th><th>Status</th><th>Authority Name</th><th>Request Title</th><th>Request URL</th></tr></thead><tbody>" +
+                rows.join("") + "</tbody></table>" : "";
+        });
+    }
+
+    function init() {
+        var container = document.getElementById("foi-search");
+        if (!container) {
+            return;
+        }
+
+        var input = container.querySelector("#foi-search-input");
+        var timer = null;
+        input.addEventListener("input", function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () { search(container, input.value); }, 200);
+        });
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", init);
+    } else {
+        init();
+    }
+})();
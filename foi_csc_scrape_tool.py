@@ -0,0 +1,4199 @@
+"""
+FOI scrape tool, scrapes Children's Services FOI requests from public sources into csv + MkDocs site pages.
+
+Run as a script (see main() / --help), or import to reuse the scrape, store and output functions.
+"""
+
+import argparse
+import csv
+import importlib
+import time
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+import re
+import os # mkdoc use
+import sys
+import threading
+import queue
+import hashlib
+import zlib
+import json
+import sqlite3
+import tracemalloc
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+from urllib.parse import urlparse
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy module, only imported on first attribute use.
+
+    Keeps startup (and --help, importing this file) fast, pandas/numpy/requests
+    are only loaded once a scrape or output step actually needs them.
+
+    Args:
+        name (str): Module name, e.g. "pandas".
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
+requests = LazyModule("requests")
+
+DEBUG = False # limit scrape depth and search breadth for testing
+INCREMENTAL = False # only scrape new WhatDoTheyKnow pages, merge into previously published summary csv
+HTTP_MODE = "live" # "live", "record" (also save every fetched page to FIXTURES_DIR) or "replay" (serve pages from FIXTURES_DIR, no network)
+BENCHMARK = False # report wall time + peak memory per pipeline stage, pair with HTTP_MODE = "replay" for offline runs
+SITE_SHARD_BY = "letter" # also write detailed view as one page per shard + index page, "letter" (authority initial), "year" (request year) or None
+SITE_SHARD_DIR = "docs/foi_summary"
+SITE_SINGLE_PAGE_VIEWS = True # write the whole summary as the single large pages (v1 grouped by LA, v2 detailed) in the site nav, always written if SITE_SHARD_BY is None
+SEARCH_INDEX_DIR = "docs/search_index" # prebuilt search index shards, loaded on demand by docs/assets/js/foi-search.js
+OUTPUTS_MANIFEST_FILE = "state/outputs_manifest.json" # content hash of the records behind each csv/site output, unchanged outputs aren't re-rendered
+FORCE_OUTPUTS = False # rewrite every output even if its records haven't changed
+ALLOW_EMPTY_OUTPUTS = False # write outputs with no records over a published csv that has records (otherwise outputs are left as published)
+OUTPUT_FORMAT_VERSION = 1 # part of each output's content hash, bump when csv/page rendering changes so unchanged records are re-rendered
+USE_RECORD_STORE = True # keep every scraped record in RECORD_STORE_FILE, outputs built from the store (incl. records from previous runs)
+REBUILD_FROM_STORE_ONLY = False # skip scraping, regenerate outputs from the record store
+RUN_ID = None # record store run id of the current scrape, set by run_scrape
+
+RECORD_STORE_FILE = "state/foi_records.sqlite"
+REQUEST_CLUSTERS_FILE = "state/request_clusters.json" # normalised title -> near-duplicate cluster id, kept so ids are stable across runs
+
+# near-duplicate request titles (MinHash/LSH), e.g. same round-robin FOI worded slightly differently per LA
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16 # 16 bands x 4 rows, titles with ~0.5+ similarity become candidates
+TITLE_SIMILARITY_THRESHOLD = 0.8 # min estimated Jaccard similarity (of title char 4-grams) to join a cluster
+
+FIXTURES_DIR = "fixtures/http"
+RAW_RECORDS_FILE = "state/foi_records_raw.csv" # scraped records streamed here as they arrive (non-relevant removed, no aggr counts), readable mid-run
+STORE_BATCH_SIZE = 200 # streamed records written to the record store in batches of this size
+CHECKPOINT_FILE = "state/scrape_checkpoint.jsonl" # completed scrape units + their records, so a crashed run can be resumed (--resume)
+RUN_REPORT_FILE = "state/run_reports.jsonl" # one json run report (request/time/record metrics) appended per run, to track throughput over time
+PROFILE = None # None, "cprofile" or "pyinstrument" (optional: pip install pyinstrument), profile written to PROFILE_DIR
+PROFILE_DIR = "state"
+
+SUMMARY_CSV_FILE = "docs/downloads/foi_csc_requests_summary.csv"
+WDTK_HIGH_WATER_FILE = "state/wdtk_high_water.json" # per search term known request urls + whether fully paginated once
+HASTINGS_DETAILS_FILE = "state/hastings_foi_details.json" # parsed Hastings detail pages, published responses don't change
+HASTINGS_YEARS_FILE = "state/hastings_years.json" # closed (fully scraped, past) Hastings years + their listing entries
+HASTINGS_CLOSE_AFTER_DAYS = 90 # days after a year ends before its listing is treated as final (late responses still published)
+HASTINGS_REVALIDATE_DAYS = 30 # closed years' listings re-fetched this often, in case of corrections
+UPLOADS_DIR = "uploads" # LA colleague submitted FOI csvs, every *.csv in here (incl. sub folders) is ingested
+UPLOADS_MANIFEST_FILE = "state/uploads_manifest.json" # per uploaded file content hash + record keys, unchanged files aren't re-ingested
+
+
+# add sources / 
+BASE_URLS = {
+    "WhatDoTheyKnow": "https://www.whatdotheyknow.com/search/",
+    "HastingsCouncil": "https://www.hastings.gov.uk/my-council/freedom-of-information/date/"
+    # to do:
+    # https://opendata.camden.gov.uk/stories/s/Camden-Freedom-Of-Information-Response-Search/dwzc-va83/
+}
+
+# concurrent fetch settings
+# requests/sec and burst allowance per host, replaces the fixed sleep(2) after each page
+# source adapters add their own host limit (see SourceAdapter.rate_limit), entries here override that
+RATE_LIMITS = {}
+DEFAULT_RATE_LIMIT = {"rate": 0.5, "burst": 1} # any host not listed above, i.e. 1 request every 2s
+SOURCE_TIMEOUT = 3 * 60 * 60 # seconds a source may spend fetching before it's abandoned (other sources unaffected)
+MAX_WORKERS = 4 # search terms scraped in parallel, rate limiter still caps actual request rate
+PAGE_WORKERS = 8 # result pages fetched in parallel (across all terms) once a term's result total is known
+
+# adaptive rate, each host's rate ramps up while responses are healthy and is cut when the server pushes back (429/5xx/timeouts)
+# a RATE_LIMITS entry (or SourceAdapter.rate_limit) can set its own "max_rate"
+ADAPTIVE_RATE = True
+ADAPTIVE_RATE_STEP = 0.05 # requests/sec added per healthy response
+ADAPTIVE_RATE_BACKOFF = 0.5 # rate multiplied by this on pushback
+ADAPTIVE_MAX_RATE_FACTOR = 4 # default max_rate, multiple of the configured rate
+ADAPTIVE_MIN_RATE = 0.05 # requests/sec floor, i.e. 1 request every 20s
+
+# retries, exponential backoff with jitter (or the server's Retry-After, if longer, a Retry-After over BACKOFF_MAX_SECONDS fails the fetch)
+MAX_FETCH_ATTEMPTS = 4
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 120
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+NOT_FOUND_STATUS_CODES = {404, 410} # page doesn't exist, e.g. paginated past the last page of results
+
+# on-disk response cache, revalidated via ETag/Last-Modified (conditional GET) on re-runs
+HTTP_CACHE_DIR = "state/http_cache"
+HTTP_CACHE_MAX_BYTES = 500 * 1024 * 1024 # least recently used pages evicted beyond this
+
+# html parser backend, "lxml" is much faster on the large WDTK result pages (optional: pip install lxml)
+# falls back to python's built-in "html.parser" if lxml not installed
+HTML_PARSER = "lxml"
+
+# targeted parsing, only build the page subtrees each source actually reads (SoupStrainer args)
+WDTK_LISTING_STRAINER = {"name": ["div", "h2"], "class_": ["request_listing", "foi_results"]} # results + result total heading
+HASTINGS_LISTING_STRAINER = {"id": "FoiList"}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to cap request rate against a single host.
+
+    The rate adapts between min_rate and max_rate: additive increase per healthy response,
+    multiplicative decrease (plus a pause for every thread using the host) when the server pushes back.
+
+    Args:
+        rate (float): Tokens added per second, i.e. sustained requests/sec to start at.
+        burst (int): Max tokens held, i.e. requests allowed back-to-back.
+        max_rate (float, optional): Highest rate to ramp up to. Defaults to rate (not adaptive).
+        min_rate (float, optional): Lowest rate to back down to. Defaults to rate.
+    """
+
+    def __init__(self, rate, burst=1, max_rate=None, min_rate=None):
+        self.rate = rate
+        self.max_rate = max(rate, max_rate or rate)
+        self.min_rate = min(rate, min_rate or rate)
+        self.capacity = max(1, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a token is available (and any pushback pause is over), then consume it.
+        """
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait, stat = self.paused_until - now, "backoff_seconds"
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait, stat = (1 - self.tokens) / self.rate, "rate_limit_wait_seconds"
+
+            record_fetch_stat(stat, wait)
+            time.sleep(wait) # sleep outside lock so other threads can check in
+
+    def record_success(self):
+        """
+        Healthy response, ramp rate up a step (up to max_rate).
+        """
+
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + ADAPTIVE_RATE_STEP)
+
+    def record_pushback(self, pause):
+        """
+        Server pushed back (429/5xx/timeout), cut rate (down to min_rate) and pause all requests to the host.
+
+        Args:
+            pause (float): Seconds before the next request to this host, e.g. backoff or Retry-After.
+        """
+
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate * ADAPTIVE_RATE_BACKOFF)
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            self.tokens = 0 # no burst straight after the pause
+            self.updated = self.paused_until
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(url):
+    """
+    Get (or create) the shared token bucket for the host of given URL.
+
+    Args:
+        url (str): Target webpage URL.
+
+    Returns:
+        TokenBucket: Rate limiter shared by all requests to this host.
+    """
+
+    host = urlparse(url).netloc
+    with _rate_limiters_lock:
+        if host not in _rate_limiters:
+            limits = RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT)
+            if ADAPTIVE_RATE:
+                max_rate = limits.get("max_rate", limits["rate"] * ADAPTIVE_MAX_RATE_FACTOR)
+                _rate_limiters[host] = TokenBucket(limits["rate"], limits["burst"], max_rate=max_rate, min_rate=ADAPTIVE_MIN_RATE)
+            else:
+                _rate_limiters[host] = TokenBucket(limits["rate"], limits["burst"])
+        return _rate_limiters[host]
+
+
+class SourceTimeoutError(Exception):
+    """
+    Raised by fetch_page once a source has used up its SourceAdapter.timeout.
+    """
+
+
+class FetchError(Exception):
+    """
+    Raised by fetch_page when a page couldn't be fetched (retries used up, or a non-retryable error status),
+    as opposed to the page not existing (e.g. end of paginated results), which returns None.
+    """
+
+
+_source_deadlines = {} # host -> time.monotonic() deadline, set by run_source_adapters
+
+
+def check_source_deadline(url):
+    """
+    Stop a source's fetching (all of its worker threads) once past its deadline.
+
+    Args:
+        url (str): URL about to be fetched.
+
+    Raises:
+        SourceTimeoutError: If the host's deadline has passed.
+    """
+
+    host = urlparse(url).netloc
+    deadline = _source_deadlines.get(host)
+    if deadline is not None and time.monotonic() > deadline:
+        raise SourceTimeoutError(f"{host} timed out, stopping before {url}")
+
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """
+    Get the shared, connection pooled HTTP session (created on first use).
+
+    Returns:
+        requests.Session: Session reusing TCP/TLS connections across requests and threads.
+    """
+
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            import urllib3
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning) # intrim - mask Unverified HTTPS request warns
+
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=len(BASE_URLS), pool_maxsize=MAX_WORKERS + PAGE_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": "Mozilla/5.0"})
+            _http_session = session
+        return _http_session
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of page bodies with their ETag/Last-Modified validators.
+
+    Each URL is stored as <key>.body + <key>.json, file mtime tracks last use for LRU eviction.
+
+    Args:
+        cache_dir (str): Folder holding cached responses.
+        max_bytes (int): Total cache size limit before eviction.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "bytes_downloaded": 0, "bytes_from_cache": 0}
+
+    def _path(self, url, ext):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.{ext}")
+
+    def lookup(self, url):
+        """
+        Get cached validators and body for URL.
+
+        Args:
+            url (str): Page URL.
+
+        Returns:
+            dict or None: {"etag", "last_modified", "body"} if cached.
+        """
+
+        meta_path, body_path = self._path(url, "json"), self._path(url, "body")
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                meta["body"] = f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+        return meta
+
+    def conditional_headers(self, cached):
+        """
+        Build If-None-Match / If-Modified-Since headers from cached entry.
+        """
+
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def record_hit(self, url, cached):
+        """
+        Count a 304 revalidation and mark entry as recently used.
+        """
+
+        with self.lock:
+            self.stats["hits"] += 1
+            self.stats["bytes_from_cache"] += len(cached["body"])
+        try:
+            os.utime(self._path(url, "body"))
+        except FileNotFoundError:
+            pass
+
+    def store(self, url, response):
+        """
+        Count a full download and cache body if the server sent validators.
+
+        Args:
+            url (str): Page URL.
+            response (requests.Response): Successful (200) response.
+        """
+
+        with self.lock:
+            self.stats["misses"] += 1
+            self.stats["bytes_downloaded"] += len(response.content)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return # nothing to revalidate against next time
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_path, body_path = self._path(url, "json"), self._path(url, "body")
+
+        # write to temp then swap, so concurrent readers never see half a file
+        for path, data, mode in [(body_path, response.content, "wb"), 
+                                 (meta_path, json.dumps({"url": url, "etag": etag, "last_modified": last_modified}), "w")]:
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    def evict(self):
+        """
+        Remove least recently used entries until cache is within max_bytes.
+        """
+
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".body"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        evicted = 0
+        for _, size, path in sorted(entries): # oldest use first
+            if total <= self.max_bytes:
+                break
+            for stale in (path, path[:-len(".body")] + ".json"):
+                if os.path.exists(stale):
+                    os.remove(stale)
+            total -= size
+            evicted += 1
+
+        if evicted:
+            print(f"HTTP cache: evicted {evicted} least recently used pages.")
+
+
+HTTP_CACHE = ResponseCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES)
+
+
+def print_http_cache_stats():
+    """
+    Print HTTP cache hit/miss counts for this run (and apply LRU size limit).
+    """
+
+    HTTP_CACHE.evict()
+    stats = HTTP_CACHE.stats
+    total = stats["hits"] + stats["misses"]
+    hit_rate = (stats["hits"] / total * 100) if total else 0
+    print(f"HTTP cache: {stats['hits']} hits (304 not modified), {stats['misses']} misses, "
+          f"{hit_rate:.1f}% hit rate, {stats['bytes_downloaded'] / 1024:.0f} KB downloaded, "
+          f"{stats['bytes_from_cache'] / 1024:.0f} KB served from cache.")
+
+
+_html_parser = None
+
+
+def get_html_parser():
+    """
+    Resolve configured HTML_PARSER backend, falling back to html.parser if unavailable.
+
+    Returns:
+        str: BeautifulSoup parser/features name.
+    """
+
+    global _html_parser
+    if _html_parser is None:
+        _html_parser = "html.parser"
+        if HTML_PARSER == "lxml":
+            try:
+                import lxml # noqa: F401 - optional dependency
+                _html_parser = "lxml"
+            except ImportError:
+                print("lxml not installed, parsing with html.parser (pip install lxml for faster parsing).")
+    return _html_parser
+
+
+def get_soup(url, max_attempts=MAX_FETCH_ATTEMPTS, delay=BACKOFF_BASE_SECONDS, parse_only=None):
+    """
+    Retrieve BeautifulSoup object from URL with retry handling.
+
+    Args:
+        url (str): Target webpage URL.
+        max_attempts (int): Number of attempts before giving up. Defaults to MAX_FETCH_ATTEMPTS.
+        delay (int): Base backoff in seconds, doubled per retry. Defaults to BACKOFF_BASE_SECONDS.
+        parse_only (dict, optional): SoupStrainer args, only parse matching page elements (and their contents).
+
+    Returns:
+        BeautifulSoup or None: Parsed HTML content or None if the page doesn't exist (404/410).
+
+    Raises:
+        FetchError: If the page couldn't be fetched.
+    """
+
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    content = fetch_page(url, max_attempts, delay)
+    if content is None:
+        return None
+
+    parse_start = time.perf_counter()
+    soup = BeautifulSoup(content, get_html_parser(), parse_only=SoupStrainer(**parse_only) if parse_only else None)
+    record_fetch_stat("parse_seconds", time.perf_counter() - parse_start)
+    record_fetch_stat("pages_parsed", 1)
+    return soup
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header, either delay seconds or an HTTP date.
+
+    Args:
+        value (str): Header value.
+
+    Returns:
+        float or None: Seconds to wait, None if no/unparseable header.
+    """
+
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt, delay, retry_after=None):
+    """
+    Wait before retrying, exponential backoff with jitter, or the server's Retry-After (in full) if longer.
+
+    Args:
+        attempt (int): Attempt that just failed, from 1.
+        delay (float): Base backoff in seconds.
+        retry_after (float, optional): Seconds the server asked us to wait.
+
+    Returns:
+        float: Seconds to wait.
+    """
+
+    backoff = min(BACKOFF_MAX_SECONDS, delay * 2 ** (attempt - 1))
+    backoff = random.uniform(backoff / 2, backoff) # jitter, so threads/hosts don't retry in lockstep
+    return max(backoff, retry_after) if retry_after is not None else backoff
+
+
+# NON-secure workaround for problem ssl cert at hastings
+def fetch_page(url, max_attempts=MAX_FETCH_ATTEMPTS, delay=BACKOFF_BASE_SECONDS):
+    """
+    Retrieve raw page content from URL with retry handling.
+
+    Uses the shared pooled session, and revalidates against the on-disk cache
+    so unchanged pages come back as 304 (no body transferred). Honours HTTP_MODE
+    record/replay of fixtures.
+
+    429/5xx responses, timeouts and connection errors are retried with backoff (honouring
+    Retry-After), and cut the host's adaptive rate. Healthy responses ramp it back up. A Retry-After
+    longer than BACKOFF_MAX_SECONDS fails the fetch instead, and holds the host's requests until then.
+
+    Args:
+        url (str): Target webpage URL.
+        max_attempts (int): Number of attempts before giving up. Defaults to MAX_FETCH_ATTEMPTS.
+        delay (int): Base backoff in seconds, doubled per retry. Defaults to BACKOFF_BASE_SECONDS.
+
+    Returns:
+        bytes or None: Page content, None if the page doesn't exist (404/410, or no recorded fixture in replay).
+
+    Raises:
+        FetchError: If retries are used up, or the server answers with a non-retryable error status.
+        SourceTimeoutError: If the source this URL belongs to has run past its timeout.
+    """
+
+    check_source_deadline(url)
+
+    if HTTP_MODE == "replay":
+        fetch_start = time.perf_counter()
+        content = load_fixture(url) # missing fixture is treated as a page that doesn't exist (e.g. end of results)
+        record_fetch_stat("fetch_seconds", time.perf_counter() - fetch_start)
+        return content
+
+    cached = HTTP_CACHE.lookup(url)
+    rate_limiter = get_rate_limiter(url)
+
+    for attempt in range(1, max_attempts + 1):
+        rate_limiter.acquire() # wait our turn for this host (retries included)
+        record_fetch_stat("requests", 1)
+        if attempt > 1:
+            record_fetch_stat("retries", 1)
+        fetch_start = time.perf_counter()
+        retry_after = None
+        try:
+            response = get_http_session().get(
+                url,
+                headers=HTTP_CACHE.conditional_headers(cached), # revalidate rather than re-download
+                timeout=10,
+                verify=False  # Disable SSL verification
+                #  verify=certifi.where()  # SSL certificate verification
+
+            )
+        except requests.RequestException as e: # timeouts, connection + SSL errors
+            record_fetch_stat("fetch_seconds", time.perf_counter() - fetch_start)
+            error = repr(e)
+        else:
+            record_fetch_stat("fetch_seconds", time.perf_counter() - fetch_start)
+            status = response.status_code
+
+            if status == 304 and cached:
+                HTTP_CACHE.record_hit(url, cached)
+                content = cached["body"]
+            elif response.ok:
+                HTTP_CACHE.store(url, response)
+                content = response.content
+            elif status in NOT_FOUND_STATUS_CODES:
+                rate_limiter.record_success()
+                print(f"Not found (HTTP {status}): {url}")
+                return None
+            elif status in RETRY_STATUS_CODES:
+                content = None
+                error = f"HTTP {status}"
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                record_fetch_stat("throttled_responses", 1)
+            else:
+                record_fetch_stat("failed_requests", 1)
+                raise FetchError(f"HTTP {status} for {url}")
+
+            if content is not None:
+                rate_limiter.record_success()
+                if HTTP_MODE == "record":
+                    save_fixture(url, content)
+                return content
+
+        if attempt == max_attempts:
+            record_fetch_stat("failed_requests", 1)
+            raise FetchError(f"{url} failed after {max_attempts} attempts, last error: {error}")
+
+        if retry_after is not None and retry_after > BACKOFF_MAX_SECONDS:
+            # server wants longer than we'd wait, give up on this page rather than retry before it allows
+            rate_limiter.record_pushback(retry_after) # and no other request to this host before then either
+            record_fetch_stat("failed_requests", 1)
+            raise FetchError(f"{url} failed ({error}), server asked to retry after {retry_after:.0f}s (over BACKOFF_MAX_SECONDS)")
+
+        wait = backoff_delay(attempt, delay, retry_after)
+        print(f"Attempt {attempt} failed ({error}), retrying in {wait:.1f}s.")
+        rate_limiter.record_pushback(wait) # next request to this host (from any thread) waits this long
+
+
+_fixtures_index_lock = threading.Lock()
+
+
+def _fixture_path(url):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(FIXTURES_DIR, f"{key}.html")
+
+
+def save_fixture(url, content):
+    """
+    Save fetched page content to the fixture archive (HTTP_MODE = "record").
+
+    Args:
+        url (str): Page URL.
+        content (bytes): Page content.
+
+    Returns:
+        None
+    """
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    path = _fixture_path(url)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+    # url -> file index, keeps archive readable/prunable by hand
+    with _fixtures_index_lock:
+        with open(os.path.join(FIXTURES_DIR, "index.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"url": url, "file": os.path.basename(path)}) + "\n")
+
+
+def load_fixture(url):
+    """
+    Load recorded page content from the fixture archive (HTTP_MODE = "replay").
+
+    Args:
+        url (str): Page URL.
+
+    Returns:
+        bytes or None: Recorded page content, None if url was never recorded.
+    """
+
+    try:
+        with open(_fixture_path(url), "rb") as f:
+            content = f.read()
+    except FileNotFoundError:
+        print(f"Replay: no recorded fixture for {url}")
+        return None
+
+    record_fetch_stat("bytes_replayed", len(content))
+    return content
+
+
+# pipeline timings + request counts, summed across worker threads
+FETCH_STATS = {
+    "requests": 0, "retries": 0, "failed_requests": 0, "pages_parsed": 0, "bytes_replayed": 0,
+    "fetch_seconds": 0.0, "parse_seconds": 0.0,
+    "rate_limit_wait_seconds": 0.0, "backoff_seconds": 0.0, # time not spent fetching
+    "throttled_responses": 0, # 429/5xx answers, server pushing back
+}
+STAGE_STATS = {}
+RECORD_COUNTS = {"by_source": {}, "by_term": {}} # records scraped (and output) per source, scraped per search term
+_stats_lock = threading.Lock()
+
+
+def record_fetch_stat(name, value):
+    """
+    Add value to a running fetch/parse total (thread-safe).
+    """
+
+    with _stats_lock:
+        FETCH_STATS[name] += value
+
+
+@contextmanager
+def timed_stage(name):
+    """
+    Time a pipeline stage, and its peak traced memory when BENCHMARK is on.
+
+    Repeated stages with the same name accumulate time, peak memory is the max seen.
+
+    Args:
+        name (str): Stage name used in the benchmark report.
+    """
+
+    if BENCHMARK and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if BENCHMARK:
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if BENCHMARK else 0
+        stage = STAGE_STATS.setdefault(name, {"seconds": 0.0, "peak_bytes": 0, "calls": 0})
+        stage["seconds"] += elapsed
+        stage["peak_bytes"] = max(stage["peak_bytes"], peak)
+        stage["calls"] += 1
+
+
+def benchmark_transform_scaling(df, scales=(1, 10, 100)):
+    """
+    Time transform_foi_data_list_format on this run's data replicated to larger volumes.
+
+    Args:
+        df (pd.DataFrame): FOI data as passed to transform_foi_data_list_format.
+        scales (tuple): Volume multipliers to time.
+
+    Returns:
+        dict: Scale -> seconds taken.
+    """
+
+    timings = {}
+    print("\ntransform_foi_data_list_format scaling")
+    for scale in scales:
+        scaled_df = pd.concat([df] * scale, ignore_index=True)
+        start = time.perf_counter()
+        transform_foi_data_list_format(scaled_df)
+        timings[scale] = time.perf_counter() - start
+        print(f"  {scale:>4}x {len(scaled_df):>9} rows {timings[scale]:>9.3f}s")
+    return timings
+
+
+def print_benchmark_report():
+    """
+    Print wall time and peak memory per pipeline stage, plus fetch vs parse split.
+    """
+
+    print("\nBenchmark report")
+    print(f"{'stage':<24}{'calls':>6}{'wall (s)':>12}{'peak mem (MB)':>16}")
+    for name, stage in STAGE_STATS.items():
+        print(f"{name:<24}{stage['calls']:>6}{stage['seconds']:>12.3f}{stage['peak_bytes'] / 1024 / 1024:>16.1f}")
+    print(f"fetch time (all threads): {FETCH_STATS['fetch_seconds']:.3f}s, "
+          f"parse time (all threads): {FETCH_STATS['parse_seconds']:.3f}s, "
+          f"replayed: {FETCH_STATS['bytes_replayed'] / 1024:.0f} KB")
+
+
+def peak_rss_bytes():
+    """
+    Peak resident memory of this process so far.
+
+    Returns:
+        int or None: Bytes, None where not available (resource module is unix only).
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024 # linux reports KB, macOS bytes
+
+
+def build_run_report(command, started_at, wall_seconds):
+    """
+    Collect this run's metrics into a json-serialisable run report.
+
+    Args:
+        command (str): CLI command run, e.g. "scrape".
+        started_at (datetime): Run start.
+        wall_seconds (float): Run wall time.
+
+    Returns:
+        dict: Run report.
+    """
+
+    cache_stats = HTTP_CACHE.stats
+    return {
+        "run_id": RUN_ID,
+        "command": command,
+        "http_mode": HTTP_MODE,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "wall_seconds": round(wall_seconds, 3),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "http": {
+            "requests": FETCH_STATS["requests"],
+            "retries": FETCH_STATS["retries"],
+            "failed_requests": FETCH_STATS["failed_requests"],
+            "throttled_responses": FETCH_STATS["throttled_responses"],
+            "final_rates": {host: round(limiter.rate, 3) for host, limiter in _rate_limiters.items()}, # requests/sec each host's adaptive rate ended on
+            "cache_hits": cache_stats["hits"],
+            "bytes_downloaded": cache_stats["bytes_downloaded"],
+            "bytes_from_cache": cache_stats["bytes_from_cache"],
+            "bytes_replayed": FETCH_STATS["bytes_replayed"],
+        },
+        "time_seconds": { # summed across worker threads, so can exceed wall time
+            name: round(FETCH_STATS[name], 3)
+            for name in ["fetch_seconds", "parse_seconds", "rate_limit_wait_seconds", "backoff_seconds"]
+        },
+        "pages_parsed": FETCH_STATS["pages_parsed"],
+        "parse_seconds_per_page": round(FETCH_STATS["parse_seconds"] / FETCH_STATS["pages_parsed"], 4) if FETCH_STATS["pages_parsed"] else None,
+        "records": RECORD_COUNTS,
+        "term_overlap": TERM_OVERLAP, # WhatDoTheyKnow requests per search term vs only found by that term, see report_search_term_overlap
+        "source_errors": SOURCE_ERRORS,
+        "fetch_errors": FETCH_ERRORS,
+        "authority_fuzzy_matches": [f"{name} -> {canonical_name}" for (name, _), canonical_name in AUTHORITY_INDEX.fuzzy_matches.items()],
+        "outputs": OUTPUT_CHANGES, # csv/site outputs rewritten vs unchanged (records hash as last written)
+        "stages": {name: {"calls": stage["calls"], "seconds": round(stage["seconds"], 3), "peak_traced_bytes": stage["peak_bytes"] or None} for name, stage in STAGE_STATS.items()},
+    }
+
+
+def write_run_report(report, filename=RUN_REPORT_FILE):
+    """
+    Append run report as one json line, so runs can be compared over time.
+
+    Args:
+        report (dict): Run report from build_run_report.
+        filename (str): Path to run report jsonl file.
+
+    Returns:
+        None
+    """
+
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "a", encoding="utf-8") as f:
+        f.write(json.dumps(report, sort_keys=True) + "\n")
+
+    print(f"Run report appended to {filename}: {report['http']['requests']} requests, "
+          f"{report['http']['bytes_downloaded'] / 1024:.0f} KB downloaded, {report['wall_seconds']:.1f}s.")
+
+
+@contextmanager
+def profiled(profiler=None, out_dir=PROFILE_DIR):
+    """
+    Profile the wrapped run with cProfile or pyinstrument (if installed), no-op when profiler is None.
+
+    Writes <out_dir>/profile.prof (cProfile, view with e.g. snakeviz) or <out_dir>/profile.html (pyinstrument).
+
+    Args:
+        profiler (str, optional): "cprofile" or "pyinstrument".
+        out_dir (str): Folder the profile is written to.
+    """
+
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("pyinstrument not installed, profiling with cProfile (pip install pyinstrument for html profile).")
+            profiler = "cprofile"
+
+    if profiler is None:
+        yield
+        return
+
+    os.makedirs(out_dir, exist_ok=True)
+    if profiler == "pyinstrument":
+        profile = Profiler()
+        profile.start()
+        try:
+            yield
+        finally:
+            profile.stop()
+            filename = os.path.join(out_dir, "profile.html")
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(profile.output_html())
+    else:
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            filename = os.path.join(out_dir, "profile.prof")
+            profile.dump_stats(filename)
+    print(f"Profile saved to {filename}")
+
+
+class RawRecordWriter:
+    """
+    Thread-safe csv writer for scraped records as they stream in, flushed per record so the
+    file can be read (e.g. partial results) while the scrape is still running.
+
+    Non-relevant records (see record_exclusion_reason) are left out. Aggr counts and 'Matched Terms'
+    are only final once all sources are done, so aren't included ('Search Term' is the first term to return the request).
+
+    Args:
+        filename (str): Path to raw records csv, rewritten each run.
+    """
+
+    fields = ["Source", "Search Term", "FOIR", "Status", "Request Date", "Authority Name", "Request Title", "Request URL"]
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.file = None
+        self.writer = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        self.file = open(self.filename, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fields, extrasaction="ignore")
+        self.writer.writeheader()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.file.close()
+
+    def write(self, record):
+        """
+        Append record, unless it's non-relevant.
+
+        Args:
+            record (dict): Scraped FOI request record.
+        """
+
+        if record_exclusion_reason(record):
+            return
+        with self.lock:
+            self.writer.writerow(record)
+            self.file.flush()
+
+
+class ScrapeCheckpoint:
+    """
+    Durable, append-only log of the scrape units a run has completed, with their parsed records,
+    so a crashed run can be resumed where it stopped (--resume) rather than from page 1.
+
+    Units are (source, search term, page) for WhatDoTheyKnow and (source, year, FOI id) for Hastings,
+    plus an (source, term/year, "end") unit once a term/year is finished. Each unit is one json line,
+    flushed and fsynced as it's written. A half written last line (process killed mid-write) is dropped on resume.
+    Only completed unit keys (+ where their line is) are kept in memory, a unit's data is read back from the file.
+
+    Does nothing (get returns None) until start or resume is called.
+
+    Args:
+        filename (str): Path to checkpoint jsonl file.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.file = None
+        self.options = None
+        self.units = {} # unit -> byte offset of its line
+
+    def start(self, options):
+        """
+        Begin a new checkpoint, replacing any left by a previous run.
+
+        Args:
+            options (dict): Run id + scrape options, reused by a resumed run.
+        """
+
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        self.options = options
+        self.units = {}
+        self.file = open(self.filename, "wb")
+        self._write({"options": options})
+
+    def resume(self):
+        """
+        Load a previous (crashed) run's checkpoint and carry on appending to it.
+
+        Returns:
+            dict or None: Crashed run's options, None if there's no checkpoint to resume.
+        """
+
+        options = None
+        units = {}
+        offset = 0
+        try:
+            with open(self.filename, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("no line end")
+                        entry = json.loads(line)
+                    except ValueError:
+                        break # half written (last) line
+                    if options is None:
+                        options = entry.get("options")
+                        if options is None:
+                            return None
+                    else:
+                        units[tuple(entry["unit"])] = offset
+                    offset += len(line)
+        except FileNotFoundError:
+            return None
+
+        if options is None:
+            return None
+
+        self.options = options
+        self.units = units
+
+        # drop any half written line, so appended units start on a line of their own
+        with open(self.filename, "r+b") as f:
+            f.truncate(offset)
+        self.file = open(self.filename, "ab")
+
+        print(f"Resuming run {self.options.get('run_id')} from {self.filename}: {len(self.units)} completed scrape units.")
+        return self.options
+
+    def done(self, *unit):
+        """
+        Check whether a unit has been completed, without reading its data.
+
+        Args:
+            *unit: Unit key, e.g. "WhatDoTheyKnow", "adoption", 3.
+
+        Returns:
+            bool: True if completed (by this run, or the run being resumed).
+        """
+
+        return unit in self.units
+
+    def get(self, *unit):
+        """
+        Get a completed unit's data, read back from the checkpoint file.
+
+        Args:
+            *unit: Unit key, e.g. "WhatDoTheyKnow", "adoption", 3.
+
+        Returns:
+            dict or None: Data saved when the unit completed, None if not (yet) completed.
+        """
+
+        offset = self.units.get(unit)
+        if offset is None:
+            return None
+        with open(self.filename, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())["data"]
+
+    def unit_data(self, source):
+        """
+        Get data of all completed units of a source, read back from the checkpoint file one unit at a time.
+
+        Args:
+            source (str): BASE_URLS key.
+
+        Yields:
+            tuple: (unit, data), in completion order.
+        """
+
+        with self.lock:
+            offsets = sorted(offset for unit, offset in self.units.items() if unit[0] == source)
+        if not offsets:
+            return
+        with open(self.filename, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                entry = json.loads(f.readline())
+                yield tuple(entry["unit"]), entry["data"]
+
+    def complete(self, unit, data):
+        """
+        Durably record a unit as completed (thread-safe).
+
+        Args:
+            unit (tuple): Unit key, e.g. ("WhatDoTheyKnow", "adoption", 3).
+            data (dict): Json-serialisable unit results (records etc.).
+        """
+
+        if self.file is None:
+            return
+        with self.lock:
+            offset = self.file.tell()
+            self._write({"unit": list(unit), "data": data})
+            self.units[tuple(unit)] = offset
+
+    def _write(self, line):
+        self.file.write((json.dumps(line) + "\n").encode("utf-8"))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def clear(self):
+        """
+        Remove the checkpoint, once the run (incl. its outputs) has finished.
+        """
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.units = {}
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+
+SCRAPE_CHECKPOINT = ScrapeCheckpoint(CHECKPOINT_FILE)
+
+
+class SourceAdapter:
+    """
+    A FOI data source. Subclass, set the class attributes, implement fetch_records and
+    decorate with @register_source_adapter to add a source to the scrape.
+
+    Attributes:
+        name (str): BASE_URLS key (any unique name for a source that isn't scraped).
+        label (str): 'Source' value on this source's records.
+        rate_limit (dict): Requests/sec + burst against this source's host (RATE_LIMITS entry overrides).
+        timeout (int): Seconds this source may spend fetching, see SOURCE_TIMEOUT.
+    """
+
+    name = None
+    label = None
+    rate_limit = DEFAULT_RATE_LIMIT
+    timeout = SOURCE_TIMEOUT
+
+    def __init__(self):
+        self.base_url = BASE_URLS[self.name]
+        self.host = urlparse(self.base_url).netloc
+
+    def fetch_records(self, search_terms, max_pages=None, start_year=None, end_year=2016, incremental=False):
+        """
+        Scrape this source's FOI request records (unfiltered), as a stream. Options a source has no use for are ignored.
+
+        Args:
+            search_terms (list): Keywords to filter FOI requests.
+            max_pages (int, optional): Maximum pages to scrape for paginated sources.
+            start_year (int, optional): Earliest year to scrape. Defaults to current year.
+            end_year (int): Oldest year to scrape. Defaults to 2016.
+            incremental (bool): Only scrape pages newer than the previous run.
+
+        Yields:
+            dict: Scraped FOI request record. A record may be yielded again (same Request URL) with
+                updated fields, the latest version wins.
+        """
+
+        raise NotImplementedError
+
+    def finish(self):
+        """
+        Called once all records from fetch_records are in the record store (not called if fetching failed).
+        Nothing to do by default.
+        """
+
+
+SOURCE_ADAPTERS = {} # BASE_URLS key -> adapter, in output order
+
+
+def register_source_adapter(adapter_class):
+    """
+    Class decorator adding a SourceAdapter to SOURCE_ADAPTERS, and its rate limit to RATE_LIMITS.
+    """
+
+    adapter = adapter_class()
+    SOURCE_ADAPTERS[adapter.name] = adapter
+    if adapter.host:
+        RATE_LIMITS.setdefault(adapter.host, adapter.rate_limit)
+    return adapter_class
+
+
+@register_source_adapter
+class WhatDoTheyKnowAdapter(SourceAdapter):
+    name = "WhatDoTheyKnow"
+    label = "WhatDoTheyKnow"
+    rate_limit = {"rate": 1.0, "burst": 2}
+
+    def fetch_records(self, search_terms, max_pages=None, start_year=None, end_year=2016, incremental=False):
+        return scrape_whatdotheyknow(search_terms, self.base_url, max_pages, incremental=incremental)
+
+
+@register_source_adapter
+class HastingsCouncilAdapter(SourceAdapter):
+    name = "HastingsCouncil"
+    label = "Hastings Council"
+    rate_limit = {"rate": 1.0, "burst": 2}
+
+    def fetch_records(self, search_terms, max_pages=None, start_year=None, end_year=2016, incremental=False):
+        return scrape_hastings_foi(search_terms, self.base_url, start_year, end_year) # hastings not paginated, hence not max_pages
+
+
+@register_source_adapter
+class LASubmittedAdapter(SourceAdapter):
+    """
+    FOI requests submitted by LA colleagues as csv files, ingested from UPLOADS_DIR rather than scraped.
+    """
+
+    name = "LASubmitted"
+    label = "LA Submitted"
+
+    def __init__(self):
+        self.base_url = UPLOADS_DIR
+        self.host = None # not fetched over http, so no rate limit/timeout
+        self.manifest = None
+        self.stale_keys = []
+
+    def fetch_records(self, search_terms, max_pages=None, start_year=None, end_year=2016, incremental=False):
+        # without the record store nothing persists between runs, so every file is ingested every run
+        self.manifest = load_uploads_manifest() if USE_RECORD_STORE else {}
+        self.stale_keys = []
+        return ingest_la_uploads(self.base_url, self.manifest, self.stale_keys)
+
+    def finish(self):
+        # only now this run's rows are stored, so a crash before here re-ingests rather than loses them
+        if USE_RECORD_STORE and self.manifest is not None:
+            delete_records(self.stale_keys)
+            save_uploads_manifest(self.manifest)
+        self.manifest = None
+
+
+# next data source, add its url to BASE_URLS then e.g.
+# @register_source_adapter
+# class CamdenAdapter(SourceAdapter):
+#     name = "Camden"
+#     label = "Camden Council"
+#
+#     def fetch_records(self, search_terms, max_pages=None, start_year=None, end_year=2016, incremental=False):
+#         return scrape_camden_foi(search_terms, self.base_url)
+
+
+# BASE_URLS key -> 'Source' value on its records
+SOURCE_LABELS = {name: adapter.label for name, adapter in SOURCE_ADAPTERS.items()}
+
+
+def get_source_adapter(source):
+    """
+    Look up the registered adapter for a source.
+
+    Args:
+        source (str): BASE_URLS key, e.g. "WhatDoTheyKnow".
+
+    Returns:
+        SourceAdapter: The source's adapter.
+    """
+
+    if source not in SOURCE_ADAPTERS:
+        raise ValueError("Unsupported source. Choose from: " + ", ".join(SOURCE_ADAPTERS.keys()))
+    return SOURCE_ADAPTERS[source]
+
+
+def fetch_source_records(source, search_terms, max_pages=None, start_year=None, end_year=2016, incremental=False, raw_records=None):
+    """
+    Stream one source adapter's records into the record store (in batches) and raw records csv,
+    within the source's timeout, isolating any failure from the other sources.
+
+    With the record store on, records aren't held in memory, the store has them (incl. partial
+    results of a failed source). Otherwise the latest version of each record is collected.
+
+    Args:
+        source (str): BASE_URLS key.
+        search_terms (list): Keywords to filter FOI requests.
+        max_pages (int, optional): Maximum pages to scrape for paginated sources.
+        start_year (int, optional): Earliest year to scrape. Defaults to current year.
+        end_year (int): Oldest year to scrape. Defaults to 2016.
+        incremental (bool): Only scrape new pages.
+        raw_records (RawRecordWriter, optional): Raw records csv to append new records to.
+
+    Returns:
+        tuple: (RecordColumns, None) on success, (empty RecordColumns, error message) if the source failed or timed out.
+    """
+
+    adapter = get_source_adapter(source)
+    _source_deadlines[adapter.host] = time.monotonic() + adapter.timeout
+    start = time.perf_counter()
+
+    records = RecordColumns() # latest version of each record (no record store only)
+    counted_terms = {} # record key -> matched terms already counted, records can be streamed again with more terms
+    batch = []
+    try:
+        for record in adapter.fetch_records(search_terms, max_pages=max_pages, start_year=start_year, end_year=end_year, incremental=incremental):
+            key = record_key(record)
+            is_new = key not in counted_terms
+            if is_new and raw_records is not None:
+                raw_records.write(record)
+            count_record(source, record, counted_terms.setdefault(key, set()), is_new)
+
+            if USE_RECORD_STORE:
+                batch.append(record)
+                if len(batch) >= STORE_BATCH_SIZE:
+                    upsert_records(batch, RUN_ID)
+                    batch = []
+            else:
+                records.add(record)
+
+        if batch:
+            upsert_records(batch, RUN_ID)
+            batch = []
+        adapter.finish()
+
+        print(f"{source}: {len(counted_terms)} records in {time.perf_counter() - start:.1f}s")
+        return records, None
+    except Exception as e: # one broken source shouldn't lose the others' results
+        print(f"{source} failed after {time.perf_counter() - start:.1f}s, skipping this source: {e!r}")
+        return RecordColumns(), repr(e)
+    finally:
+        if batch:
+            upsert_records(batch, RUN_ID)
+        _source_deadlines.pop(adapter.host, None)
+
+
+SOURCE_ERRORS = {} # source -> error message, sources that failed this run
+FETCH_ERRORS = [] # pages that couldn't be fetched this run, their term/year is left incomplete (not checkpointed as done)
+
+
+def count_record(source, record, counted_terms, is_new):
+    """
+    Add a streamed record to RECORD_COUNTS, per source and per matched search term (thread-safe).
+
+    Args:
+        source (str): BASE_URLS key.
+        record (dict): Scraped FOI request record.
+        counted_terms (set): Terms already counted for this record, updated in place.
+        is_new (bool): First version of this record seen this run.
+    """
+
+    terms = [term for term in record.get("Matched Terms", record.get("Search Term", "")).split("; ") if term and term not in counted_terms]
+    counted_terms.update(terms)
+    with _stats_lock:
+        source_counts = RECORD_COUNTS["by_source"].setdefault(source, {"scraped": 0})
+        source_counts["scraped"] += is_new
+        for term in terms:
+            RECORD_COUNTS["by_term"][term] = RECORD_COUNTS["by_term"].get(term, 0) + 1
+
+
+def run_source_adapters(search_terms, sources=None, max_pages=None, incremental=False):
+    """
+    Scrape all sources concurrently, so total time is roughly that of the slowest source.
+
+    Each source keeps its own rate limit and timeout; a source that fails or times out
+    contributes no new records (its stored/previously published records are still output).
+    Records are streamed into the store as scraped, filtering + aggr counts then run per source, in registry order.
+
+    Args:
+        search_terms (list): Keywords to filter FOI requests.
+        sources (list, optional): BASE_URLS keys to scrape. Defaults to all registered sources.
+        max_pages (int, optional): Maximum pages to scrape for paginated sources.
+        incremental (bool): Only scrape new pages and merge with previously published records.
+
+    Returns:
+        dict: Source -> filtered FOI request records (pd.DataFrame).
+    """
+
+    sources = list(SOURCE_ADAPTERS) if sources is None else [get_source_adapter(source).name for source in sources]
+
+    with timed_stage("fetch_parse"), RawRecordWriter(RAW_RECORDS_FILE) as raw_records:
+        with ThreadPoolExecutor(max_workers=max(1, len(sources))) as executor:
+            futures = {source: executor.submit(fetch_source_records, source, search_terms, max_pages=max_pages, incremental=incremental, raw_records=raw_records) for source in sources}
+            source_records = {source: future.result() for source, future in futures.items()}
+
+    source_dfs = {}
+    for source in sources:
+        records, error = source_records[source]
+        if error:
+            SOURCE_ERRORS[source] = error
+        source_dfs[source] = process_source_records(source, records, incremental=incremental)
+
+    return source_dfs
+
+
+def scrape_foi_requests(search_terms, source="WhatDoTheyKnow", max_pages=None, start_year=None, end_year=2016, incremental=False):
+    """
+    Scrape FOI requests from given source and filter relevant results.
+
+    Args:
+        search_terms (list): Keywords to filter FOI requests.
+        source (str): FOI data source. Defaults to "WhatDoTheyKnow".
+        max_pages (int, optional): Maximum pages to scrape for paginated sources.
+        start_year (int, optional): Earliest year to scrape. Defaults to current year.
+        end_year (int): Oldest year to scrape. Defaults to 2016.
+        incremental (bool): Only scrape new WhatDoTheyKnow pages and merge with previously published records.
+
+    Returns:
+        pd.DataFrame: Scraped and filtered FOI request records.
+    """
+
+    with timed_stage("fetch_parse"):
+        all_data, error = fetch_source_records(source, search_terms, max_pages=max_pages, start_year=start_year, end_year=end_year, incremental=incremental)
+    if error:
+        SOURCE_ERRORS[source] = error
+
+    return process_source_records(source, all_data, incremental=incremental)
+
+
+def process_source_records(source, all_data, incremental=False):
+    """
+    Filter a source's records and finalise the aggr counts, once its scrape has finished.
+
+    Args:
+        source (str): BASE_URLS key.
+        all_data (RecordColumns): Scraped FOI request records (not used with the record store, already streamed there).
+        incremental (bool): Records are only the new pages, merge with previously published records.
+
+    Returns:
+        pd.DataFrame: Filtered FOI request records.
+    """
+
+    if USE_RECORD_STORE:
+        # store holds this and all previous runs' records, so output is built from there
+        with timed_stage("record_store"):
+            records_df = load_records_from_store(SOURCE_LABELS[source])
+    else:
+        records_df = all_data.to_frame()
+        if (incremental and source == "WhatDoTheyKnow") or source in SOURCE_ERRORS:
+            # new records first, previous run's output after (all of it, if this source failed this run)
+            records_df = pd.concat([records_df, pd.DataFrame(load_published_records(SOURCE_LABELS[source]))], ignore_index=True)
+
+    with timed_stage("filter_dedupe"):
+        df = filter_and_count_foi_records(records_df)
+
+    RECORD_COUNTS["by_source"].setdefault(source, {})["output"] = len(df)
+    return df
+
+
+# scraped record field -> record store column
+RECORD_STORE_COLUMNS = {
+    "Source": "source",
+    "Search Term": "search_term",
+    "Matched Terms": "matched_terms",
+    "FOIR": "foir",
+    "Request Title": "request_title",
+    "Request URL": "request_url",
+    "Request URL Cleaned": "request_url_cleaned",
+    "Authority Name": "authority_name",
+    "Authority URL": "authority_url",
+    "Authority ID": "authority_id",
+    "Status": "status",
+    "Request Date": "request_date",
+}
+
+
+# low cardinality record fields (a few hundred values repeated across thousands of records),
+# values interned while scraping and categorical dtype once records are a DataFrame
+CATEGORICAL_COLUMNS = ["Source", "Search Term", "Status", "Authority Name", "Authority URL", "Authority ID", "Authority Key"]
+
+
+def compact_record(record):
+    """
+    Intern a scraped record's low cardinality values, so records repeating a value share one string.
+
+    Args:
+        record (dict): Scraped FOI request record, updated in place.
+
+    Returns:
+        dict: The record.
+    """
+
+    for field in CATEGORICAL_COLUMNS + ["Matched Terms"]:
+        value = record.get(field)
+        if isinstance(value, str):
+            record[field] = sys.intern(value)
+    return record
+
+
+def categorise_columns(df, columns=CATEGORICAL_COLUMNS):
+    """
+    Convert low cardinality columns to categorical dtype (in place), those not already categorical.
+
+    Args:
+        df (pd.DataFrame): FOI request records.
+        columns (list): Columns to convert, where present.
+
+    Returns:
+        pd.DataFrame: The df.
+    """
+
+    for column in columns:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    return df
+
+
+class RecordColumns:
+    """
+    Column oriented buffer of scraped records, keeping the latest version of each record (by record_key).
+
+    Much smaller than a list of record dicts, no dict per record and low cardinality values
+    interned, until to_frame turns it into a DataFrame (with categorical columns).
+    """
+
+    def __init__(self):
+        self.columns = {} # field -> values, one per row
+        self.rows = {} # record key -> row
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, record):
+        """
+        Add a record, or replace an earlier version of it (same record key) in place.
+
+        Args:
+            record (dict): Scraped FOI request record.
+        """
+
+        key = record_key(record)
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = len(self.rows)
+            for values in self.columns.values():
+                values.append(None)
+
+        for field, value in compact_record(dict(record)).items():
+            if field not in self.columns:
+                self.columns[field] = [None] * len(self.rows) # field not on earlier records
+            self.columns[field][row] = value
+
+    def to_frame(self):
+        """
+        Build DataFrame of the buffered records, in the order first added.
+
+        Returns:
+            pd.DataFrame: FOI request records.
+        """
+
+        return categorise_columns(pd.DataFrame(self.columns))
+
+
+def connect_record_store(filename=RECORD_STORE_FILE):
+    """
+    Open the SQLite record store, creating tables/indexes on first use.
+
+    Args:
+        filename (str): Path to SQLite database file.
+
+    Returns:
+        sqlite3.Connection: Open connection.
+    """
+
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    conn = sqlite3.connect(filename)
+
+    record_columns = ",\n            ".join(f"{column} TEXT" for column in RECORD_STORE_COLUMNS.values())
+    conn.executescript(f"""
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY,
+            started_at TEXT,
+            finished_at TEXT,
+            records_seen INTEGER DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS foi_records (
+            record_key TEXT PRIMARY KEY, -- request url, or content hash where no url
+            {record_columns},
+            request_date_iso TEXT, -- yyyy-mm-dd, sortable/indexable
+            first_seen TEXT,
+            last_seen TEXT,
+            first_run_id TEXT,
+            last_run_id TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_foi_records_request_url ON foi_records (request_url);
+        CREATE INDEX IF NOT EXISTS idx_foi_records_authority ON foi_records (authority_id, authority_name);
+        CREATE INDEX IF NOT EXISTS idx_foi_records_request_date ON foi_records (request_date_iso);
+        CREATE INDEX IF NOT EXISTS idx_foi_records_source ON foi_records (source);
+    """)
+    return conn
+
+
+def record_key(record):
+    """
+    Get record store key for a record, its request URL or (if none) a hash of its content.
+
+    Args:
+        record (dict): FOI request record.
+
+    Returns:
+        str: Record key.
+    """
+
+    request_url = record.get("Request URL")
+    if isinstance(request_url, str) and request_url:
+        return request_url
+
+    content = "|".join(str(record.get(field, "")) for field in ["Source", "Authority Name", "Request Title", "Request Date", "FOIR"])
+    return "sha1:" + hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def start_run(filename=RECORD_STORE_FILE):
+    """
+    Register a new run in the record store run history.
+
+    Args:
+        filename (str): Path to SQLite database file.
+
+    Returns:
+        str: Run id, e.g. "20250306T132700".
+    """
+
+    run_id = datetime.now().strftime("%Y%m%dT%H%M%S")
+    with connect_record_store(filename) as conn:
+        conn.execute("INSERT OR REPLACE INTO runs (run_id, started_at) VALUES (?, ?)", (run_id, datetime.now().isoformat(timespec="seconds")))
+    conn.close()
+    return run_id
+
+
+def finish_run(run_id, filename=RECORD_STORE_FILE):
+    """
+    Mark run finished in the record store run history.
+
+    Args:
+        run_id (str): Run id from start_run.
+        filename (str): Path to SQLite database file.
+
+    Returns:
+        None
+    """
+
+    with connect_record_store(filename) as conn:
+        conn.execute("""
+            UPDATE runs SET finished_at = ?, records_seen = (SELECT COUNT(*) FROM foi_records WHERE last_run_id = ?)
+            WHERE run_id = ?
+        """, (datetime.now().isoformat(timespec="seconds"), run_id, run_id))
+    conn.close()
+
+
+def upsert_records(records, run_id, filename=RECORD_STORE_FILE):
+    """
+    Insert new / update existing records in the record store.
+
+    first_seen/first_run_id are kept from when a record was first stored, all other fields
+    (status etc.) take this run's values.
+
+    Args:
+        records (list): Scraped FOI request records.
+        run_id (str): Current run id.
+        filename (str): Path to SQLite database file.
+
+    Returns:
+        int: Number of records written.
+    """
+
+    if not records:
+        return 0
+
+    now = datetime.now().isoformat(timespec="seconds")
+    fields = list(RECORD_STORE_COLUMNS)
+    columns = list(RECORD_STORE_COLUMNS.values())
+
+    rows = []
+    for record in records:
+        values = [None if pd.isna(record.get(field)) else record.get(field) for field in fields]
+        request_date = record.get("Request Date")
+        try:
+            request_date_iso = datetime.strptime(request_date, "%d/%m/%Y").strftime("%Y-%m-%d")
+        except (TypeError, ValueError):
+            request_date_iso = None
+        rows.append([record_key(record), *values, request_date_iso, now, now, run_id, run_id])
+
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns + ["request_date_iso", "last_seen", "last_run_id"])
+    with connect_record_store(filename) as conn:
+        conn.executemany(f"""
+            INSERT INTO foi_records (record_key, {", ".join(columns)}, request_date_iso, first_seen, last_seen, first_run_id, last_run_id)
+            VALUES ({", ".join("?" * (len(columns) + 6))})
+            ON CONFLICT (record_key) DO UPDATE SET {updates}
+        """, rows)
+    conn.close()
+
+    return len(rows)
+
+
+def delete_records(record_keys, filename=RECORD_STORE_FILE):
+    """
+    Remove records from the record store, e.g. rows of an uploaded csv that has since changed or been removed.
+
+    Args:
+        record_keys (list): Keys of records to remove.
+        filename (str): Path to SQLite database file.
+
+    Returns:
+        int: Number of records removed.
+    """
+
+    if not record_keys:
+        return 0
+
+    with connect_record_store(filename) as conn:
+        removed = conn.executemany("DELETE FROM foi_records WHERE record_key = ?", [(key,) for key in record_keys]).rowcount
+    conn.close()
+
+    return removed
+
+
+def load_records_from_store(source=None, filename=RECORD_STORE_FILE):
+    """
+    Load records from the record store, in scraped record format.
+
+    Args:
+        source (str, optional): Only records with this 'Source' value e.g. "Hastings Council". Defaults to all.
+        filename (str): Path to SQLite database file.
+
+    Returns:
+        pd.DataFrame: FOI request records (plus 'First Seen'/'Last Seen'), newest request first.
+    """
+
+    select_columns = ", ".join(f'{column} AS "{field}"' for field, column in RECORD_STORE_COLUMNS.items())
+    query = f'SELECT {select_columns}, first_seen AS "First Seen", last_seen AS "Last Seen" FROM foi_records'
+    params = []
+    if source:
+        query += " WHERE source = ?"
+        params.append(source)
+    query += " ORDER BY request_date_iso DESC, record_key"
+
+    with connect_record_store(filename) as conn:
+        records_df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+
+    return records_df
+
+
+def seed_record_store(filename=RECORD_STORE_FILE, published_filename=SUMMARY_CSV_FILE):
+    """
+    Seed an empty record store (e.g. on a fresh clone) with the published summary csv's records.
+
+    The store isn't committed, so without this outputs built from it would only have this run's records
+    (or none, for regenerate) and replace the published csv and site pages.
+
+    Args:
+        filename (str): Path to SQLite database file.
+        published_filename (str): Path to published summary csv.
+
+    Returns:
+        int: Number of records seeded, 0 if the store already had records.
+    """
+
+    with connect_record_store(filename) as conn:
+        stored = conn.execute("SELECT COUNT(*) FROM foi_records").fetchone()[0]
+    conn.close()
+    if stored or not os.path.exists(published_filename):
+        return 0
+
+    records = [record for source in SOURCE_LABELS.values() for record in load_published_records(source, published_filename)]
+    seeded = upsert_records(records, "published", filename)
+    print(f"Record store {filename} was empty, seeded with {seeded} published records from {published_filename}.")
+    return seeded
+
+
+# added filtering process more applicable for whatdotheyknow results, as these are very mixed in source/relevance
+# known row/record values to explicitly remove based on 'authority name' sub-string match
+# i.e. did we see anything in the output we just want to remove at face value. 
+NON_RELEVANT_LA_NAMES = ["Beauchamp", "Asheldham", 
+                         "Belfast", "Omagh", "Ballymena", "Ballymoney", "Derry", 
+                         "Northern Ireland", "Education Authority, Northern Ireland",
+                         "Welsh Parliament",
+                         "Village Council",
+                         "School",  "Canal & River Trust", "Parish",  "Family Procedure Rule Committee", "General Register Office", "Partnership", "Natural Resources",
+                         "Hughes Hall",  "Association", "Safeguarding", "Foundation", 
+                         "Research Agency", "Statistics", "Ombudsman", "Office", "Service", "Commissioner",
+                         "University", "College", "Academy",
+                         "NSPCC", "NHS", "Health and Care", "Healthwatch", "Social Care Council"
+                         "Ministry of Justice", "Constabulary", "Police", "National", "Ministry of Defence",
+                         "Department for Education", "Department for Work and Pensions", "Department of Health", "Department of Health and Social Care", 
+                         "Government", "Revenue and Customs", "House of Commons", "Supreme Court",
+                         "Driver and Vehicle Licensing Agency"
+                         ]
+NON_RELEVANT_TITLES = ["test request", "sample FOI", "irrelevant inquiry"] # defined, but not yet needed
+
+# compiled once, single pass per name finds whichever unwanted word matches (escaped to prevent regex issues)
+NON_RELEVANT_LA_PATTERN = re.compile("|".join(map(re.escape, NON_RELEVANT_LA_NAMES)), re.IGNORECASE)
+NON_RELEVANT_TITLE_PATTERN = re.compile("|".join(map(re.escape, NON_RELEVANT_TITLES)), re.IGNORECASE)
+NON_RELEVANT_LABELS = {word.lower(): word for word in NON_RELEVANT_LA_NAMES + NON_RELEVANT_TITLES} # matched text -> word as listed
+
+EXCLUDED_RECORDS_FILE = "state/excluded_foi_records.csv" # audit of filtered out records + reason
+EXCLUDED_RECORDS = [] # excluded record dfs, per filter call this run
+
+AUTHORITY_INDEX_FILE = "state/authority_index.json" # authority id/name variants -> canonical authority (+ in-scope flag), kept across runs
+AUTHORITY_FILLER_WORDS = {"the", "of", "and", "council", "borough", "county", "district", "metropolitan"} # dropped for the fuzzy name form (place words like "city", "london" kept)
+ONS_CODE_PATTERN = re.compile(r"[EWSN]\d{8}", re.IGNORECASE) # e.g. E07000062, LA codes given as 'Authority ID' by LA uploads
+
+
+@lru_cache(maxsize=None)
+def normalise_text(text, strip=True):
+    """
+    Normalise name/title for consistent matching, lower case, single spaced, ASCII only.
+
+    Args:
+        text (str): Authority name or request title.
+        strip (bool): Also remove leading/trailing spaces.
+
+    Returns:
+        str: Normalised text (non-str values returned as is).
+    """
+
+    if not isinstance(text, str):
+        return text
+    text = re.sub(r"\s+", " ", text.lower())  # multiple spaces to single space
+    text = text.encode("ascii", "ignore").decode("utf-8")  # Encode to ASCII for consistency
+    return text.strip() if strip else text
+
+
+def fuzzy_authority_name(normalised_name):
+    """
+    Fuzzy form of an authority name, council type and filler words dropped.
+
+    e.g. "Barnet Borough Council", "Barnet Council" -> "barnet", "Kent County Council" -> "kent", "City of London" -> "city london".
+
+    Args:
+        normalised_name (str): Normalised authority name.
+
+    Returns:
+        str: Fuzzy name, "" if nothing left.
+    """
+
+    words = re.sub(r"[^a-z0-9 ]+", " ", normalised_name.replace("&", " and ")).split()
+    return " ".join(word for word in words if word not in AUTHORITY_FILLER_WORDS)
+
+
+@lru_cache(maxsize=None)
+def authority_name_exclusion(normalised_name):
+    """
+    Get exclusion reason for an authority name.
+
+    Args:
+        normalised_name (str): Normalised authority name.
+
+    Returns:
+        str or None: Exclusion reason e.g. "authority name: School", None if relevant.
+    """
+
+    match = NON_RELEVANT_LA_PATTERN.search(normalised_name) if isinstance(normalised_name, str) else None
+    return f"authority name: {NON_RELEVANT_LABELS[match.group(0).lower()]}" if match else None
+
+
+class AuthorityIndex:
+    """
+    Persisted index of authority ids and names seen, each resolved to one canonical authority.
+
+    An 'Authority ID' (WDTK body slug, Hastings' id, LA code from uploads) is authoritative, "id:<id>" always
+    resolves to the authority first created for it and a new id is a new authority, never merged by name.
+    An unknown LA code is attached to the authority with exactly the same name, if there is one.
+    Exact normalised names ("name:<name>") resolve records without an id, preferring an authority with an id.
+    Only records with no id and an unknown name are fuzzy matched (council type/filler words dropped) against
+    authorities with an id; fuzzy matches are logged and not persisted, so they follow AUTHORITY_FILLER_WORDS.
+    Each authority keeps its display name, any ONS style codes and its in-scope flag, classified once when
+    first seen (reclassified only if NON_RELEVANT_LA_NAMES changes). Aliases can be edited by hand to merge authorities.
+    """
+
+    def __init__(self, filename=AUTHORITY_INDEX_FILE):
+        self.filename = filename
+        self.authorities = None # canonical key -> {"name", "codes", "in_scope", "reason"}
+        self.aliases = {}
+        self.fuzzy_matches = {} # (record name, canonical key) fuzzy matched this run
+        self._fuzzy_keys = None # fuzzy name -> keys of authorities with an id, built on first fuzzy lookup
+        self._resolved = {} # (authority id, name) -> canonical key with an id, this run
+        self._changed = False
+        self._lock = threading.Lock() # sources resolve concurrently while streaming
+
+    def _load(self):
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            index = {}
+        self.authorities = index.get("authorities", {})
+        self.aliases = {alias: key for alias, key in index.get("aliases", {}).items() if alias.startswith(("id:", "name:"))}
+        self._changed = len(self.aliases) != len(index.get("aliases", {})) # fuzzy aliases no longer persisted
+
+        # exclusion list changed since classified, reclassify every authority
+        if index.get("exclusions_version") != self.exclusions_version():
+            for authority in self.authorities.values():
+                authority["reason"] = authority_name_exclusion(normalise_text(authority["name"]))
+                authority["in_scope"] = authority["reason"] is None
+            self._changed = True
+
+    @staticmethod
+    def exclusions_version():
+        return hashlib.sha1("|".join(NON_RELEVANT_LA_NAMES).encode("utf-8")).hexdigest()[:12]
+
+    @staticmethod
+    def has_id(key):
+        return not key.startswith("name:") # name only authorities are keyed by their name alias
+
+    def _add_authority(self, key, authority_name, normalised_name):
+        if key not in self.authorities:
+            reason = authority_name_exclusion(normalised_name)
+            self.authorities[key] = {"name": authority_name.strip() if normalised_name else "Unknown", "codes": [], "in_scope": reason is None, "reason": reason}
+            self._changed = True
+
+    def _set_alias(self, alias, key):
+        if self.aliases.get(alias) != key:
+            self.aliases[alias] = key
+            self._changed = True
+            if alias.startswith("name:") and self.has_id(key) and self._fuzzy_keys is not None:
+                self._fuzzy_keys.setdefault(fuzzy_authority_name(alias[5:]), set()).add(key)
+
+    def _fuzzy_match(self, normalised_name):
+        if self._fuzzy_keys is None:
+            self._fuzzy_keys = {}
+            for alias, key in self.aliases.items():
+                if alias.startswith("name:") and self.has_id(key):
+                    self._fuzzy_keys.setdefault(fuzzy_authority_name(alias[5:]), set()).add(key)
+        keys = self._fuzzy_keys.get(fuzzy_authority_name(normalised_name)) if fuzzy_authority_name(normalised_name) else None
+        return next(iter(keys)) if keys and len(keys) == 1 else None # ambiguous matches left unmerged
+
+    def resolve(self, authority_id, authority_name):
+        """
+        Get canonical key for a record's authority, adding it (and any new aliases) to the index.
+
+        Args:
+            authority_id (str): Record 'Authority ID', e.g. WDTK body slug or LA code ("", None, "Unknown" if none).
+            authority_name (str): Record 'Authority Name'.
+
+        Returns:
+            str: Canonical authority key.
+        """
+
+        key = self._resolved.get((authority_id, authority_name))
+        if key is not None:
+            return key
+
+        if isinstance(authority_id, str) and authority_id.strip() not in ("", "Unknown"):
+            normalised_id = authority_id.strip().rstrip("/").rsplit("/", 1)[-1].lower() # slug from body url if given as one
+        else:
+            normalised_id = ""
+        normalised_name = normalise_text(authority_name) if isinstance(authority_name, str) else ""
+        code = normalised_id.upper() if ONS_CODE_PATTERN.fullmatch(normalised_id) else None
+        id_alias, name_alias = f"id:{normalised_id}", f"name:{normalised_name}"
+
+        with self._lock:
+            if self.authorities is None:
+                self._load()
+
+            if normalised_id:
+                key = self.aliases.get(id_alias)
+                if key is None and code and self.has_id(self.aliases.get(name_alias, "name:")):
+                    key = self.aliases[name_alias] # new LA code for an authority we know by exactly this name
+                    print(f"Authority index: LA code {code} added to {self.authorities[key]['name']} ({key}), same name.")
+                if key is None:
+                    key = normalised_id
+                    self._add_authority(key, authority_name, normalised_name)
+                self._set_alias(id_alias, key)
+                if code and code not in self.authorities[key]["codes"]:
+                    self.authorities[key]["codes"].append(code)
+                    self._changed = True
+                # exact name resolves id-less records to an authority with an id, over a name only one
+                if normalised_name and not self.has_id(self.aliases.get(name_alias, "name:")):
+                    self._set_alias(name_alias, key)
+            else:
+                key = self.aliases.get(name_alias)
+                fuzzy_key = self._fuzzy_match(normalised_name) if key is None or not self.has_id(key) else None
+                if fuzzy_key is not None:
+                    key = fuzzy_key # authority with an id over a name only one
+                    if (authority_name, key) not in self.fuzzy_matches:
+                        self.fuzzy_matches[(authority_name, key)] = self.authorities[key]["name"]
+                        print(f"Authority index: '{authority_name}' fuzzy matched to {self.authorities[key]['name']} ({key}).")
+                if key is None:
+                    key = name_alias if normalised_name else "unknown"
+                    self._add_authority(key, authority_name, normalised_name)
+                    if normalised_name:
+                        self._set_alias(name_alias, key)
+
+            if self.has_id(key):
+                self._resolved[(authority_id, authority_name)] = key # name only keys not cached, an id'd authority may take the name later
+        return key
+
+    def exclusion_reason(self, key):
+        """Exclusion reason for a canonical authority, None if in scope."""
+        return self.authorities[key]["reason"]
+
+    def save(self):
+        """Write index, if anything was added or reclassified this run."""
+        if not self._changed:
+            return
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        tmp = f"{self.filename}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"exclusions_version": self.exclusions_version(), "authorities": self.authorities, "aliases": self.aliases}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.filename)
+        self._changed = False
+
+
+AUTHORITY_INDEX = AuthorityIndex(AUTHORITY_INDEX_FILE)
+
+
+def classify_title(normalised_title):
+    """
+    Get exclusion reason for a request title.
+
+    Args:
+        normalised_title (str): Normalised request title.
+
+    Returns:
+        str or None: Exclusion reason e.g. "request title: test request", None if relevant.
+    """
+
+    match = NON_RELEVANT_TITLE_PATTERN.search(normalised_title) if isinstance(normalised_title, str) else None
+    return f"request title: {NON_RELEVANT_LABELS[match.group(0).lower()]}" if match else None
+
+
+@lru_cache(maxsize=None)
+def minhash_params():
+    """
+    Fixed (not random) hash params, so signatures and cluster ids are reproducible between runs.
+
+    Returns:
+        tuple: (a, b, prime) for the (a*x + b) mod prime permutations.
+    """
+
+    prime = np.uint64(4294967291) # largest prime < 2^32
+    a = np.array([int(hashlib.sha1(f"a{i}".encode()).hexdigest()[:8], 16) % (2**31 - 1) + 1 for i in range(MINHASH_PERMUTATIONS)], dtype=np.uint64)
+    b = np.array([int(hashlib.sha1(f"b{i}".encode()).hexdigest()[:8], 16) for i in range(MINHASH_PERMUTATIONS)], dtype=np.uint64)
+    return a, b, prime
+
+
+def minhash_signature(title, shingle_size=4):
+    """
+    MinHash signature of a normalised title's character shingles.
+
+    Args:
+        title (str): Normalised request title.
+        shingle_size (int): Shingle length in chars.
+
+    Returns:
+        np.ndarray: MINHASH_PERMUTATIONS min hash values.
+    """
+
+    title = " ".join(title.split())
+    shingles = {title[i:i + shingle_size] for i in range(max(1, len(title) - shingle_size + 1))}
+    hashes = np.array([zlib.crc32(shingle.encode("utf-8")) for shingle in shingles], dtype=np.uint64)
+
+    # (a*x + b) mod p per permutation, a < 2^31 keeps it within uint64
+    a, b, prime = minhash_params()
+    return ((a[:, None] * hashes[None, :] + b[:, None]) % prime).min(axis=1)
+
+
+def assign_request_clusters(normalised_titles, filename=REQUEST_CLUSTERS_FILE):
+    """
+    Assign each request title a near-duplicate cluster id, using MinHash/LSH (no all-pairs compare).
+
+    Titles seen by previous runs keep their cluster id. A new title joins the cluster whose leader
+    title is its most similar LSH candidate (if at least TITLE_SIMILARITY_THRESHOLD), otherwise it
+    leads a new cluster whose id is derived from the title. Clusters are never renamed or merged, so ids stay stable.
+
+    Args:
+        normalised_titles (pd.Series): Normalised request titles.
+        filename (str): Path to cluster id json file.
+
+    Returns:
+        pd.Series: Cluster id per title (NaN where no title).
+    """
+
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            title_clusters = json.load(f)
+    except (FileNotFoundError, ValueError):
+        title_clusters = {}
+
+    titles = sorted({" ".join(title.split()) for title in normalised_titles.dropna() if isinstance(title, str)})
+    new_titles = [title for title in titles if title not in title_clusters]
+
+    if new_titles:
+        # only cluster leaders (the title a cluster id was derived from) go in the LSH buckets,
+        # so bucket size grows with clusters rather than with near-duplicate titles
+        band_rows = MINHASH_PERMUTATIONS // LSH_BANDS
+        leaders = []
+        leader_signatures = []
+        buckets = {}
+
+        def band_keys(signature):
+            return [(band, signature[band * band_rows:(band + 1) * band_rows].tobytes()) for band in range(LSH_BANDS)]
+
+        def add_leader(title, signature):
+            for key in band_keys(signature):
+                buckets.setdefault(key, []).append(len(leaders))
+            leaders.append(title)
+            leader_signatures.append(signature)
+
+        for title, cluster in sorted(title_clusters.items()):
+            if cluster == "c" + hashlib.sha1(title.encode("utf-8")).hexdigest()[:10]:
+                add_leader(title, minhash_signature(title))
+
+        for title in new_titles: # sorted, so same input gives same ids
+            signature = minhash_signature(title)
+
+            # each candidate scored once, however many bands it shares
+            candidates = set()
+            for key in band_keys(signature):
+                candidates.update(buckets.get(key, ()))
+
+            best_cluster = None
+            if candidates:
+                candidates = sorted(candidates)
+                similarities = (np.array([leader_signatures[candidate] for candidate in candidates]) == signature).mean(axis=1) # estimated Jaccard
+                matches = [(similarity, title_clusters[leaders[candidate]]) for candidate, similarity in zip(candidates, similarities) if similarity >= TITLE_SIMILARITY_THRESHOLD]
+                if matches:
+                    # most similar wins, ties to lowest cluster id
+                    best_cluster = min(matches, key=lambda match: (-match[0], match[1]))[1]
+
+            if best_cluster is None:
+                best_cluster = "c" + hashlib.sha1(title.encode("utf-8")).hexdigest()[:10]
+                add_leader(title, signature)
+            title_clusters[title] = best_cluster
+
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(title_clusters, f, indent=0, sort_keys=True)
+
+        print(f"Request clusters: {len(new_titles)} new titles, {len(set(title_clusters[title] for title in titles))} clusters across {len(titles)} distinct titles.")
+
+    return normalised_titles.map(lambda title: title_clusters.get(" ".join(title.split())) if isinstance(title, str) else np.nan)
+
+
+def save_excluded_records(filename=EXCLUDED_RECORDS_FILE):
+    """
+    Save records removed by the relevance filter this run, with their exclusion reason, for auditing.
+
+    Args:
+        filename (str): Output csv filename.
+
+    Returns:
+        None
+    """
+
+    if not EXCLUDED_RECORDS:
+        return
+
+    excluded_df = pd.concat(EXCLUDED_RECORDS, ignore_index=True)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    excluded_df.to_csv(filename, index=False)
+
+    print(f"Excluded {len(excluded_df)} non-relevant records, audit saved to {filename}:")
+    for reason, count in excluded_df["Exclusion Reason"].value_counts().items():
+        print(f"  {reason}: {count}")
+
+
+def record_exclusion_reason(record):
+    """
+    Get exclusion reason for a single (streamed) record, as filter_and_count_foi_records would.
+
+    Args:
+        record (dict): Scraped FOI request record.
+
+    Returns:
+        str or None: Exclusion reason, None if relevant.
+    """
+
+    # by name only, the index is added to by filter_and_count_foi_records (sources in registry order, so resolution doesn't depend on scrape timing)
+    return (authority_name_exclusion(normalise_text(record.get("Authority Name")))
+            or classify_title(normalise_text(record.get("Request Title"), strip=False)))
+
+
+def count_authority_requests(df):
+    """
+    Add aggr count cols, requests per canonical authority and authorities per request cluster.
+
+    Args:
+        df (pd.DataFrame): Deduplicated FOI request records with 'Authority Key' and 'normalised-request-title'
+            (or an existing 'Request Cluster').
+
+    Returns:
+        pd.DataFrame: Records with 'CSC FOIs on this LA', 'Request Cluster' and 'LAs with same Request'.
+    """
+
+    df["CSC FOIs on this LA"] = df.groupby("Authority Key", observed=True)["Authority Key"].transform("count")
+
+    # distinct authorities with the same Request Title (or a near-duplicate wording of it)
+    if "normalised-request-title" in df.columns:
+        df["Request Cluster"] = assign_request_clusters(df["normalised-request-title"])
+    df["LAs with same Request"] = df.groupby("Request Cluster")["Authority Key"].transform("nunique") # las's with same request (better if we could apply FOIRs!)
+    return df
+
+
+def filter_and_count_foi_records(df):
+    """
+    Remove non-relevant/duplicate FOI records and add aggr count columns.
+
+    Args:
+        df (pd.DataFrame): Scraped FOI request records.
+
+    Returns:
+        pd.DataFrame: Filtered FOI request records with 'Authority Key' (canonical authority, see AuthorityIndex),
+            'CSC FOIs on this LA' and 'LAs with same Request' counts.
+    """
+
+    if not df.empty:
+
+        # low cardinality cols categorical from here through to output, smaller and faster to group/count
+        df = categorise_columns(df)
+
+        # normalised once per distinct title rather than per row
+        df["normalised-request-title"] = df["Request Title"].map(lambda title: normalise_text(title, strip=False))
+
+        # each distinct authority id/name pair looked up once in the authority index, whatever the source,
+        # so the same LA is counted (and in/out of scope) as one authority however a source names it
+        authority_ids = df["Authority ID"].astype(object) if "Authority ID" in df.columns else pd.Series(None, index=df.index, dtype=object)
+        authority_pairs = list(zip(authority_ids.where(authority_ids.notna(), ""), df["Authority Name"].astype(object)))
+        # source ids first, then LA codes (can then join the authority of the same name), then names (can then resolve to either)
+        def resolve_order(pair):
+            return pair[0] == "", bool(ONS_CODE_PATTERN.fullmatch(str(pair[0]).strip())), str(pair)
+
+        authority_keys = {pair: AUTHORITY_INDEX.resolve(*pair) for pair in sorted(set(authority_pairs), key=resolve_order)}
+        df["Authority Key"] = pd.Categorical([authority_keys[pair] for pair in authority_pairs])
+        authority_reasons = {key: AUTHORITY_INDEX.exclusion_reason(key) for key in set(authority_keys.values())}
+
+        df["Exclusion Reason"] = df["Authority Key"].astype(object).map(authority_reasons)
+        title_reasons = df["normalised-request-title"].map(classify_title)
+        df["Exclusion Reason"] = df["Exclusion Reason"].fillna(title_reasons)
+
+        # Remove rows where authority (per the index) or request title contains (known)unwanted words(defined above)
+        excluded = df["Exclusion Reason"].notna()
+        if excluded.any():
+            EXCLUDED_RECORDS.append(df[excluded].drop(columns=["normalised-request-title"]))
+        df = df[~excluded].drop(columns=["Exclusion Reason"])
+
+
+        # 'Date' to datetime for sorting
+        df["Request Date"] = pd.to_datetime(df["Request Date"], format="%d/%m/%Y", errors="coerce")
+
+        # most recent FOI request is kept
+        df = df.sort_values(by="Request Date", ascending=False)
+        df["Request Date"] = df["Request Date"].dt.strftime("%d/%m/%Y") # back to string in "DD/MM/YYYY" format
+
+        # we're searching for term matches not scraping specific links, dups might occur
+        # this must be done prior to any aggr count(s)
+        # N.B further work needed to ensure we retain the best option here. #debug
+        df = df.drop_duplicates(subset=["Authority Key", "normalised-request-title"], keep="first")
+
+        # aggr counts, how manyt requests per LA, how many LA's got same request (recounted across sources by build_outputs)
+        df = count_authority_requests(df)
+
+        # don't need helper col after this point
+        df.drop(columns=["normalised-request-title"], inplace=True)
+
+        # re-sort back to desired for output
+        df = df.sort_values(by=["Authority Name"], ascending=True)
+    
+    return df
+
+
+def scrape_whatdotheyknow(search_terms, base_url, max_pages, incremental=False):
+    """
+    Scrape FOI requests from WhatDoTheyKnow based on search terms, yielding records as each results page completes.
+
+    Search terms are scraped concurrently (up to MAX_WORKERS), and each term's pages
+    too once its result total is known (up to PAGE_WORKERS), with request rate
+    capped per host by get_soup's rate limiter. Only request url -> matching terms
+    is kept for the run (see WdtkRequestStream), not the records. A request returned
+    by more than one term is yielded again by each later matching page, with its
+    longer 'Matched Terms' (latest version wins), attributed to the first of
+    search_terms that returned it.
+
+    Args:
+        search_terms (list): Keywords to filter relevant FOI requests.
+        base_url (str): WhatDoTheyKnow search URL.
+        max_pages (int): Maximum number of pages to scrape.
+        incremental (bool): Stop paginating a term once a page holds only already known requests.
+
+    Yields:
+        dict: Scraped FOI request record.
+    """
+
+    high_water_marks = load_high_water_marks()
+    request_stream = WdtkRequestStream(search_terms)
+
+    # resumed run, records parsed on already completed pages are streamed from the checkpoint, not fetched/parsed again
+    for unit, data in SCRAPE_CHECKPOINT.unit_data("WhatDoTheyKnow"):
+        if unit[2] != "end":
+            request_stream.add(unit[1], data.get("records", []))
+            yield from request_stream.stream()
+
+    # separate pools, term workers wait on their pages so mustn't share one
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor, ThreadPoolExecutor(max_workers=PAGE_WORKERS) as page_executor:
+        futures = []
+        for search_term in search_terms:
+            mark = high_water_marks.get(search_term, {})
+
+            # only safe to stop early once a previous run has paginated the full term
+            known_urls = set(mark.get("known_urls", [])) if incremental and mark.get("complete") else None
+            future = executor.submit(scrape_whatdotheyknow_term, search_term, base_url, max_pages, known_urls, request_stream, page_executor)
+            future.add_done_callback(request_stream.worker_done)
+            futures.append(future)
+
+        # pages' records (any term) as they complete, until every term is done
+        yield from request_stream.stream(workers=len(futures))
+
+        for search_term, future in zip(search_terms, futures):
+            urls, reached_end = future.result()
+            high_water_marks[search_term] = update_high_water_mark(high_water_marks.get(search_term, {}), urls, reached_end)
+
+    save_high_water_marks(high_water_marks)
+    report_search_term_overlap(search_terms, request_stream.terms)
+
+
+class WdtkRequestStream:
+    """
+    Search terms matching each WhatDoTheyKnow request so far, shared by all term/page workers,
+    and a queue the workers' parsed records are streamed out on as each page completes.
+
+    Only request url -> matching terms is kept, not the records. A page only parses the requests its
+    term hasn't matched before, so a request returned by another term is parsed again from that
+    term's page (not re-fetched) and queued again with its longer 'Matched Terms'.
+
+    Args:
+        search_terms (list): Search terms, a request's 'Search Term' is the first of these that matched it.
+    """
+
+    def __init__(self, search_terms):
+        self.term_order = {term: i for i, term in enumerate(search_terms)}
+        self.lock = threading.Lock()
+        self.terms = {} # request url -> matching terms, in search term order
+        self.queue = queue.Queue() # lists of records, None once a term worker is done
+
+    def matched(self, request_url, search_term):
+        """
+        Check whether search_term has already matched a request (so its page needn't parse it).
+        """
+
+        with self.lock:
+            return search_term in self.terms.get(request_url, ())
+
+    def add(self, search_term, records):
+        """
+        Add search_term to the matching terms of a page's parsed records, and queue them with
+        the terms matched so far (thread-safe, in the same order their terms were added).
+
+        Args:
+            search_term (str): Search term whose page the records were parsed from.
+            records (list): Parsed FOI request records.
+        """
+
+        with self.lock:
+            queued = []
+            for record in records:
+                terms = self.terms.setdefault(record["Request URL"], [])
+                if search_term in terms:
+                    continue # repeated in the term's results
+                terms.append(search_term)
+                terms.sort(key=lambda term: self.term_order.get(term, len(self.term_order)))
+                queued.append(dict(record, **{"Search Term": terms[0], "Matched Terms": "; ".join(terms)}))
+            if queued:
+                self.queue.put(queued)
+
+    def worker_done(self, future):
+        """
+        Future done callback for a term worker, queued after all of the term's records.
+        """
+
+        self.queue.put(None)
+
+    def stream(self, workers=0):
+        """
+        Yield queued records as they arrive, until this many term workers are done. With no workers,
+        only the records already queued.
+
+        Args:
+            workers (int): Term workers submitted with worker_done as their done callback.
+
+        Yields:
+            dict: Scraped FOI request record.
+        """
+
+        while workers or not self.queue.empty():
+            records = self.queue.get()
+            if records is None:
+                workers -= 1
+            else:
+                yield from records
+
+
+def scrape_whatdotheyknow_term(search_term, base_url, max_pages, known_urls=None, request_stream=None, page_executor=None):
+    """
+    Scrape all result pages from WhatDoTheyKnow for a single search term.
+
+    Page 1 gives the term's result total and page size, the remaining pages are then fetched
+    concurrently on page_executor (still under the host's rate limiter), PAGE_WORKERS pages at a time,
+    until the last page or a short page (fewer results than page 1), so an over-estimated total costs
+    at most one batch of requests past the end. Falls back to paginating one page at a time where
+    there's no total, no page_executor, or in incremental mode (usually stops after the first page or two).
+
+    Args:
+        search_term (str): Keyword to search on.
+        base_url (str): WhatDoTheyKnow search URL.
+        max_pages (int): Maximum number of pages to scrape.
+        known_urls (set, optional): Request URLs seen by previous runs (incremental mode).
+        request_stream (WdtkRequestStream, optional): Matching terms per request, shared across terms. Each page's
+            parsed records are added (and queued) as the page completes.
+        page_executor (ThreadPoolExecutor, optional): Pool to fetch a term's remaining pages on.
+
+    Returns:
+        tuple: (list of request urls returned for this term in result order, bool True if paginated to the end of the results).
+    """
+
+    if request_stream is None:
+        request_stream = WdtkRequestStream([search_term])
+
+    completed_term = SCRAPE_CHECKPOINT.get("WhatDoTheyKnow", search_term, "end")
+    if completed_term is not None:
+        # finished by the run being resumed, replay its pages rather than fetch
+        urls = []
+        page = 1
+        while SCRAPE_CHECKPOINT.done("WhatDoTheyKnow", search_term, page):
+            urls.extend(SCRAPE_CHECKPOINT.get("WhatDoTheyKnow", search_term, page)["urls"])
+            page += 1
+        return urls, completed_term["reached_end"]
+
+    def get_page(page):
+        # page completed by the run being resumed, replay it rather than fetch
+        completed_page = SCRAPE_CHECKPOINT.get("WhatDoTheyKnow", search_term, page)
+        if completed_page is not None:
+            return completed_page
+
+        completed_page = scrape_whatdotheyknow_page(search_term, base_url, page, request_stream)
+        if completed_page is not None:
+            SCRAPE_CHECKPOINT.complete(("WhatDoTheyKnow", search_term, page), completed_page)
+            request_stream.add(search_term, completed_page["records"])
+        return completed_page
+
+    def page_listings(completed_page):
+        return completed_page.get("listings", len(completed_page["urls"])) # pages checkpointed before "listings" was kept
+
+    urls = []
+    page = 1
+    page_size = None # results per page, as on page 1 (listing elements, not just those parsed)
+    reached_end = True
+    try:
+        while True:
+            if max_pages and page > max_pages:
+                reached_end = False
+                break
+
+            completed_page = get_page(page)
+            if completed_page is None:
+                break
+            urls.extend(completed_page["urls"])
+
+            # incremental, nothing new on this page means older pages were covered by previous runs
+            if known_urls is not None and completed_page["urls"] and all(url in known_urls for url in completed_page["urls"]):
+                print(f"Incremental: page {page} for '{search_term}' holds only known requests, stopping.")
+                break
+
+            if page_size is None:
+                page_size = page_listings(completed_page)
+            elif page_listings(completed_page) < page_size:
+                break # short page, last page of results
+
+            total = completed_page.get("total")
+            if page == 1 and total and page_size and page_executor is not None and known_urls is None:
+                # pages known up front, fan out rather than paginate, a batch at a time
+                last_page = -(-total // page_size)
+                total_estimated = completed_page.get("total_estimated")
+
+                reached_end = None
+                next_page = 2
+                while reached_end is None:
+                    # an estimated total may be short of the real one, keep going until a short/missing page
+                    batch = [batch_page for batch_page in range(next_page, next_page + PAGE_WORKERS)
+                             if (total_estimated or batch_page <= last_page) and not (max_pages and batch_page > max_pages)]
+                    if not batch:
+                        reached_end = not total_estimated and next_page > last_page # else stopped by max_pages
+                        break
+
+                    for completed_page in page_executor.map(get_page, batch): # in page order
+                        if completed_page is None:
+                            reached_end = True
+                            break
+                        urls.extend(completed_page["urls"])
+                        if page_listings(completed_page) < page_size:
+                            reached_end = True # short page, last page of results
+                            break
+                    next_page = batch[-1] + 1
+                break
+
+            page += 1 # pacing now handled by per-host rate limiter in get_soup
+    except FetchError as e:
+        # not the end of the results, so term isn't marked complete (or checkpointed as done, --resume retries it)
+        print(f"'{search_term}' stopped before the end of its results: {e}")
+        FETCH_ERRORS.append(str(e))
+        return urls, False
+
+    SCRAPE_CHECKPOINT.complete(("WhatDoTheyKnow", search_term, "end"), {"reached_end": reached_end})
+    return urls, reached_end
+
+
+def parse_wdtk_result_total(soup):
+    """
+    Read the search's total result count, from e.g. "FOI requests 1 to 25 of about 1,234".
+
+    Args:
+        soup (BeautifulSoup): Parsed WhatDoTheyKnow search results page.
+
+    Returns:
+        tuple: (total or None if not shown, bool True if WDTK only gives an estimate "of about").
+    """
+
+    heading = soup.find("h2", class_="foi_results")
+    if heading is None:
+        return None, False
+    match = re.search(r"of\s+(about\s+)?([\d,]+)", heading.get_text(" ", strip=True))
+    if not match:
+        return None, False
+    return int(match.group(2).replace(",", "")), bool(match.group(1))
+
+
+def scrape_whatdotheyknow_page(search_term, base_url, page, request_stream):
+    """
+    Scrape one WhatDoTheyKnow search results page, parsing requests search_term hasn't already matched.
+
+    Args:
+        search_term (str): Keyword to search on.
+        base_url (str): WhatDoTheyKnow search URL.
+        page (int): Results page number, from 1.
+        request_stream (WdtkRequestStream): Matching terms per request so far, shared across terms/pages.
+
+    Returns:
+        dict or None: {"urls" (request urls in result order), "records" (parsed on this page), "listings" (results
+            on the page, incl. any that failed to parse), "total", "total_estimated"}, None past the end of the results.
+
+    Raises:
+        FetchError: If the page couldn't be fetched.
+    """
+
+    search_url = f"{base_url}{search_term.replace(' ', '%20')}?page={page}&query={search_term.replace(' ', '+')}"
+    print(f"Scraping: {search_url}")
+
+    soup = get_soup(search_url, parse_only=WDTK_LISTING_STRAINER)
+    if not soup:
+        print(f"No page {page} for '{search_term}', end of results.")
+        return None
+
+    results = soup.find_all("div", class_="request_listing")
+    if not results:
+        print("No more results found, stopping.")
+        return None
+
+    total, total_estimated = parse_wdtk_result_total(soup)
+    page_urls = []
+    page_records = []
+    for result in results:
+        request_url = None
+        try:
+            # Extract title and request URL
+            title_element = result.find("a")
+            request_title = title_element.text.strip()
+            request_url = "https://www.whatdotheyknow.com" + title_element["href"]
+            request_url_cleaned = title_element["href"].replace("/request/", "")
+
+            # already returned by this search term (on an earlier page), no need to parse again
+            if request_stream.matched(request_url, search_term):
+                page_urls.append(request_url)
+                continue
+            
+            # Extract authority information
+            requester_element = result.find("div", class_="requester")
+            authority_element = requester_element.find("a", href=True) if requester_element else None
+            authority_url = authority_element["href"] if authority_element else "Unknown"
+            authority_url_cleaned = authority_element["href"].replace("https://www.whatdotheyknow.com/body/", "") if authority_element else "Unknown"
+            authority_name = authority_element.text.strip() if authority_element else "Unknown"
+            
+            # Extract request status
+            status_element = result.find("strong")
+            request_status = status_element.text.strip() if status_element else "Unknown"
+            
+            # Extract request date
+            date_element = requester_element.find("time") if requester_element else None
+            request_date = date_element["datetime"] if date_element else "Unknown"
+            if request_date != "Unknown":
+                request_date = datetime.strptime(request_date[:10], "%Y-%m-%d").strftime("%d/%m/%Y")
+                                
+            # Extract FOI reference number
+            desc_element = result.find("span", class_="desc")
+            foi_reference_number = ""
+            if desc_element:
+                match = re.search(r"\[FOI #(\d+)", desc_element.text)
+                if match:
+                    foi_reference_number = match.group(1)
+
+            record = {
+                "Source": "WhatDoTheyKnow",
+                "Search Term": search_term,
+                "Matched Terms": search_term,
+                "FOIR": foi_reference_number,
+                "Request Title": request_title,
+                "Request URL": request_url,
+                "Request URL Cleaned": request_url_cleaned,
+                "Authority Name": authority_name,
+                "Authority URL": authority_url,
+                "Authority ID": authority_url_cleaned,
+                "Status": request_status,
+                "Request Date": request_date
+            }
+            page_records.append(compact_record(record))
+            page_urls.append(request_url)
+        except Exception as e:
+            print(f"Error parsing result: {e}")
+
+    return {"urls": page_urls, "records": page_records, "listings": len(results), "total": total, "total_estimated": total_estimated}
+
+
+def report_search_term_overlap(search_terms, request_terms):
+    """
+    Print how many requests each search term returned, and how many only that term found.
+
+    Terms with no unique requests add nothing to the output and are candidates for pruning.
+    Kept in TERM_OVERLAP for the run report.
+
+    Args:
+        search_terms (list): Search terms in scrape order.
+        request_terms (dict): Request url -> search terms that returned it.
+
+    Returns:
+        dict: Search term -> {"requests", "unique", "overlap_pct"}.
+    """
+
+    requests = dict.fromkeys(search_terms, 0)
+    unique_requests = dict.fromkeys(search_terms, 0)
+    for terms in request_terms.values():
+        for search_term in terms:
+            requests[search_term] = requests.get(search_term, 0) + 1
+        if len(terms) == 1:
+            unique_requests[terms[0]] = unique_requests.get(terms[0], 0) + 1
+
+    overlap = {}
+    print("\nSearch term overlap (requests | only found by this term | % also found by other terms)")
+    for search_term in search_terms:
+        total, unique = requests[search_term], unique_requests[search_term]
+        overlap_pct = round((total - unique) / total * 100, 1) if total else 0.0
+        overlap[search_term] = {"requests": total, "unique": unique, "overlap_pct": overlap_pct}
+        print(f"  {search_term:<30} {total:>6} | {unique:>6} | {overlap_pct:>5}%{'  <- no unique results' if total and not unique else ''}")
+
+    TERM_OVERLAP.update(overlap)
+    return overlap
+
+
+TERM_OVERLAP = {}
+
+
+def load_high_water_marks(filename=WDTK_HIGH_WATER_FILE):
+    """
+    Load per search term high-water marks from previous WhatDoTheyKnow runs.
+
+    Args:
+        filename (str): Path to high-water mark json file.
+
+    Returns:
+        dict: {search term: {"complete", "known_urls"}}, empty if none saved.
+    """
+
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_high_water_marks(high_water_marks, filename=WDTK_HIGH_WATER_FILE):
+    """
+    Save per search term high-water marks for the next (incremental) run.
+
+    Args:
+        high_water_marks (dict): Marks as returned by load_high_water_marks.
+        filename (str): Path to high-water mark json file.
+
+    Returns:
+        None
+    """
+
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(high_water_marks, f, indent=1)
+
+
+def update_high_water_mark(mark, term_urls, reached_end):
+    """
+    Fold this run's request urls for a search term into its high-water mark.
+
+    Args:
+        mark (dict): Existing high-water mark for the term (may be empty).
+        term_urls (list): Request urls returned for the term this run.
+        reached_end (bool): Whether pagination reached the end of the term's results.
+
+    Returns:
+        dict: Updated high-water mark.
+    """
+
+    known_urls = set(mark.get("known_urls", []))
+    known_urls.update(term_urls)
+
+    # incremental runs stop on a page of only known urls (search results aren't strictly date ordered, so no newest date stop)
+    return {
+        "complete": mark.get("complete", False) or reached_end, # full term paginated at least once
+        "known_urls": sorted(known_urls),
+    }
+
+
+def load_published_records(source, filename=SUMMARY_CSV_FILE):
+    """
+    Load previously published summary csv rows for a source, to merge new records into.
+
+    Args:
+        source (str): FOI data source, as in the csv 'Source' column.
+        filename (str): Path to published summary csv.
+
+    Returns:
+        list: FOI request records in scraped record format (aggr counts dropped, recalculated later).
+    """
+
+    try:
+        published_df = pd.read_csv(filename, dtype=str, keep_default_na=False)
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        print(f"No previously published records found: {filename}. Incremental run starts from empty.")
+        return []
+
+    published_df = published_df[published_df["Source"] == source]
+    published_df = published_df.drop(columns=["CSC FOIs on this LA", "LAs with same Request", "Request Cluster", "SSD-FOIR"], errors="ignore")
+
+    # csv published before 'Matched Terms' was added, first matching term only
+    if "Matched Terms" not in published_df.columns:
+        published_df["Matched Terms"] = published_df["Search Term"]
+
+    # cols not carried into the published csv
+    published_df["Request URL Cleaned"] = published_df["Request URL"].str.replace(r"^https://www\.whatdotheyknow\.com/request/", "", regex=True)
+    published_df["Authority URL"] = ""
+    published_df["Authority ID"] = ""
+
+    print(f"Merging {len(published_df)} previously published {source} records from {filename}.")
+    return published_df.to_dict("records")
+
+
+def scrape_hastings_foi(search_terms, base_url, start_year=None, end_year=2016):
+    """
+    Scrape FOI requests from Hastings Council listing pages, yielding records as they're found.
+
+    Year listings, then detail pages not parsed before, are fetched concurrently (PAGE_WORKERS, host rate
+    limit still applies), records yielded newest year first in listing order. Past years' listings are
+    effectively frozen, so once fully scraped a year is closed (HASTINGS_YEARS_FILE) and its listing only
+    re-fetched every HASTINGS_REVALIDATE_DAYS.
+
+    Args:
+        search_terms (list): Keywords to filter relevant FOI requests.
+        base_url (str): Hastings Council FOI listing URL.
+        start_year (int, optional): Start year for scraping (default: current year).
+        end_year (int): End year for scraping (default: 2016 - this as far as they publish).
+
+    Yields:
+        dict: Scraped FOI request record.
+    """
+
+    
+    if start_year is None:
+        start_year = datetime.today().year  # use current year
+
+    years = list(range(start_year, end_year - 1, -1)) 
+
+    details_cache = load_hastings_details() # only fetch detail pages for ids not seen before
+    closed_years = load_hastings_years()
+    revalidate_before = datetime.now() - timedelta(days=HASTINGS_REVALIDATE_DAYS)
+    last_closable_year = (datetime.today() - timedelta(days=HASTINGS_CLOSE_AFTER_DAYS)).year - 1 # years ended long enough ago to be final
+    missing_listings = set() # years whose listing wasn't there this run, possibly only for now so not closed on it
+
+    def matched_terms(foi_title):
+        return [term for term in search_terms if term.lower() in foi_title.lower()]
+
+    def get_listing(year):
+        """Listing entries [(foi_id, foi_title)] for a year, None if it has no listing (or FetchError)."""
+        closed = closed_years.get(str(year))
+        if closed and datetime.fromisoformat(closed["closed_at"]) > revalidate_before:
+            return closed["entries"] # closed year, not re-fetched
+
+        soup = get_soup(f"{base_url}?year={year}", parse_only=HASTINGS_LISTING_STRAINER)
+        if not soup:
+            # no listing for this year, a closed year (revalidation due) keeps the entries it was closed with
+            missing_listings.add(year)
+            return closed["entries"] if closed else None
+        # all FOI request links + titles (not only matches, so a closed year serves any search terms)
+        return [[entry.get("href", "").strip(), entry.get("title", "").strip()] for entry in soup.select("#FoiList ul li a")]
+
+    def get_detail(foi_id):
+        """Parsed detail page for a listing href, None if no page (or FetchError)."""
+        foi_request_number = ""
+        match = re.search(r"FOIR-(\d+)", foi_id) # from search results page, used if detail page has none
+        if match:
+            foi_request_number = match.group(1)
+
+        foi_soup = get_soup(f"{base_url}{foi_id}")
+        return parse_hastings_detail(foi_soup, foi_request_number) if foi_soup else None
+
+    # years completed by the run being resumed are replayed from the checkpoint rather than fetched
+    fetch_years = [year for year in years if not SCRAPE_CHECKPOINT.done("HastingsCouncil", year, "end")]
+
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+        listing_futures = {year: executor.submit(get_listing, year) for year in fetch_years}
+
+        # queue each matching detail page not parsed before, as soon as its year's listing arrives
+        detail_futures = {}
+        for year in fetch_years:
+            try:
+                entries = listing_futures[year].result()
+            except FetchError:
+                continue # reported below, in year order
+            for foi_id, foi_title in entries or []:
+                if (foi_id and matched_terms(foi_title) and foi_id not in details_cache and foi_id not in detail_futures
+                        and not SCRAPE_CHECKPOINT.done("HastingsCouncil", year, foi_id)):
+                    detail_futures[foi_id] = executor.submit(get_detail, foi_id)
+
+        for year in years:
+            completed_year = SCRAPE_CHECKPOINT.get("HastingsCouncil", year, "end")
+            if completed_year is not None:
+                for foi_id in completed_year["foi_ids"]:
+                    yield SCRAPE_CHECKPOINT.get("HastingsCouncil", year, foi_id)["record"]
+                continue
+
+            year_url = f"{base_url}?year={year}"
+            is_closed = str(year) in closed_years and datetime.fromisoformat(closed_years[str(year)]["closed_at"]) > revalidate_before
+            print(f"Scraping FOI requests for {year}: {year_url}{' (closed, listing not re-fetched)' if is_closed else ''}")
+
+            try:
+                entries = listing_futures[year].result()
+            except FetchError as e:
+                print(f"Skipping {year}, listing not fetched: {e}")
+                FETCH_ERRORS.append(str(e))
+                continue
+
+            new_details = 0
+            year_foi_ids = []
+            year_complete = True
+
+            for foi_id, foi_title in entries or []:
+                foi_url = f"{base_url}{foi_id}" if foi_id else None
+                terms = matched_terms(foi_title)
+
+                # Check if request title contains any of our search terms
+                if terms and foi_url:
+
+                    completed_foi = SCRAPE_CHECKPOINT.get("HastingsCouncil", year, foi_id)
+                    if completed_foi is not None:
+                        year_foi_ids.append(foi_id)
+                        yield completed_foi["record"]
+                        continue
+
+                    detail = details_cache.get(foi_id)
+                    if detail is None:
+                        print(f"Processing FOI request: {foi_title} ({foi_url})")
+
+                        try:
+                            # listed in another year too (already fetched there) or closed year listing with new matches
+                            detail = (detail_futures.pop(foi_id) if foi_id in detail_futures else executor.submit(get_detail, foi_id)).result()
+                        except FetchError as e:
+                            print(f"Skipping FOI request, not fetched: {e}")
+                            FETCH_ERRORS.append(str(e))
+                            year_complete = False
+                            continue
+                        if detail is None:
+                            continue
+
+                        details_cache[foi_id] = detail
+                        new_details += 1
+
+                    record = {
+                        "Source": "Hastings Council",
+                        "Search Term": terms[0],
+                        "Matched Terms": "; ".join(terms),
+                        "FOIR": detail["FOIR"],
+                        "Request Title": detail["Request Title"],
+                        "Request URL": foi_url,
+                        "Request URL Cleaned": foi_id.replace("?id=", ""),
+                        "Authority Name": "Hastings Borough Council",
+                        "Authority URL": "https://www.hastings.gov.uk",
+                        "Authority ID": "hastings_borough_council",
+                        "Status": detail["Status"],
+                        "Request Date": detail["Request Date"],
+                    }
+                    compact_record(record)
+                    SCRAPE_CHECKPOINT.complete(("HastingsCouncil", year, foi_id), {"record": record})
+                    year_foi_ids.append(foi_id)
+                    yield record
+
+            if new_details:
+                save_hastings_details(details_cache) # per year, so a failed run keeps what it fetched
+            if year_complete:
+                SCRAPE_CHECKPOINT.complete(("HastingsCouncil", year, "end"), {"foi_ids": year_foi_ids})
+
+                # fully scraped past year, listing won't change, skip it until revalidation due
+                # (not on a missing listing, a transient 404 mustn't close a year, or push back its revalidation)
+                if year <= last_closable_year and not is_closed and year not in missing_listings:
+                    closed_years[str(year)] = {"closed_at": datetime.now().isoformat(timespec="seconds"), "entries": entries}
+                    save_hastings_years(closed_years)
+
+
+def parse_hastings_detail(foi_soup, foi_request_number=""):
+    """
+    Parse Hastings Council FOI detail page into its request details.
+
+    Args:
+        foi_soup (BeautifulSoup): Parsed FOI detail page.
+        foi_request_number (str): FOIR number from listing page, used if detail page has none.
+
+    Returns:
+        dict: {"FOIR", "Request Title", "Request Date", "Status"}.
+    """
+
+    # Extract request ID from the sub-page, override search result if found
+    request_id_element = foi_soup.find("h1")
+    if request_id_element:
+        match = re.search(r"FOI[R]?-(\d+)", request_id_element.text)  # find both FOIR- and FOI-
+        if match:
+            foi_request_number = match.group(1)  # Override with more reliable sub-page ID
+
+    # Extract request title
+    request_title = foi_soup.find("h2").text.strip()
+
+    # Extract request date (first date after 'Requested')
+    request_date = ""
+    main_div = foi_soup.find("div", class_="main")
+    if main_div:
+        date_text = main_div.find(string=re.compile(r"Requested", re.IGNORECASE))
+        if date_text:
+            date_match = re.search(r"(\d{1,2} \w+ \d{4})", date_text)
+            if date_match:
+                request_date = datetime.strptime(date_match.group(1), "%d %B %Y").strftime("%d/%m/%Y")
+
+    # Extract status from "Response" section
+    status = "Successful"  # Default assumption
+    response_heading = main_div.find(re.compile(r"^h\d$"), string=re.compile(r"Response", re.IGNORECASE))
+
+    if response_heading:
+        response_text = response_heading.find_next_sibling().text.strip().lower()
+
+        if "information not held" in response_text:
+            status = "Information not held"
+        elif any(word in response_text for word in ["refused", "refusal"]):
+            status = "Refused"
+
+    return {
+        "FOIR": foi_request_number,
+        "Request Title": request_title,
+        "Request Date": request_date,
+        "Status": status,
+    }
+
+
+def load_hastings_details(filename=HASTINGS_DETAILS_FILE):
+    """
+    Load previously parsed Hastings FOI detail records.
+
+    Args:
+        filename (str): Path to details json file.
+
+    Returns:
+        dict: {listing href (e.g. '?id=FOIR-123'): detail record}, empty if none saved.
+    """
+
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_hastings_details(details_cache, filename=HASTINGS_DETAILS_FILE):
+    """
+    Save parsed Hastings FOI detail records for re-use by later runs.
+
+    Args:
+        details_cache (dict): Detail records keyed by listing href.
+        filename (str): Path to details json file.
+
+    Returns:
+        None
+    """
+
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(details_cache, f, indent=1, sort_keys=True)
+
+
+def load_hastings_years(filename=HASTINGS_YEARS_FILE):
+    """
+    Load closed Hastings years, fully scraped past years whose listing isn't re-fetched.
+
+    Args:
+        filename (str): Path to closed years json file.
+
+    Returns:
+        dict: {year (str): {"closed_at": iso timestamp, "entries": [[listing href, title], ...]}}, empty if none saved.
+    """
+
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_hastings_years(closed_years, filename=HASTINGS_YEARS_FILE):
+    """
+    Save closed Hastings years for later runs.
+
+    Args:
+        closed_years (dict): Closed years, see load_hastings_years.
+        filename (str): Path to closed years json file.
+
+    Returns:
+        None
+    """
+
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(closed_years, f, indent=1, sort_keys=True)
+
+
+
+
+def transform_foi_data_list_format(df):
+    """
+    Transform FOI data into grouped HTML list format.
+
+    Args:
+        df (pd.DataFrame): FOI DataFrame.
+
+    Returns:
+        pd.DataFrame: Transformed DataFrame with grouped FOI requests per authority.
+    """
+
+    # sorting before grouping(should already be, but to review)
+    df = df.sort_values(by=["Authority Name", "Request Date"], ascending=[True, False]).reset_index(drop=True)
+    group_keys = ["Authority Name", "CSC FOIs on this LA"]
+
+    # row order within each LA, newest first (same per-group date sort as before, so ties keep their order)
+    row_order = (
+        df.groupby(group_keys, group_keys=False, observed=True)["Request Date"]
+        .apply(lambda dates: dates.sort_values(ascending=False))
+        .index
+    )
+    df = df.loc[row_order]
+
+    # non-numeric vals to NaN, Fill NaN to 0, Cast to int
+    same_request_counts = pd.to_numeric(df["LAs with same Request"], errors="coerce").fillna(0).astype(int).astype(str)
+
+    # Format all FOIs as list items in one vectorised pass, incl. direct link to foi request source page detail
+    foi_list_items = (
+        "<li><b>" + df["Request Date"].astype(str) + "</b>: "
+        + df["Status"].astype(str) + " - " + df["Request Title"].astype(str) + " "
+        + "(" + same_request_counts + " requests) "
+        + '<a href="' + df["Request URL"].astype(str) + '" target="_blank">View FOI</a></li>'
+    )
+
+    # Group by Authority Name and CSC FOIs on this LA, joining each LA's list items (row order kept within groups)
+    grouped_df = (
+        foi_list_items
+        .groupby([df[key] for key in group_keys], observed=True)
+        .agg("".join)
+        .radd("<ul>").add("</ul>")
+        .rename("FOI Requests")
+        .reset_index()
+    )
+
+    return grouped_df
+
+
+def assign_ssd_foi_response_link(df):
+    """
+    Add placeholder SSD FOI response link column.
+
+    Args:
+        df (pd.DataFrame): FOI df
+
+    Returns:
+        pd.DataFrame: Updated df with SSD FOI response link column.
+    """
+
+    if "FOIR" not in df.columns:
+        df.insert(0, "FOIR", "")  # first col
+
+    if "SSD-FOIR" not in df.columns:
+        df.insert(len(df.columns), "SSD-FOIR", 
+                '<a href="https://github.com/data-to-insight/ssd-data-model/tree/main/tools-ssd_foi_requests" target="_blank">SSD-Response</a>'
+        )   # Insert as last column with default link until such time as we 
+            #               a) have a bank of foi tools available and 
+            #               b) figure out how to include the specific link for each foi here)
+
+
+    return df
+
+
+
+# submitted csv header (lower case, single spaced) -> record field
+UPLOAD_COLUMN_ALIASES = {
+    "foi": "FOIR", "foir": "FOIR", "foi ref": "FOIR", "foi reference": "FOIR", "reference": "FOIR",
+    "request date": "Request Date", "date": "Request Date", "date received": "Request Date",
+    "status": "Status", "outcome": "Status",
+    "authority name": "Authority Name", "authority": "Authority Name", "la name": "Authority Name", "local authority": "Authority Name",
+    "authority id": "Authority ID", "authority code": "Authority ID", "la code": "Authority ID",
+    "request title": "Request Title", "title": "Request Title", "request": "Request Title",
+    "request url": "Request URL", "url": "Request URL",
+}
+UPLOAD_REQUIRED_COLUMNS = ["Authority Name", "Request Title"]
+UPLOAD_DATE_FORMATS = ["%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d %B %Y", "%d %b %Y", "%d/%m/%y"]
+
+
+def load_uploads_manifest(filename=UPLOADS_MANIFEST_FILE):
+    """
+    Load the manifest of previously ingested upload files.
+
+    Args:
+        filename (str): Path to manifest json file.
+
+    Returns:
+        dict: {file path: {"sha256", "size", "mtime", "rows", "record_keys", "error", "ingested_at"}}, empty if none saved.
+    """
+
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_uploads_manifest(manifest, filename=UPLOADS_MANIFEST_FILE):
+    """
+    Save the manifest of ingested upload files for the next run.
+
+    Args:
+        manifest (dict): Manifest as returned by load_uploads_manifest.
+        filename (str): Path to manifest json file.
+
+    Returns:
+        None
+    """
+
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def parse_upload_date(value):
+    """
+    Normalise a submitted request date to dd/mm/yyyy, as scraped records have them.
+
+    Args:
+        value (str): Date as submitted, e.g. "2024-03-01" or "1 March 2024".
+
+    Returns:
+        str or None: dd/mm/yyyy date, "" if none given, None if not a recognised date.
+    """
+
+    value = value.strip()
+    if not value:
+        return ""
+    for date_format in UPLOAD_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).strftime("%d/%m/%Y")
+        except ValueError:
+            continue
+    return None
+
+
+def read_la_upload(path):
+    """
+    Read and validate one LA submitted csv, mapping its columns to the scraped record schema.
+
+    Headers are matched ignoring case and stray spaces (see UPLOAD_COLUMN_ALIASES). Columns not
+    in the schema are ignored, rows missing a required value or with an unrecognised date are skipped.
+
+    Args:
+        path (str): Path to csv file.
+
+    Returns:
+        list: FOI request records, as scraped records.
+
+    Raises:
+        ValueError: If a required column is missing.
+    """
+
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        fields = [UPLOAD_COLUMN_ALIASES.get(re.sub(r"\s+", " ", header.strip().lower())) for header in headers]
+
+        missing = [field for field in UPLOAD_REQUIRED_COLUMNS if field not in fields]
+        if missing:
+            raise ValueError(f"missing column(s) {', '.join(missing)}, has {', '.join(header.strip() for header in headers) or 'no header'}")
+        ignored = [header.strip() for header, field in zip(headers, fields) if field is None]
+        if ignored:
+            print(f"{path}: ignoring column(s) not in the FOI record schema: {', '.join(ignored)}")
+
+        records = []
+        skipped = 0
+        for row in reader:
+            values = {field: value.strip() for field, value in zip(fields, row) if field}
+            request_date = parse_upload_date(values.get("Request Date", ""))
+            if not all(values.get(field) for field in UPLOAD_REQUIRED_COLUMNS) or request_date is None:
+                skipped += 1 if any(value.strip() for value in row) else 0 # blank lines aren't worth a mention
+                continue
+
+            records.append({
+                "Source": LASubmittedAdapter.label,
+                "Search Term": "",
+                "Matched Terms": "",
+                "FOIR": values.get("FOIR", ""),
+                "Request Title": values["Request Title"],
+                "Request URL": values.get("Request URL", ""),
+                "Request URL Cleaned": "",
+                "Authority Name": values["Authority Name"],
+                "Authority URL": "",
+                "Authority ID": values.get("Authority ID", ""),
+                "Status": values.get("Status") or "Unknown",
+                "Request Date": request_date,
+            })
+
+    if skipped:
+        print(f"{path}: skipped {skipped} rows with a missing authority name/request title or unrecognised request date.")
+    return records
+
+
+def ingest_la_uploads(uploads_dir=UPLOADS_DIR, manifest=None, stale_keys=None):
+    """
+    Ingest LA submitted FOI csvs from uploads_dir, skipping files already ingested unchanged.
+
+    A file is unchanged if its size + mtime match the manifest, or failing that its content hash
+    does, so re-ingest cost is proportional to what changed. Rows of files that have changed or been
+    removed since they were ingested are added to stale_keys (to be removed from the record store).
+    manifest is updated in place, save it once the yielded records are stored.
+
+    Args:
+        uploads_dir (str): Folder of submitted csv files.
+        manifest (dict, optional): Previously ingested files, see load_uploads_manifest. Defaults to none (ingest all).
+        stale_keys (list, optional): Record keys no longer in any upload are appended here.
+
+    Yields:
+        dict: FOI request record.
+    """
+
+    manifest = {} if manifest is None else manifest
+    stale_keys = [] if stale_keys is None else stale_keys
+
+    paths = []
+    for root, _, files in os.walk(uploads_dir):
+        paths.extend(os.path.join(root, name).replace(os.sep, "/") for name in files if name.lower().endswith(".csv"))
+
+    ingested = skipped = 0
+    for path in sorted(paths):
+        stat = os.stat(path)
+        entry = manifest.get(path, {})
+        if entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+            skipped += 1
+            continue
+
+        with open(path, "rb") as f:
+            sha256 = hashlib.sha256(f.read()).hexdigest()
+        if entry.get("sha256") == sha256:
+            entry.update(size=stat.st_size, mtime=stat.st_mtime) # touched but not changed
+            skipped += 1
+            continue
+
+        try:
+            records = read_la_upload(path)
+            error = None
+        except (ValueError, UnicodeDecodeError, csv.Error) as e:
+            print(f"{path}: not ingested, {e}")
+            records, error = [], str(e)
+
+        record_keys = [record_key(record) for record in records]
+        stale_keys.extend(set(entry.get("record_keys", [])) - set(record_keys))
+        manifest[path] = {
+            "sha256": sha256, "size": stat.st_size, "mtime": stat.st_mtime,
+            "rows": len(records), "record_keys": record_keys, "error": error,
+            "ingested_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        ingested += 1
+        yield from records
+
+    # files since removed from the uploads folder
+    for path in [path for path in manifest if path not in paths]:
+        stale_keys.extend(manifest.pop(path).get("record_keys", []))
+
+    # same row can be in more than one file, only stale once in none
+    current_keys = {key for entry in manifest.values() for key in entry.get("record_keys", [])}
+    stale_keys[:] = sorted(set(stale_keys) - current_keys)
+
+    print(f"LA uploads: {ingested} files ingested, {skipped} unchanged files skipped ({uploads_dir}).")
+
+
+def extract_domain(url):
+    """
+    Extract main domain from URL, removing 'www.' prefix.
+
+    Args:
+        url (str): Full URL.
+
+    Returns:
+        str: Cleaned domain name.
+    """
+
+    netloc = urlparse(url).netloc  # clean/grab domain and tld  e.g. 'www.whatdotheyknow.com'
+    return netloc.replace("www.", "")  # Rem 'www.' if exists
+
+
+# def save_to_html(df, filename="index.html", alternative_view=False):
+#     """
+#     Save FOI request DataFrame as an HTML summary page.
+
+#     Args:
+#         df (pd.DataFrame): FOI request data.
+#         filename (str): Output HTML filename.
+#         alternative_view (bool): Whether to apply alternative grouped view.
+
+#     Returns:
+#         None
+#     """
+
+    
+#     page_title = "Freedom of Information Requests - Children's Services Remit"
+
+#     # Generate sources list from BASE_URLS
+#     sources_list = "".join(
+#         f'<li><a href="{url}">{extract_domain(url)}</a></li>'
+#         for url in BASE_URLS.values()
+#     )
+#     # Append LA submitted record list item(this never in BASE_URLS)
+#     sources_list += '<li>Local authority (colleague-)submitted records</li>'
+
+#     intro_text = (
+#         '<p>This page provides a summary of Freedom of Information (FOI) requests published via the following sources:</p>'
+#         f'<ul>{sources_list}</ul>'
+#         'By creating an automated/timely collated resource of FOI requests, we enable the potential to create the responses/development needed once and share it with any other local authorities who receive similar requests.<br/>'
+#         'FOI requests are regularly submitted to multiple Local Authorities concurrently. By developing the required response query/data summary for one LA, we can then offer on-demand access to any analyst who might receive the same or similar request.'
+#         'Local authorities will need to have deployed the Standard Safeguarding Dataset (SSD) <a href="https://data-to-insight.github.io/ssd-data-model/">SSD</a> '
+#         'and|or be a contributor to this FOI Network in order to download pre-developed response queries from the '
+#         '<a href="https://github.com/data-to-insight/ssd-data-model/tree/main/tools-ssd_foi_requests">SSD tools repository</a>.<br/><br/>'
+#         'Summary data below is aggregated from the above source(s) where FOI requests were relevant to the Children\'s Services Sector.<br/>'
+#         'The raw data, including any additional fields, is available to <a href="downloads/foi_requests_summary.csv">download here</a>.'
+#     )
+    
+#     disclaimer_text = (
+#         '<b>Disclaimer:</b><br/>'
+#         'This summary is generated from publicly available data from the listed sources. Verify before using in reporting.<br/>'
+#         'Due to variations in formatting, some data may be incomplete or inaccurate and some FOI Ref/IDs are not always available. <br/>'
+#         'FOI requests into Scottish LAs and other related organisations are included for wider reference—this may be narrowed to England-only LAs in future.<br/>'
+#         'For details on each request, use the active FOI Request URL links in the table below.<br/>'
+#     )
+
+#     submit_request_text = (
+#         '<p>LA colleagues are encouraged to share both <a href="mailto:datatoinsight@gmail.com?subject=FOI%20Feedback">feedback+corrections</a> or '
+#         '<a href="mailto:datatoinsight@gmail.com?subject=FOI%20details%20to%20add&body=Authority-Name:%20%3Cla-name%3E%0AAuthority-Code:%20%3Cla-code%3E%0ARequest-Title:%20%3Crequest-title%3E">'
+#         'submit new FOI request details</a> to contribute to this resource.</p>'
+#     )
+    
+#     alternative_summary_format = (
+#         f'<br/>We offer an <a href="index_alt_view.html">alternative summary view</a> of this page with additional/verbose detail.'
+#         if filename == "index.html" 
+#         else f'<br/>We offer an <a href="index.html">alternative summary view</a> of this page grouped by LA.'
+#     )
+
+
+
+#     adjusted_timestamp_str = (datetime.now() + timedelta(hours=1)).strftime("%d %B %Y %H:%M")
+
+#     # Apply different styling based on whether alternative view
+#     # the REquest URL col doesnt exist in the alt view, and la name also in different position
+#     if alternative_view:
+#         custom_styles = """
+#             /* Authority Name and Request URL to fit content no wrap */
+#             td:nth-child(4), th:nth-child(4),  
+#             td:nth-child(5), th:nth-child(5),
+#             td:nth-child(7), th:nth-child(7) {
+#                 white-space: nowrap;
+#                 display: block;
+#                 min-width: 80px;
+#                 max-width: 250px;
+#                 overflow: hidden;
+#                 text-overflow: ellipsis;
+#             }
+#         """
+#     else:
+#         custom_styles = """
+#             /* Authority Name column in grouped format */
+#             td:nth-child(1), th:nth-child(1) { 
+#                 white-space: nowrap;
+#                 min-width: 80px;
+#                 max-width: 300px;
+#                 overflow: hidden;
+#                 text-overflow: ellipsis;
+#             }
+#         """
+
+#         # Apply format modifications for alternative view if required
+#         df = df.copy()  
+#         df.loc[:, "Request URL"] = df["Request URL"].apply(lambda x: f'<a href="{x}" target="_blank">View FOI</a>')
+
+
+#     df_html = df.to_html(index=False, escape=False)  # escape=False ensures HTML renders properly
+
+#     html_content = f"""
+#     <html>
+#     <head>
+#         <title>{page_title}</title>
+#         <style>
+#             body {{ font-family: Arial, sans-serif; margin: 20px; padding: 20px; }}
+#             .table-container {{ overflow-x: auto; max-width: 100%; }}
+#             table {{ width: 100%; border-collapse: collapse; font-size: 10pt; }}
+#             table, th, td {{ border: 1px solid #ddd; padding: 8px; }}
+#             th {{ background-color: #f2f2f2; text-align: left; }}
+#             td {{ text-align: left; }}
+#             a {{ color: blue; text-decoration: none; }}
+
+#             {custom_styles}
+#         </style>
+#     </head>
+#     <body>
+#         <h1>{page_title}</h1>
+#         <p>{intro_text}</p>
+#         <p>{disclaimer_text}</p>
+#         <p>{submit_request_text}</p>
+#         <p><b>Summary last updated: {adjusted_timestamp_str}</p>
+#         <p>{alternative_summary_format}</p>
+#         <div class="table-container">
+#             {df_html}
+#         </div>
+#     </body>
+#     </html>
+#     """
+
+#     with open(filename, "w", encoding="utf-8") as f:
+#         f.write(html_content)
+    
+#     print(f"Summary saved to {filename}")
+
+
+
+
+
+MKDOCS_DISCLAIMER_TEXT = """\
+**Disclaimer:**
+
+This summary is generated from publicly available data from the listed sources. Verify before using in critical reporting. 
+Due to variations in source data formatting, some data may be incomplete, mis-represented or inaccurate. 
+FOI requests into Scottish LAs and other related agencies are included for wider reference, potentially reduced to England-only LAs in the future. 
+For details on each request, use the active 'View FOI' links in the table. 
+An expanded raw data version, including some additional fields (e.g. FOIR), is available: [Download FOI request summary (CSV)](downloads/foi_csc_requests_summary.csv)"""
+
+MKDOCS_DOWNLOAD_TEXT = """\
+An expanded raw data version, including some additional fields (e.g. FOIR), is available: [Download FOI request summary (CSV)](downloads/foi_csc_requests_summary.csv)
+"""
+
+MKDOCS_CONTRIBUTE_TEXT = """\
+**Collaborate:**
+
+LA colleagues are encouraged to join the network|contribute:  
+[Send feedback or corrections](mailto:datatoinsight@gmail.com?subject=FOI%20Feedback) 
+and/or [Submit headline details(only) of relevant FOI request made to your LA](mailto:datatoinsight@gmail.com?subject=FOI%20details%20to%20add&body=Authority-Name:%20%3Cla-name%3E%0AAuthority-Code:%20%3Cla-code%3E%0ARequest-Title:%20%3Crequest-title%3E)
+"""
+
+
+def frame_hash(df, *extra):
+    """
+    Content hash of a DataFrame's columns + values (row order incl.), plus any extra strings.
+
+    Args:
+        df (pd.DataFrame): Records behind an output.
+        *extra (str): Anything else the output is rendered from, e.g. page text, shard label.
+
+    Returns:
+        str: Hex digest, same records (whatever their dtype, e.g. categorical or str) give the same hash.
+    """
+
+    digest = hashlib.sha1()
+    for part in [*map(str, df.columns), *map(str, extra)]:
+        digest.update(part.encode("utf-8") + b"\0")
+    digest.update(pd.util.hash_pandas_object(df.astype(object), index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+OUTPUT_CHANGES = {"written": [], "unchanged": []} # csv/site output paths of the last build_outputs, for the run report
+
+class OutputManifest:
+    """
+    Content hashes of the records behind each csv/site output when it was last written (OUTPUTS_MANIFEST_FILE).
+
+    An output (or shard page) whose records hash the same as last time, and whose file still exists, is
+    not re-rendered or rewritten, so its 'Summary last updated' shows when its data last changed and
+    no-change runs leave docs/ untouched.
+    """
+
+    def __init__(self, filename=OUTPUTS_MANIFEST_FILE, force=False):
+        self.filename = filename
+        self.force = force
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                self.hashes = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.hashes = {}
+        self.written = []
+        self.unchanged = []
+
+    def is_current(self, path, content_hash):
+        """True (and counted as unchanged) if path was last written from records with this content hash."""
+        if self.force or self.hashes.get(path) != content_hash or not os.path.exists(path):
+            return False
+        self.unchanged.append(path)
+        return True
+
+    def record(self, path, content_hash):
+        """Note path as (re)written from records with this content hash."""
+        self.hashes[path] = content_hash
+        self.written.append(path)
+
+    def forget(self, path):
+        """Drop a removed output, e.g. a shard page no longer in the data."""
+        self.hashes.pop(path, None)
+
+    def save(self):
+        """Persist hashes, and print + keep (for the run report) what was written vs unchanged."""
+        os.makedirs(os.path.dirname(self.filename) or ".", exist_ok=True)
+        tmp = f"{self.filename}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.hashes, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.filename)
+
+        OUTPUT_CHANGES["written"] = self.written
+        OUTPUT_CHANGES["unchanged"] = self.unchanged
+        print(f"Outputs: {len(self.written)} written, {len(self.unchanged)} unchanged (records hash as last written).")
+        for path in self.written:
+            print(f"  changed: {path}")
+
+
+def save_to_mkdocs(df, filename="docs/index.md"):
+    """
+    Save FOI request DataFrame as a Markdown summary page for MkDocs.
+
+    Args:
+        df (pd.DataFrame): FOI request data.
+        filename (str): Output Markdown filename.
+
+    Returns:
+        None
+    """
+
+    disclaimer_text = MKDOCS_DISCLAIMER_TEXT
+    download_text = MKDOCS_DOWNLOAD_TEXT
+    contribute_text = MKDOCS_CONTRIBUTE_TEXT
+
+    adjusted_timestamp_str = (datetime.now() + timedelta(hours=1)).strftime("%d %B %Y %H:%M")
+    last_updated_text = f"**Summary last updated:** {adjusted_timestamp_str}\n"
+
+    if "Request URL" in df.columns:
+        # this column not in the group variants of the output dfs
+        df.loc[:, "Request URL"] = df["Request URL"].apply(lambda x: f'<a href="{x}" target="_blank">View FOI</a>')
+
+
+
+    # opt 1 (tabulate) - can better control col widths
+    num_cols = len(df.columns)
+    max_widths = [None] * num_cols  # Generate max_widths list, setting all to None except "Request Title"
+
+    if "Request URL" in df.columns:
+        # then if we're handling the more detailed summary view, find & reduce size of title col to fit
+        col_index = df.columns.get_loc("Request Title") # index of "Request Title" column
+        max_widths[col_index] = 100  # Set limit for "Request Title"
+
+    # if "FOI Requests" in df.columns:
+    #     # handling the aggr summary, only one longer col here
+    #     col_index = df.columns.get_loc("FOI Requests") # index of "Request Title" column
+    #     max_widths[col_index] = 200  # Set limit for "Request Title"
+
+    from tabulate import tabulate # summary output
+
+    df_md = tabulate(df, headers="keys", tablefmt="github", numalign="left", stralign="left", maxcolwidths=max_widths, showindex=False)
+
+    # # opt 2 (markdown)
+    # # Convert DataFrame to Markdown table format
+    # df_md = df.to_markdown(index=False)
+
+
+
+
+
+    # Combine all text content
+    md_content = f"{disclaimer_text}\n{download_text}\n\n{contribute_text}\n\n{last_updated_text}\n{df_md}"
+
+    # Ensure docs directory exists
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+    # Save to Markdown file
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(md_content)
+
+    print(f"Summary saved to {filename} for MkDocs processing.")
+
+
+def shard_key(row_values, shard_by):
+    """
+    Get shard (page) key for an output row.
+
+    Args:
+        row_values (dict): Row values, needs 'Authority Name' and/or 'Request Date'.
+        shard_by (str): "letter" (authority initial) or "year" (request year).
+
+    Returns:
+        str: Shard key, also used as page filename e.g. "a", "2024", "other".
+    """
+
+    if shard_by == "year":
+        request_date = str(row_values.get("Request Date", ""))
+        return request_date[-4:] if re.fullmatch(r"\d{2}/\d{2}/\d{4}", request_date) else "unknown"
+
+    initial = str(row_values.get("Authority Name", "")).strip()[:1].lower()
+    return initial if initial.isascii() and initial.isalpha() else "other"
+
+
+def write_markdown_table(f, df):
+    """
+    Stream df to open file as a github markdown table, one row at a time.
+
+    Args:
+        f (file): Open text file to write to.
+        df (pd.DataFrame): Rows to write, 'Request URL' written as a 'View FOI' link.
+
+    Returns:
+        int: Number of rows written.
+    """
+
+    columns = list(df.columns)
+    url_index = columns.index("Request URL") if "Request URL" in columns else None
+
+    f.write("| " + " | ".join(columns) + " |\n")
+    f.write("|" + "|".join("---" for _ in columns) + "|\n")
+
+    rows = 0
+    for row in df.itertuples(index=False, name=None):
+        cells = ["" if pd.isna(value) else str(int(value)) if isinstance(value, float) and value.is_integer() else str(value) for value in row]
+        if url_index is not None and cells[url_index]:
+            cells[url_index] = f'<a href="{cells[url_index]}" target="_blank">View FOI</a>'
+        # keep each row on one table line
+        f.write("| " + " | ".join(cell.replace("|", "\\|").replace("\n", " ") for cell in cells) + " |\n")
+        rows += 1
+
+    return rows
+
+
+def save_to_mkdocs_sharded(df, out_dir=SITE_SHARD_DIR, shard_by="letter", manifest=None):
+    """
+    Save FOI request DataFrame as one Markdown page per shard plus an index page, for MkDocs.
+
+    Rows are streamed to each page rather than built into one table string, so page size
+    and generation time stay bounded by shard size rather than total volume.
+
+    Args:
+        df (pd.DataFrame): FOI request data (detailed view, raw 'Request URL' values).
+        out_dir (str): Output folder for index.md and shard pages.
+        shard_by (str): "letter" (authority initial) or "year" (request year).
+        manifest (OutputManifest, optional): Skip shard pages (+ index) whose records haven't changed.
+
+    Returns:
+        dict: Shard key -> number of rows on each shard page.
+    """
+
+    os.makedirs(out_dir, exist_ok=True)
+    adjusted_timestamp_str = (datetime.now() + timedelta(hours=1)).strftime("%d %B %Y %H:%M")
+    shard_label = "Authorities" if shard_by == "letter" else "Requests from"
+
+    # page-relative link back up to docs/downloads
+    docs_root = os.path.relpath("docs", out_dir).replace(os.sep, "/")
+    disclaimer_text = MKDOCS_DISCLAIMER_TEXT.replace("](downloads/", f"]({docs_root}/downloads/")
+    download_text = MKDOCS_DOWNLOAD_TEXT.replace("](downloads/", f"]({docs_root}/downloads/")
+
+    shard_keys = pd.Series([shard_key(row, shard_by) for row in df[["Authority Name", "Request Date"]].to_dict("records")], index=df.index)
+
+    shard_counts = {}
+    shard_hashes = {}
+    for key in sorted(shard_keys.unique(), reverse=(shard_by == "year")):
+        shard_df = df[shard_keys == key]
+        filename = os.path.join(out_dir, f"{key}.md")
+        shard_counts[key] = len(shard_df)
+
+        shard_hashes[key] = frame_hash(shard_df, shard_by, OUTPUT_FORMAT_VERSION)
+        if manifest and manifest.is_current(filename, shard_hashes[key]):
+            continue # same records as the page already written
+
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(f"# FOI requests: {shard_label} {key.upper()}\n\n")
+            f.write(f"[All FOI request pages](index.md)\n\n**Summary last updated:** {adjusted_timestamp_str}\n\n")
+            write_markdown_table(f, shard_df)
+        if manifest:
+            manifest.record(filename, shard_hashes[key])
+
+    # remove pages for shards no longer in the data
+    for name in os.listdir(out_dir):
+        if name.endswith(".md") and name != "index.md" and name[:-3] not in shard_counts:
+            os.remove(os.path.join(out_dir, name))
+            if manifest:
+                manifest.forget(os.path.join(out_dir, name))
+
+    # index (and its timestamp) only rewritten when some shard page was
+    index_filename = os.path.join(out_dir, "index.md")
+    index_hash = hashlib.sha1(json.dumps([shard_by, MKDOCS_DISCLAIMER_TEXT, MKDOCS_DOWNLOAD_TEXT, MKDOCS_CONTRIBUTE_TEXT, shard_hashes]).encode("utf-8")).hexdigest()
+    if manifest and manifest.is_current(index_filename, index_hash):
+        print(f"Summary pages (by {shard_by}) in {out_dir} unchanged.")
+        return shard_counts
+
+    with open(index_filename, "w", encoding="utf-8") as f:
+        f.write(f"{disclaimer_text}\n{download_text}\n\n{MKDOCS_CONTRIBUTE_TEXT}\n\n**Summary last updated:** {adjusted_timestamp_str}\n\n")
+        f.write(f"| {shard_label} | FOI requests |\n|---|---|\n")
+        for key, rows in shard_counts.items():
+            f.write(f"| [{key.upper()}]({key}.md) | {rows} |\n")
+    if manifest:
+        manifest.record(index_filename, index_hash)
+
+    print(f"Summary saved to {len(shard_counts)} pages (by {shard_by}) in {out_dir} for MkDocs processing.")
+    return shard_counts
+
+
+SEARCH_STOPWORDS = {"a", "an", "and", "are", "as", "at", "by", "for", "from", "in", "is", "of", "on", "or", "the", "to", "with"}
+
+
+def search_tokens(text):
+    """
+    Split text into lower case search tokens, dropping stopwords and single chars.
+
+    Args:
+        text (str): Title/authority/status text.
+
+    Returns:
+        set: Search tokens.
+    """
+
+    if not isinstance(text, str):
+        return set()
+    return {token for token in re.findall(r"[a-z0-9]+", normalise_text(text)) if len(token) > 1 and token not in SEARCH_STOPWORDS}
+
+
+def build_search_index(df, out_dir=SEARCH_INDEX_DIR):
+    """
+    Build sharded, precomputed search index over request title, authority, status and date.
+
+    Writes records/<x>.json (record details, bucketed by record id) and terms/<xx>.json
+    (token -> record ids, bucketed by token prefix), so the site client only downloads the
+    few shards a query needs. Besides words, tokens include 'year:yyyy' and 'status:<word>'.
+    Only shards whose content changed since the last build are rewritten.
+
+    Args:
+        df (pd.DataFrame): FOI request records, needs 'Request Title', 'Authority Name', 'Status', 'Request Date', 'Request URL'.
+        out_dir (str): Output folder for index shards and manifest.json.
+
+    Returns:
+        dict: {"written": [changed shard paths], "removed": [stale shard paths], "unchanged": count}.
+    """
+
+    record_shards = {}
+    term_shards = {}
+
+    for record in df[["Request Title", "Authority Name", "Status", "Request Date", "Request URL"]].to_dict("records"):
+        record = {field: ("" if pd.isna(value) else str(value)) for field, value in record.items()}
+        record_id = hashlib.sha1(record_key(record).encode("utf-8")).hexdigest()[:12] # stable across runs
+
+        record_shards.setdefault(record_id[0], {})[record_id] = [
+            record["Request Title"], record["Authority Name"], record["Status"], record["Request Date"], record["Request URL"]
+        ]
+
+        tokens = search_tokens(record["Request Title"]) | search_tokens(record["Authority Name"]) | search_tokens(record["Status"])
+        tokens |= {f"status:{token}" for token in search_tokens(record["Status"])}
+        if re.fullmatch(r"\d{2}/\d{2}/\d{4}", record["Request Date"]):
+            tokens.add(f"year:{record['Request Date'][-4:]}")
+
+        for token in tokens:
+            term_shards.setdefault(token[:2], {}).setdefault(token, set()).add(record_id)
+
+    shards = {f"records/{key}.json": records for key, records in record_shards.items()}
+    shards.update({
+        f"terms/{key}.json": {token: sorted(ids) for token, ids in terms.items()}
+        for key, terms in term_shards.items()
+    })
+
+    # compare against last build's shard hashes, only (re)write what changed
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous_hashes = json.load(f).get("shards", {})
+    except (FileNotFoundError, ValueError):
+        previous_hashes = {}
+
+    shard_hashes = {}
+    written = []
+    for path, content in sorted(shards.items()):
+        shard_json = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        shard_hashes[path] = hashlib.sha1(shard_json.encode("utf-8")).hexdigest()
+
+        full_path = os.path.join(out_dir, path)
+        if previous_hashes.get(path) == shard_hashes[path] and os.path.exists(full_path):
+            continue
+
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w", encoding="utf-8") as f:
+            f.write(shard_json)
+        written.append(path)
+
+    removed = [path for path in previous_hashes if path not in shard_hashes]
+    for path in removed:
+        full_path = os.path.join(out_dir, path)
+        if os.path.exists(full_path):
+            os.remove(full_path)
+
+    if written or removed or not os.path.exists(manifest_path):
+        os.makedirs(out_dir, exist_ok=True) # no shards to have created it, if no records
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"records": len(df), "shards": shard_hashes}, f, indent=1, sort_keys=True)
+
+    print(f"Search index: {len(written)} shards written, {len(removed)} removed, {len(shards) - len(written)} unchanged ({out_dir}).")
+    return {"written": written, "removed": removed, "unchanged": len(shards) - len(written)}
+
+
+def shorten_headings_for_web(df):
+    """
+    Shorten specific column headings for improved web display.
+
+    Args:
+        df (pd.DataFrame): FOI request data.
+
+    Returns:
+        pd.DataFrame: DataFrame with updated col headings.
+    """
+
+    column_map = {
+        "CSC FOIs on this LA": "LA CSC FOIs",
+        "LAs with same Request": "FOI distributed"
+    }
+
+    # Rename cols if exist in df
+    df = df.rename(columns={col: column_map[col] for col in df.columns if col in column_map})
+
+    ## TEMP - (re)move / refactor later
+    # cols to drop to ensure table fits output space
+    columns_to_drop = ["SSD-FOIR", "FOIR"]  
+    df.drop(columns=[col for col in columns_to_drop if col in df.columns], inplace=True)
+
+
+    return df
+
+
+
+def shorten_status_labels(df):
+    """
+    Shorten vals in 'Status' col to fit available browser/table space within summary table.
+
+    Args:
+        df (pd.DataFrame): FOI request data.
+
+    Returns:
+        pd.DataFrame: DataFrame with updated 'Status' values.
+    """
+
+    status_map = {
+        "awaiting classification": "Awaiting",
+        "waiting clarification": "Clarification",
+        "information not held": "Not Held",
+        "long overdue": "Overdue",
+        "overdue": "Overdue",
+        "partially successful": "Partial",
+        "successful": "Success",
+        "withdrawn by the requester": "Withdrawn",
+        "awaiting internal review": "Int. Review",
+        "refused": "Refused"
+    }
+
+    if "Status" in df.columns:
+        df["Status"] = df["Status"].str.lower().str.strip()  
+        df["Status"] = df["Status"].replace(status_map)  
+
+    return df
+
+
+
+# search terms used against scraped site searches, incl whattheyknow 
+SEARCH_TERMS = ["looked after children", "children in need", "care leavers", "childrens social care", "child fostering", "childrens services", 
+                "foster carer", "social workers", "adoption", "care order", "family support", "special educational needs", "CIN", "serious case reviews"
+                "17254803", "caseload", "child protection"]
+
+SUMMARY_CSV_COLUMNS = ["FOIR", "Status", "Request Date", "CSC FOIs on this LA", "Authority Name", "Request Title", "LAs with same Request", "Request URL", "Source", "Search Term", "Matched Terms", "Request Cluster", "SSD-FOIR"]
+OUTPUTS = ["csv", "search", "site"] # output targets, summary csv download, site search index, MkDocs pages
+
+
+def run_scrape(search_terms=SEARCH_TERMS, sources=None, max_pages=None, incremental=False, resume=False):
+    """
+    Scrape sources (concurrently) as one record store run, then filter and count each source's records.
+
+    Completed scrape units are checkpointed as the run goes (see ScrapeCheckpoint), call
+    SCRAPE_CHECKPOINT.clear() once outputs are written.
+
+    Args:
+        search_terms (list): Keywords to filter FOI requests.
+        sources (list, optional): BASE_URLS keys to scrape. Defaults to all registered sources.
+        max_pages (int, optional): Maximum pages to scrape for paginated sources.
+        incremental (bool): Only scrape new pages and merge with previously published records.
+        resume (bool): Carry on from the checkpoint of a crashed run, with that run's id and options
+            (the options given here are ignored). Starts a new run if there's no checkpoint.
+
+    Returns:
+        dict: Source -> filtered FOI request records (pd.DataFrame), for every registered source. Sources not
+            scraped this run are loaded from the store (or the published csv), so outputs still cover them.
+    """
+
+    global RUN_ID
+    options = SCRAPE_CHECKPOINT.resume() if resume else None
+    if options is not None:
+        RUN_ID = options["run_id"]
+        search_terms, sources, max_pages, incremental = options["search_terms"], options["sources"], options["max_pages"], options["incremental"]
+    else:
+        if resume:
+            print(f"No checkpoint to resume in {SCRAPE_CHECKPOINT.filename}, starting a new run.")
+        if USE_RECORD_STORE:
+            seed_record_store() # fresh store, published records kept alongside what this run scrapes
+        RUN_ID = start_run() if USE_RECORD_STORE else None
+        SCRAPE_CHECKPOINT.start({"run_id": RUN_ID, "search_terms": list(search_terms), "sources": sources, "max_pages": max_pages, "incremental": incremental})
+
+    source_dfs = run_source_adapters(search_terms, sources=sources, max_pages=max_pages, incremental=incremental)
+    if USE_RECORD_STORE:
+        finish_run(RUN_ID)
+
+    # outputs cover all sources, not only those scraped (registry order kept)
+    return {source: source_dfs[source] if source in source_dfs else load_unscraped_source(source) for source in SOURCE_ADAPTERS}
+
+
+def load_unscraped_source(source):
+    """
+    Filter and count a source's records without scraping it, from the store or (no store) the published csv.
+
+    Args:
+        source (str): BASE_URLS key.
+
+    Returns:
+        pd.DataFrame: Filtered FOI request records.
+    """
+
+    if USE_RECORD_STORE:
+        records_df = load_records_from_store(SOURCE_LABELS[source])
+    else:
+        records_df = pd.DataFrame(load_published_records(SOURCE_LABELS[source]))
+    return filter_and_count_foi_records(records_df)
+
+
+def load_from_store(sources=None):
+    """
+    Filter and count previously stored records, no scraping. An empty store is seeded from the published csv first.
+
+    Args:
+        sources (list, optional): BASE_URLS keys to load. Defaults to all registered sources.
+
+    Returns:
+        dict: Source -> filtered FOI request records (pd.DataFrame).
+    """
+
+    sources = list(SOURCE_LABELS) if sources is None else sources
+    seed_record_store()
+    return {source: filter_and_count_foi_records(load_records_from_store(SOURCE_LABELS[source])) for source in sources}
+
+
+def has_published_records(filename=SUMMARY_CSV_FILE):
+    """
+    Check whether the published summary csv has any record rows (not only a header).
+
+    Args:
+        filename (str): Path to published summary csv.
+
+    Returns:
+        bool: True if the csv exists and has at least one record.
+    """
+
+    try:
+        with open(filename, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader, None) # header
+            return next(reader, None) is not None
+    except FileNotFoundError:
+        return False
+
+
+def build_outputs(source_dfs, outputs=OUTPUTS):
+    """
+    Combine source records (LA submitted records are the LASubmitted source), then write the selected outputs.
+
+    Args:
+        source_dfs (dict): Source -> filtered FOI request records.
+        outputs (list): Any of OUTPUTS, "csv" (summary download), "search" (site search index), "site" (MkDocs pages).
+
+    Returns:
+        pd.DataFrame: Combined FOI request records.
+    """
+
+    # Combine sources, incl. LA submitted FOIs (categories differ per source, so re-categorised once combined)
+    source_dfs = [source_df for source_df in source_dfs.values() if not source_df.empty]
+    if source_dfs:
+        df = categorise_columns(pd.concat(source_dfs, ignore_index=True))
+    else:
+        df = pd.DataFrame(columns=[*SUMMARY_CSV_COLUMNS, "Authority Key"])
+        if not ALLOW_EMPTY_OUTPUTS and has_published_records():
+            # e.g. every source failed, published records aren't replaced with none
+            print(f"No FOI request records from any source, published outputs left as they are ({SUMMARY_CSV_FILE} has records, --allow-empty-outputs to empty them).")
+            return df
+        # e.g. only LASubmitted selected with no uploads, outputs written empty (header only csv) rather than failing
+        print("No FOI request records from any source, outputs will be empty.")
+
+    # counts line up across sources, an LA's requests counted together whichever source they came from
+    if "Authority Key" in df.columns:
+        df = count_authority_requests(df)
+
+    # Not yet in use as no/few FOI response solutions exist yet in SSD
+    df = assign_ssd_foi_response_link(df)  # Add placeholder SSD FOI Query|Code Link col
+
+    # Ensure sorted before grouping
+    df = df.sort_values(by=["Authority Name", "Request Date"], ascending=[True, False])
+
+    ## Outputs
+
+    # outputs whose records hash the same as when last written are skipped (not re-rendered)
+    manifest = OutputManifest(OUTPUTS_MANIFEST_FILE, force=FORCE_OUTPUTS)
+
+    # CSV output (written straight from df, no column subset copy)
+    if "csv" in outputs:
+        csv_hash = frame_hash(df[SUMMARY_CSV_COLUMNS], OUTPUT_FORMAT_VERSION)
+        if not manifest.is_current(SUMMARY_CSV_FILE, csv_hash):
+            df.to_csv(SUMMARY_CSV_FILE, columns=SUMMARY_CSV_COLUMNS, index=False)
+            manifest.record(SUMMARY_CSV_FILE, csv_hash)
+
+    # site search, prebuilt index shards over the same records
+    if "search" in outputs:
+        with timed_stage("search_index"):
+            build_search_index(df)
+
+    # reduce cols for ease of formatting on web
+    df_html_output = df[["FOIR", "Status", "Request Date", "CSC FOIs on this LA", "Authority Name", "Request Title", "LAs with same Request", "Request URL", "SSD-FOIR"]]
+
+    if BENCHMARK:
+        benchmark_transform_scaling(df_html_output) # how grouped view build time grows with volume
+
+    if "site" not in outputs:
+        manifest.save()
+        return df
+
+    # single large page views (published by default, the sharded pages are written alongside them)
+    v1_filename, v2_filename = "docs/foi_requests_summary_v1.md", "docs/foi_requests_summary_v2.md"
+    single_page_views = SITE_SINGLE_PAGE_VIEWS or not SITE_SHARD_BY
+    # v1/v2 pages are both rendered from df_html_output (+ page text)
+    site_hash = frame_hash(df_html_output, MKDOCS_DISCLAIMER_TEXT, MKDOCS_DOWNLOAD_TEXT, MKDOCS_CONTRIBUTE_TEXT, OUTPUT_FORMAT_VERSION)
+
+    if single_page_views and not manifest.is_current(v1_filename, site_hash):
+        # expanded output view from default df_html_output
+        with timed_stage("transform"):
+            df_html_output_grouped = transform_foi_data_list_format(df_html_output) # summarised view by LA/Agency
+
+        ## the below needs refactoring! 
+
+        # # into htmlk versions (previous)
+        # save_to_html(df_html_output_grouped, filename="index.html", alternative_view=True) # Save main/index summarised view 
+        # save_to_html(df_html_output, filename="index_alt_view.html", alternative_view=False) # Save verbose/prev view
+
+        # into mkdocs (current)
+        df_html_output_grouped = shorten_headings_for_web(df_html_output_grouped)
+        df_html_output_grouped = shorten_status_labels(df_html_output_grouped)
+        with timed_stage("save_to_mkdocs"):
+            save_to_mkdocs(df_html_output_grouped, filename=v1_filename) # Save main/index summarised view 
+        manifest.record(v1_filename, site_hash)
+
+    df_html_output = shorten_headings_for_web(df_html_output)
+    df_html_output = shorten_status_labels(df_html_output)
+    if SITE_SHARD_BY:
+        with timed_stage("save_to_mkdocs_sharded"):
+            save_to_mkdocs_sharded(df_html_output, shard_by=SITE_SHARD_BY, manifest=manifest) # detailed view, paged by shard (before links added below)
+
+    if single_page_views and not manifest.is_current(v2_filename, site_hash):
+        with timed_stage("save_to_mkdocs"):
+            save_to_mkdocs(df_html_output, filename=v2_filename) # Save verbose/prev view
+        manifest.record(v2_filename, site_hash)
+
+    manifest.save()
+    return df
+
+
+def parse_args(argv=None):
+    """
+    Parse command line options, defaults come from the config constants at the top of this file.
+
+    Args:
+        argv (list, optional): Command line args. Defaults to sys.argv[1:].
+
+    Returns:
+        argparse.Namespace: Parsed options.
+    """
+
+    parser = argparse.ArgumentParser(description="Scrape Children's Services FOI requests into csv + MkDocs site pages.")
+    subparsers = parser.add_subparsers(dest="command", metavar="{scrape,regenerate}")
+
+    # options shared by both commands
+    output_parser = argparse.ArgumentParser(add_help=False)
+    output_parser.add_argument("--outputs", nargs="+", choices=OUTPUTS, default=OUTPUTS, help="outputs to write (default: all)")
+    output_parser.add_argument("--shard-by", choices=["letter", "year", "none"], default=SITE_SHARD_BY or "none", help="also write detailed site view paged by shard")
+    output_parser.add_argument("--no-single-page-views", dest="single_page_views", action="store_false", default=SITE_SINGLE_PAGE_VIEWS, help="don't rewrite the single large site pages (v1/v2), only the sharded pages")
+    output_parser.add_argument("--force-outputs", action="store_true", default=FORCE_OUTPUTS, help="rewrite every output even if its records haven't changed")
+    output_parser.add_argument("--allow-empty-outputs", action="store_true", default=ALLOW_EMPTY_OUTPUTS, help="write outputs even with no records, over a published csv that has records")
+    output_parser.add_argument("--benchmark", action="store_true", default=BENCHMARK, help="report time + peak memory per pipeline stage")
+    output_parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], default=PROFILE, help=f"profile the run, written to {PROFILE_DIR}/")
+    output_parser.add_argument("--run-report", default=RUN_REPORT_FILE, help="json run report file, appended to (default: %(default)s)")
+
+    scrape_parser = subparsers.add_parser("scrape", parents=[output_parser], help="scrape sources then regenerate outputs (default command)")
+    scrape_parser.add_argument("--sources", nargs="+", choices=list(SOURCE_ADAPTERS), help="sources to scrape (default: all)")
+    scrape_parser.add_argument("--terms", nargs="+", help="search terms (default: SEARCH_TERMS)")
+    scrape_parser.add_argument("--max-pages", type=int, help="max result pages per search term, paginated sources only")
+    scrape_parser.add_argument("--incremental", action="store_true", default=INCREMENTAL, help="only scrape new WhatDoTheyKnow pages")
+    scrape_parser.add_argument("--resume", action="store_true", help=f"continue a crashed run from its checkpoint ({CHECKPOINT_FILE}), with that run's options")
+    scrape_parser.add_argument("--debug", action="store_true", default=DEBUG, help="limit scrape depth and search breadth for testing")
+    scrape_parser.add_argument("--no-store", dest="use_store", action="store_false", default=USE_RECORD_STORE, help="don't use the record store")
+    http_mode = scrape_parser.add_mutually_exclusive_group()
+    http_mode.add_argument("--offline", dest="http_mode", action="store_const", const="replay", help="serve pages from recorded fixtures, no network")
+    http_mode.add_argument("--record", dest="http_mode", action="store_const", const="record", help="save every fetched page as a fixture")
+    scrape_parser.set_defaults(http_mode=HTTP_MODE)
+
+    subparsers.add_parser("regenerate", parents=[output_parser], help="regenerate outputs from the record store, no scraping")
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not any(arg in subparsers.choices or arg in ("-h", "--help") for arg in argv[:1]):
+        argv = ["regenerate" if REBUILD_FROM_STORE_ONLY else "scrape"] + argv # no command given
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Command line entry point, scrape (or load from store) then write outputs.
+
+    Args:
+        argv (list, optional): Command line args. Defaults to sys.argv[1:].
+
+    Returns:
+        pd.DataFrame: Combined FOI request records.
+    """
+
+    global BENCHMARK, SITE_SHARD_BY, SITE_SINGLE_PAGE_VIEWS, HTTP_MODE, USE_RECORD_STORE, FORCE_OUTPUTS, ALLOW_EMPTY_OUTPUTS
+
+    args = parse_args(argv)
+
+    # options only apply to this run, a later main() call (when imported) starts from the configured defaults again
+    configured = BENCHMARK, SITE_SHARD_BY, SITE_SINGLE_PAGE_VIEWS, HTTP_MODE, USE_RECORD_STORE, FORCE_OUTPUTS, ALLOW_EMPTY_OUTPUTS
+    try:
+        BENCHMARK = args.benchmark
+        FORCE_OUTPUTS = args.force_outputs
+        ALLOW_EMPTY_OUTPUTS = args.allow_empty_outputs
+        SITE_SHARD_BY = None if args.shard_by == "none" else args.shard_by
+        SITE_SINGLE_PAGE_VIEWS = args.single_page_views
+
+        started_at = datetime.now()
+        start = time.perf_counter()
+
+        with profiled(args.profile):
+            # Generate FOI data records
+            if args.command == "regenerate":
+                # no scraping, outputs from previously stored records
+                source_dfs = load_from_store()
+            else:
+                HTTP_MODE = args.http_mode
+                USE_RECORD_STORE = args.use_store
+
+                search_terms = args.terms or SEARCH_TERMS
+                max_pages = args.max_pages
+                if args.debug:
+                    search_terms = args.terms or ["care leavers"] # limit search terms
+                    max_pages = max_pages or 2  # Limit scraping pages per search term
+
+                source_dfs = run_scrape(search_terms, sources=args.sources, max_pages=max_pages, incremental=args.incremental, resume=args.resume) # scraped FOIs from all sources, concurrently
+
+            df = build_outputs(source_dfs, outputs=args.outputs)
+            if args.command != "regenerate":
+                SCRAPE_CHECKPOINT.clear() # outputs written, nothing left to resume
+
+        save_excluded_records()
+        AUTHORITY_INDEX.save()
+        print_http_cache_stats()
+        if BENCHMARK:
+            print_benchmark_report()
+        write_run_report(build_run_report(args.command, started_at, time.perf_counter() - start), filename=args.run_report)
+    finally:
+        BENCHMARK, SITE_SHARD_BY, SITE_SINGLE_PAGE_VIEWS, HTTP_MODE, USE_RECORD_STORE, FORCE_OUTPUTS, ALLOW_EMPTY_OUTPUTS = configured
+
+    print("Scraping and doc creation completed")
+    return df
+
+
+if __name__ == "__main__":
+    main()
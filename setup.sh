@@ -18,6 +18,6 @@ pip install -r requirements.txt
 echo "✅ Done setup. Now running scrape script..."
 
 # run scrape
-python foi-scrape-tool.py
+python foi_csc_scrape_tool.py
 
 # echo "🎉 Scrape process finished Whoohoo!"
\ No newline at end of file
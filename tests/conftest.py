@@ -0,0 +1,149 @@
+"""
+Shared pytest fixtures and helpers.
+
+Each test runs in its own temp working dir (the tool's state/, docs/ and fixtures/ paths are relative),
+with the tool's module level run state reset. Pages are written to the fixture archive with
+save_fixture, as HTTP_MODE = "record" would, and scrapes run offline against them (HTTP_MODE = "replay").
+"""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import foi_csc_scrape_tool as scraper # noqa: E402 - needs REPO_ROOT on sys.path
+
+PUBLISHED_CSV = os.path.join(REPO_ROOT, scraper.SUMMARY_CSV_FILE)
+WDTK_URL = scraper.BASE_URLS["WhatDoTheyKnow"]
+HASTINGS_URL = scraper.BASE_URLS["HastingsCouncil"]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """
+    Temp working dir with docs/downloads (as in the repo), fresh run state and config restored after the test.
+    """
+
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.dirname(scraper.SUMMARY_CSV_FILE))
+
+    # config globals main() sets, restored once the test is done
+    for name in ["HTTP_MODE", "USE_RECORD_STORE", "BENCHMARK", "SITE_SHARD_BY", "SITE_SINGLE_PAGE_VIEWS", "FORCE_OUTPUTS", "ALLOW_EMPTY_OUTPUTS", "RUN_ID"]:
+        monkeypatch.setattr(scraper, name, getattr(scraper, name))
+
+    # run state, as at the start of a run
+    monkeypatch.setattr(scraper, "HTTP_CACHE", scraper.ResponseCache(scraper.HTTP_CACHE_DIR, scraper.HTTP_CACHE_MAX_BYTES))
+    monkeypatch.setattr(scraper, "SCRAPE_CHECKPOINT", scraper.ScrapeCheckpoint(scraper.CHECKPOINT_FILE))
+    monkeypatch.setattr(scraper, "AUTHORITY_INDEX", scraper.AuthorityIndex(scraper.AUTHORITY_INDEX_FILE))
+    monkeypatch.setattr(scraper, "FETCH_STATS", dict.fromkeys(scraper.FETCH_STATS, 0))
+    monkeypatch.setattr(scraper, "RECORD_COUNTS", {"by_source": {}, "by_term": {}})
+    monkeypatch.setattr(scraper, "OUTPUT_CHANGES", {"written": [], "unchanged": []})
+    for name in ["STAGE_STATS", "SOURCE_ERRORS", "TERM_OVERLAP", "_rate_limiters", "_source_deadlines"]:
+        monkeypatch.setattr(scraper, name, {})
+    for name in ["FETCH_ERRORS", "EXCLUDED_RECORDS"]:
+        monkeypatch.setattr(scraper, name, [])
+
+    yield tmp_path
+    scraper.SCRAPE_CHECKPOINT.clear()
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+
+class FakeSession:
+    """Stands in for the pooled requests session, answers each get with the next scripted response (or raises it)."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent_headers.append(dict(headers or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def run_main(*argv):
+    """
+    Run the CLI in process, with a fresh run state (as a new process would have) but the same working dir.
+
+    Returns:
+        pd.DataFrame: Combined FOI request records, as returned by main().
+    """
+
+    scraper.SCRAPE_CHECKPOINT = scraper.ScrapeCheckpoint(scraper.CHECKPOINT_FILE)
+    scraper.AUTHORITY_INDEX = scraper.AuthorityIndex(scraper.AUTHORITY_INDEX_FILE)
+    scraper.SOURCE_ERRORS.clear()
+    scraper.TERM_OVERLAP.clear()
+    scraper.FETCH_ERRORS.clear()
+    scraper.EXCLUDED_RECORDS.clear()
+    return scraper.main(list(argv))
+
+
+def wdtk_search_url(term, page):
+    """WhatDoTheyKnow results page url, as scrape_whatdotheyknow_page builds it."""
+    return f"{WDTK_URL}{term.replace(' ', '%20')}?page={page}&query={term.replace(' ', '+')}"
+
+
+def wdtk_listing(slug, title, authority, date="2023-05-01", status="Successful", foi_id=1000):
+    """One request_listing result, as on a WhatDoTheyKnow search results page."""
+    authority_slug = authority.lower().replace(" ", "_")
+    return (f'<div class="request_listing"><span class="head"><a href="/request/{slug}">{title}</a></span>'
+            f'<div class="requester">Request to <a href="https://www.whatdotheyknow.com/body/{authority_slug}">{authority}</a>'
+            f' by A. Requester, <time datetime="{date}T10:00:00+01:00">{date}</time></div>'
+            f'<strong>{status}</strong><span class="desc">[FOI #{foi_id} email] Dear {authority},</span></div>')
+
+
+def record_wdtk_term(term, listings, page_size=5, total=None):
+    """
+    Record a search term's results pages in the fixture archive, page_size listings per page.
+
+    Args:
+        term (str): Search term.
+        listings (list): wdtk_listing html, in result order.
+        page_size (int): Results per page.
+        total (str, optional): Result total shown in the heading, e.g. "about 40". Defaults to len(listings).
+
+    Returns:
+        list: Recorded page urls.
+    """
+
+    total = total or str(len(listings))
+    urls = []
+    for start in range(0, len(listings), page_size):
+        page_listings = listings[start:start + page_size]
+        url = wdtk_search_url(term, start // page_size + 1)
+        heading = f'<h2 class="foi_results">FOI requests {start + 1} to {start + len(page_listings)} of {total}</h2>'
+        scraper.save_fixture(url, f"<html><body>{heading}{''.join(page_listings)}</body></html>".encode("utf-8"))
+        urls.append(url)
+    return urls
+
+
+def record_hastings_year(year, requests):
+    """
+    Record a Hastings year listing and its requests' detail pages in the fixture archive.
+
+    Args:
+        year (int): Listing year.
+        requests (list): (FOIR id e.g. "FOIR-2023001", title, request date e.g. "1 May 2023", response text) tuples.
+    """
+
+    entries = "".join(f'<li><a href="?id={foi_id}" title="{title}">{title}</a></li>' for foi_id, title, _, _ in requests)
+    scraper.save_fixture(f"{HASTINGS_URL}?year={year}", f'<html><body><div id="FoiList"><ul>{entries}</ul></div></body></html>'.encode("utf-8"))
+    for foi_id, title, date, response in requests:
+        scraper.save_fixture(f"{HASTINGS_URL}?id={foi_id}", (
+            f'<html><body><h1>{foi_id}</h1><h2>{title}</h2><div class="main"><p>Requested {date}</p>'
+            f'<h3>Response</h3><p>{response}</p></div></body></html>').encode("utf-8"))
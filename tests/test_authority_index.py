@@ -0,0 +1,104 @@
+import json
+
+import pandas as pd
+
+import foi_csc_scrape_tool as scraper
+
+
+def new_index():
+    return scraper.AuthorityIndex(scraper.AUTHORITY_INDEX_FILE)
+
+
+def test_fuzzy_name_drops_council_type_and_filler_words():
+    assert scraper.fuzzy_authority_name("barnet borough council") == "barnet"
+    assert scraper.fuzzy_authority_name("london borough of barnet") == "london barnet"
+    assert scraper.fuzzy_authority_name("brighton & hove city council") == "brighton hove city"
+    assert scraper.fuzzy_authority_name("the council") == ""
+
+
+def test_ids_are_authoritative(workdir):
+    index = new_index()
+
+    barnet = index.resolve("barnet_council", "Barnet Council")
+    assert index.resolve("https://www.whatdotheyknow.com/body/barnet_council", "London Borough of Barnet") == barnet # same id, other name
+    assert index.resolve("barnet_borough_council", "Barnet Council") != barnet # new id, never merged by name
+
+
+def test_records_without_id_resolved_by_exact_name_then_fuzzy(workdir, capsys):
+    index = new_index()
+    kent = index.resolve("kent_county_council", "Kent County Council")
+
+    assert index.resolve("", "kent  county council") == kent # exact (normalised) name
+    assert index.fuzzy_matches == {}
+
+    assert index.resolve(None, "Kent Council") == kent # fuzzy, logged
+    assert index.fuzzy_matches == {("Kent Council", kent): "Kent County Council"}
+    assert "'Kent Council' fuzzy matched to Kent County Council" in capsys.readouterr().out
+
+    index.save()
+    with open(scraper.AUTHORITY_INDEX_FILE, encoding="utf-8") as f:
+        assert "name:kent council" not in json.load(f)["aliases"] # fuzzy matches not persisted
+
+
+def test_ambiguous_fuzzy_match_left_unmerged(workdir):
+    index = new_index()
+    index.resolve("york_council", "York Council")
+    index.resolve("york_district_council", "York District Council")
+    index.resolve("city_of_york_council", "City of York Council")
+
+    assert index.resolve("", "The City of York") == "city_of_york_council" # "city york", one match
+    assert index.resolve("", "York Borough Council") == "name:york borough council" # "york", two matches
+    assert index.fuzzy_matches == {("The City of York", "city_of_york_council"): "City of York Council"}
+
+
+def test_id_less_name_only_authority_taken_over_by_id(workdir):
+    index = new_index()
+    name_only = index.resolve("", "Essex County Council")
+    assert name_only == "name:essex county council"
+
+    essex = index.resolve("essex_county_council", "Essex County Council")
+    assert essex == "essex_county_council"
+    assert new_index().resolve("", "Essex County Council") == name_only # not saved yet
+
+    index.save()
+    assert new_index().resolve("", "Essex County Council") == essex
+
+
+def test_la_code_attached_to_authority_with_same_name(workdir):
+    index = new_index()
+    hastings = index.resolve("hastings_borough_council", "Hastings Borough Council")
+
+    assert index.resolve("E07000062", "Hastings Borough Council") == hastings
+    assert index.authorities[hastings]["codes"] == ["E07000062"]
+    assert index.resolve("e07000062", "Hastings") == hastings # by code from now on
+
+    index.save()
+    assert new_index().resolve("E07000062", "HBC") == hastings
+
+
+def test_exclusions_classified_once_per_authority(workdir):
+    index = new_index()
+    school = index.resolve("some_primary_school", "Some Primary School")
+    kent = index.resolve("kent_county_council", "Kent County Council")
+
+    assert index.exclusion_reason(school) == "authority name: School"
+    assert index.exclusion_reason(kent) is None
+
+
+def test_requests_counted_per_authority_across_sources(workdir):
+    df = pd.DataFrame({
+        "Source": ["WhatDoTheyKnow", "WhatDoTheyKnow", "LA Submitted", "LA Submitted", "Hastings Council"],
+        "Request Title": ["Adoption orders", "Fostering allowances", "Care leavers housing", "Caseloads", "Adoption support"],
+        "Request URL": ["https://www.whatdotheyknow.com/request/1", "https://www.whatdotheyknow.com/request/2", "", "", "https://www.hastings.gov.uk/?id=1"],
+        "Authority Name": ["Hastings Borough Council", "Kent County Council", "Hastings Borough Council", "Kent Council", "Hastings Borough Council"],
+        "Authority ID": ["hastings_borough_council", "kent_county_council", "E07000062", "", "hastings_borough_council"],
+        "Status": ["Successful"] * 5,
+        "Request Date": ["01/05/2023", "02/05/2023", "03/05/2023", "04/05/2023", "05/05/2023"],
+    })
+
+    df = scraper.filter_and_count_foi_records(df).set_index("Request Title")
+
+    assert df.loc["Care leavers housing", "Authority Key"] == "hastings_borough_council"
+    assert df.loc["Caseloads", "Authority Key"] == "kent_county_council"
+    assert df.loc["Adoption support", "CSC FOIs on this LA"] == 3
+    assert df.loc["Caseloads", "CSC FOIs on this LA"] == 2
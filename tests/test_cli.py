@@ -0,0 +1,66 @@
+import csv
+import subprocess
+import sys
+
+import foi_csc_scrape_tool as scraper
+from conftest import REPO_ROOT, record_hastings_year, record_wdtk_term, run_main, wdtk_listing
+
+
+def summary_sources():
+    with open(scraper.SUMMARY_CSV_FILE, newline="", encoding="utf-8") as f:
+        return sorted(row["Source"] for row in csv.DictReader(f))
+
+
+def record_pages():
+    record_wdtk_term("adoption", [wdtk_listing("kent_adoption", "Adoption orders", "Kent County Council", "2023-05-01")])
+    record_hastings_year(2023, [("FOIR-2023001", "Adoption support", "1 May 2023", "Provided")])
+
+
+def test_import_doesnt_load_heavy_modules():
+    code = "import sys, foi_csc_scrape_tool; print(sorted({'pandas', 'numpy', 'requests', 'bs4'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_command_defaults_to_scrape():
+    assert scraper.parse_args([]).command == "scrape"
+    assert scraper.parse_args(["--sources", "HastingsCouncil"]).sources == ["HastingsCouncil"]
+    assert scraper.parse_args(["regenerate"]).command == "regenerate"
+
+
+def test_options_dont_carry_over_to_next_main_call(workdir):
+    configured = scraper.HTTP_MODE, scraper.FORCE_OUTPUTS, scraper.SITE_SHARD_BY
+
+    run_main("scrape", "--offline", "--force-outputs", "--shard-by", "year", "--sources", "LASubmitted")
+
+    assert (scraper.HTTP_MODE, scraper.FORCE_OUTPUTS, scraper.SITE_SHARD_BY) == configured
+    args = scraper.parse_args([])
+    assert (args.http_mode, args.force_outputs) == (configured[0], configured[1])
+
+
+def test_scraping_some_sources_keeps_the_others_in_outputs(workdir):
+    record_pages()
+    run_main("scrape", "--offline", "--terms", "adoption")
+    assert summary_sources() == ["Hastings Council", "WhatDoTheyKnow"]
+
+    run_main("scrape", "--offline", "--terms", "adoption", "--sources", "WhatDoTheyKnow")
+
+    assert summary_sources() == ["Hastings Council", "WhatDoTheyKnow"] # Hastings from the record store
+
+
+def test_scraping_some_sources_without_store_keeps_published_records(workdir):
+    record_pages()
+    run_main("scrape", "--offline", "--no-store", "--terms", "adoption")
+
+    # published before the 'Matched Terms' column was added
+    with open(scraper.SUMMARY_CSV_FILE, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    with open(scraper.SUMMARY_CSV_FILE, "w", newline="", encoding="utf-8") as f:
+        fields = [field for field in rows[0] if field not in ("Matched Terms", "Request Cluster")]
+        writer = csv.DictWriter(f, fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    run_main("scrape", "--offline", "--no-store", "--terms", "adoption", "--sources", "WhatDoTheyKnow")
+
+    assert summary_sources() == ["Hastings Council", "WhatDoTheyKnow"] # Hastings from the published csv
@@ -0,0 +1,45 @@
+import json
+
+import pandas as pd
+
+import foi_csc_scrape_tool as scraper
+
+PLACEMENTS_2023 = "number of looked after children by placement type 2023"
+PLACEMENTS_2024 = "number of looked after children by placement type 2024"
+CASELOADS = "social worker caseloads and vacancies"
+
+
+def test_near_duplicate_titles_share_cluster(workdir):
+    clusters = scraper.assign_request_clusters(pd.Series([PLACEMENTS_2023, PLACEMENTS_2024, "number of looked after  children by placement type 2023", CASELOADS, None]))
+
+    assert clusters[0] == clusters[1] == clusters[2] # one year apart, extra space
+    assert clusters[3] != clusters[0]
+    assert pd.isna(clusters[4])
+
+
+def test_cluster_ids_stable_across_runs_and_input_order(workdir):
+    first = scraper.assign_request_clusters(pd.Series([PLACEMENTS_2023, CASELOADS]))
+
+    # later run, more titles in another order, earlier titles keep their ids and new near-duplicates join them
+    second = scraper.assign_request_clusters(pd.Series(["adoption support fund applications", PLACEMENTS_2024, CASELOADS, PLACEMENTS_2023]))
+    assert second.tolist()[1:] == [first[0], first[1], first[0]]
+
+    with open(scraper.REQUEST_CLUSTERS_FILE, encoding="utf-8") as f:
+        assert sorted(json.load(f)) == sorted(["adoption support fund applications", PLACEMENTS_2023, PLACEMENTS_2024, CASELOADS])
+
+    # same titles from scratch (no saved clusters), in another order, give the same ids
+    titles = pd.Series([CASELOADS, PLACEMENTS_2024, "adoption support fund applications", PLACEMENTS_2023])
+    fresh = scraper.assign_request_clusters(titles, filename="state/other_clusters.json")
+    assert dict(zip(titles, fresh)) == dict(zip(["adoption support fund applications", PLACEMENTS_2024, CASELOADS, PLACEMENTS_2023], second))
+
+
+def test_las_with_same_request_counts_authorities_per_cluster(workdir):
+    df = pd.DataFrame({
+        "Authority Key": ["kent", "kent", "leeds", "barnet"],
+        "normalised-request-title": [PLACEMENTS_2023, PLACEMENTS_2024, PLACEMENTS_2024, CASELOADS],
+    })
+
+    df = scraper.count_authority_requests(df)
+
+    assert df["LAs with same Request"].tolist() == [2, 2, 2, 1]
+    assert df["CSC FOIs on this LA"].tolist() == [2, 2, 1, 1]
@@ -0,0 +1,178 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+import foi_csc_scrape_tool as scraper
+from conftest import FakeResponse, FakeSession, record_wdtk_term, wdtk_listing, wdtk_search_url
+
+URL = "https://foi.example.org/search/adoption?page=1"
+
+
+@pytest.fixture
+def session(workdir, monkeypatch):
+    """Fetches answered by a FakeSession, against a host with a fast (test only) rate limit."""
+    monkeypatch.setitem(scraper.RATE_LIMITS, "foi.example.org", {"rate": 1000, "burst": 10})
+    fake_session = FakeSession()
+    monkeypatch.setattr(scraper, "get_http_session", lambda: fake_session)
+    return fake_session
+
+
+def test_revalidates_cached_page_and_serves_body_on_304(session):
+    session.responses = [FakeResponse(200, b"<html>v1</html>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 May 2023 10:00:00 GMT"}),
+                         FakeResponse(304)]
+
+    assert scraper.fetch_page(URL) == b"<html>v1</html>"
+    assert scraper.fetch_page(URL) == b"<html>v1</html>"
+
+    assert session.sent_headers == [{}, {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 May 2023 10:00:00 GMT"}]
+    assert scraper.HTTP_CACHE.stats["misses"] == 1
+    assert scraper.HTTP_CACHE.stats["hits"] == 1
+    assert scraper.HTTP_CACHE.stats["bytes_from_cache"] == len(b"<html>v1</html>")
+
+
+def test_changed_page_replaces_cached_body(session):
+    session.responses = [FakeResponse(200, b"v1", {"ETag": '"v1"'}), FakeResponse(200, b"v2", {"ETag": '"v2"'}), FakeResponse(304)]
+
+    assert scraper.fetch_page(URL) == b"v1"
+    assert scraper.fetch_page(URL) == b"v2"
+    assert scraper.fetch_page(URL) == b"v2"
+    assert session.sent_headers[2] == {"If-None-Match": '"v2"'}
+
+
+def test_page_without_validators_isnt_cached(session):
+    session.responses = [FakeResponse(200, b"v1"), FakeResponse(200, b"v1")]
+
+    scraper.fetch_page(URL)
+    scraper.fetch_page(URL)
+
+    assert session.sent_headers == [{}, {}]
+    assert scraper.HTTP_CACHE.lookup(URL) is None
+
+
+def test_cache_evicts_least_recently_used(workdir):
+    cache = scraper.ResponseCache(scraper.HTTP_CACHE_DIR, max_bytes=250)
+    for page in range(3):
+        cache.store(f"{URL}{page}", FakeResponse(200, b"x" * 100, {"ETag": f'"{page}"'}))
+        os.utime(cache._path(f"{URL}{page}", "body"), (1000 + page, 1000 + page)) # stored a second apart
+    cache.record_hit(f"{URL}0", cache.lookup(f"{URL}0")) # page 0 used since, page 1 now least recently used
+
+    cache.evict()
+
+    assert cache.lookup(f"{URL}0") is not None
+    assert cache.lookup(f"{URL}1") is None
+    assert cache.lookup(f"{URL}2") is not None
+
+
+def test_429_retried_after_retry_after_and_rate_cut(session):
+    session.responses = [FakeResponse(429, headers={"Retry-After": "0.2"}), FakeResponse(200, b"ok")]
+
+    start = time.monotonic()
+    assert scraper.fetch_page(URL, delay=0.01) == b"ok"
+
+    assert time.monotonic() - start >= 0.2 # waited as long as the server asked, not the (shorter) backoff
+    assert len(session.sent_headers) == 2
+    assert (scraper.FETCH_STATS["retries"], scraper.FETCH_STATS["throttled_responses"], scraper.FETCH_STATS["failed_requests"]) == (1, 1, 0)
+    assert scraper.get_rate_limiter(URL).rate < 1000 # halved on pushback, one step back up on success
+
+
+def test_retry_after_over_backoff_cap_fails_without_early_retry(session, monkeypatch):
+    monkeypatch.setattr(scraper, "BACKOFF_MAX_SECONDS", 30)
+    session.responses = [FakeResponse(503, headers={"Retry-After": "600"}), FakeResponse(200, b"ok")]
+
+    start = time.monotonic()
+    with pytest.raises(scraper.FetchError, match="retry after 600s"):
+        scraper.fetch_page(URL, delay=0.01)
+
+    assert time.monotonic() - start < 1 # not waited out
+    assert len(session.sent_headers) == 1 # nor retried early
+    assert scraper.FETCH_STATS["failed_requests"] == 1
+    assert scraper.get_rate_limiter(URL).paused_until >= start + 600 # host held until the server allows
+
+
+def test_5xx_and_connection_errors_retried_until_attempts_used_up(session):
+    session.responses = [requests.ConnectionError("reset"), FakeResponse(502), FakeResponse(503)]
+
+    with pytest.raises(scraper.FetchError, match="failed after 3 attempts, last error: HTTP 503"):
+        scraper.fetch_page(URL, max_attempts=3, delay=0.01)
+
+    assert len(session.sent_headers) == 3
+    assert (scraper.FETCH_STATS["retries"], scraper.FETCH_STATS["failed_requests"]) == (2, 1)
+
+
+@pytest.mark.parametrize("status", [401, 403, 400])
+def test_other_client_errors_fail_without_retry(session, status):
+    session.responses = [FakeResponse(status)]
+
+    with pytest.raises(scraper.FetchError, match=f"HTTP {status}"):
+        scraper.fetch_page(URL, delay=0.01)
+
+    assert len(session.sent_headers) == 1
+    assert scraper.FETCH_STATS["retries"] == 0
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_missing_page_is_none_not_an_error(session, status):
+    session.responses = [FakeResponse(status)]
+
+    assert scraper.fetch_page(URL, delay=0.01) is None
+
+    assert len(session.sent_headers) == 1
+    assert scraper.FETCH_STATS["failed_requests"] == 0
+    assert scraper.get_rate_limiter(URL).paused_until == 0 # not server pushback
+
+
+def test_parse_retry_after():
+    assert scraper.parse_retry_after("120") == 120
+    assert scraper.parse_retry_after("-5") == 0
+    assert scraper.parse_retry_after(None) is None
+    assert scraper.parse_retry_after("soon") is None
+
+    in_a_minute = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 55 < scraper.parse_retry_after(format_datetime(in_a_minute, usegmt=True)) <= 60
+
+
+def test_backoff_delay_exponential_with_jitter_capped(monkeypatch):
+    monkeypatch.setattr(scraper, "BACKOFF_MAX_SECONDS", 30)
+
+    for attempt, cap in [(1, 2), (2, 4), (3, 8), (6, 30)]:
+        for _ in range(20):
+            assert cap / 2 <= scraper.backoff_delay(attempt, 2) <= cap
+    assert scraper.backoff_delay(1, 2, retry_after=10) == 10
+    assert scraper.backoff_delay(1, 2, retry_after=600) == 600 # never retried before the server allows
+
+
+def test_failed_results_page_leaves_term_incomplete(workdir, monkeypatch):
+    record_wdtk_term("adoption", [wdtk_listing(f"adoption_{i}", f"Adoption {i}", "Kent County Council") for i in range(12)])
+    monkeypatch.setattr(scraper, "HTTP_MODE", "replay")
+    load_fixture = scraper.load_fixture
+
+    def failing_load_fixture(url):
+        if url == wdtk_search_url("adoption", 2):
+            raise scraper.FetchError(f"HTTP 503 for {url}")
+        return load_fixture(url)
+
+    monkeypatch.setattr(scraper, "load_fixture", failing_load_fixture)
+    scraper.SCRAPE_CHECKPOINT.start({"run_id": "run1"})
+
+    urls, reached_end = scraper.scrape_whatdotheyknow_term("adoption", scraper.BASE_URLS["WhatDoTheyKnow"], None)
+
+    assert not reached_end
+    assert len(urls) == 5 # page 1 only
+    assert scraper.FETCH_ERRORS == [f"HTTP 503 for {wdtk_search_url('adoption', 2)}"]
+    assert scraper.SCRAPE_CHECKPOINT.get("WhatDoTheyKnow", "adoption", 1) is not None
+    assert scraper.SCRAPE_CHECKPOINT.get("WhatDoTheyKnow", "adoption", "end") is None # --resume retries the term
+
+
+def test_results_past_last_page_end_the_term(workdir, monkeypatch):
+    record_wdtk_term("adoption", [wdtk_listing(f"adoption_{i}", f"Adoption {i}", "Kent County Council") for i in range(10)], total="about 40")
+    monkeypatch.setattr(scraper, "HTTP_MODE", "replay")
+
+    urls, reached_end = scraper.scrape_whatdotheyknow_term("adoption", scraper.BASE_URLS["WhatDoTheyKnow"], None)
+
+    assert reached_end # page 3 not found, estimated total was high
+    assert len(urls) == 10
+    assert scraper.FETCH_ERRORS == []
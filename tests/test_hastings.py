@@ -0,0 +1,111 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import foi_csc_scrape_tool as scraper
+from conftest import HASTINGS_URL, record_hastings_year
+
+TERMS = ["care leavers", "adoption"]
+
+
+@pytest.fixture
+def requested(workdir, monkeypatch):
+    """Replay mode, urls of the pages requested (recorded or not)."""
+
+    monkeypatch.setattr(scraper, "HTTP_MODE", "replay")
+    urls = []
+    load_fixture = scraper.load_fixture
+
+    def recording_load_fixture(url):
+        urls.append(url)
+        return load_fixture(url)
+
+    monkeypatch.setattr(scraper, "load_fixture", recording_load_fixture)
+    return urls
+
+
+def listing_url(year):
+    return f"{HASTINGS_URL}?year={year}"
+
+
+def scrape(start_year=2023, end_year=2022):
+    return sorted(record["Request URL"] for record in scraper.scrape_hastings_foi(TERMS, HASTINGS_URL, start_year, end_year))
+
+
+def closed_years():
+    with open(scraper.HASTINGS_YEARS_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def age_closed_year(year, days):
+    years = closed_years()
+    years[str(year)]["closed_at"] = (datetime.now() - timedelta(days=days)).isoformat(timespec="seconds")
+    with open(scraper.HASTINGS_YEARS_FILE, "w", encoding="utf-8") as f:
+        json.dump(years, f)
+
+
+def record_years():
+    record_hastings_year(2023, [("FOIR-2023001", "Care leavers support", "1 May 2023", "Provided"),
+                                ("FOIR-2023002", "Bin collections", "2 May 2023", "Provided")])
+    record_hastings_year(2022, [("FOIR-2022001", "Adoption panel", "1 June 2022", "Refused")])
+
+
+def test_past_years_closed_and_not_refetched(requested):
+    record_years()
+    first_run = scrape()
+    assert first_run == [f"{HASTINGS_URL}?id=FOIR-2022001", f"{HASTINGS_URL}?id=FOIR-2023001"]
+    assert closed_years()["2023"]["entries"] == [["?id=FOIR-2023001", "Care leavers support"], ["?id=FOIR-2023002", "Bin collections"]]
+
+    requested.clear()
+    assert scrape() == first_run # from the closed listings + cached detail pages
+
+    assert requested == []
+
+
+def test_current_year_not_closed(requested):
+    this_year = datetime.today().year
+    record_hastings_year(this_year, [(f"FOIR-{this_year}001", "Care leavers support", f"1 January {this_year}", "Provided")])
+
+    assert scrape(this_year, this_year) == [f"{HASTINGS_URL}?id=FOIR-{this_year}001"]
+
+    assert not os.path.exists(scraper.HASTINGS_YEARS_FILE) # nothing closed
+
+
+def test_closed_year_revalidated_after_30_days(requested):
+    record_years()
+    scrape()
+    age_closed_year(2023, scraper.HASTINGS_REVALIDATE_DAYS + 1)
+    record_hastings_year(2023, [("FOIR-2023001", "Care leavers support", "1 May 2023", "Provided"),
+                                ("FOIR-2023003", "Adoption allowances", "3 May 2023", "Provided")]) # published since
+
+    requested.clear()
+    urls = scrape()
+
+    assert f"{HASTINGS_URL}?id=FOIR-2023003" in urls
+    assert requested == [listing_url(2023), f"{HASTINGS_URL}?id=FOIR-2023003"] # 2022 still closed, only the new detail page
+    assert datetime.fromisoformat(closed_years()["2023"]["closed_at"]) > datetime.now() - timedelta(minutes=1)
+
+
+def test_missing_listing_doesnt_close_year(requested):
+    record_years()
+
+    scrape(2023, 2021) # no 2021 listing
+
+    assert "2021" not in closed_years()
+    requested.clear()
+    scrape(2023, 2021)
+    assert requested == [listing_url(2021)] # asked for again, not closed as empty
+
+
+def test_missing_listing_on_revalidation_keeps_closed_year(requested):
+    record_years()
+    first_run = scrape()
+    age_closed_year(2023, scraper.HASTINGS_REVALIDATE_DAYS + 1)
+    closed_at = closed_years()["2023"]["closed_at"]
+    os.remove(scraper._fixture_path(listing_url(2023))) # listing 404s this run
+
+    assert scrape() == first_run # closed entries still served
+
+    assert closed_years()["2023"]["closed_at"] == closed_at # revalidated again next run
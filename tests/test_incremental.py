@@ -0,0 +1,72 @@
+import csv
+import json
+
+import pytest
+
+import foi_csc_scrape_tool as scraper
+from conftest import record_wdtk_term, run_main, wdtk_listing, wdtk_search_url
+
+
+@pytest.fixture
+def requested(workdir, monkeypatch):
+    """Urls of the pages requested (recorded or not), scrapes run with --offline."""
+
+    urls = []
+    load_fixture = scraper.load_fixture
+
+    def recording_load_fixture(url):
+        urls.append(url)
+        return load_fixture(url)
+
+    monkeypatch.setattr(scraper, "load_fixture", recording_load_fixture)
+    return urls
+
+
+def listings(slugs):
+    return [wdtk_listing(slug, f"Adoption request {slug}", "Kent County Council", foi_id=1000 + i) for i, slug in enumerate(slugs)]
+
+
+def scrape(*options):
+    run_main("scrape", "--offline", "--sources", "WhatDoTheyKnow", "--terms", "adoption", *options)
+
+
+def high_water_mark():
+    with open(scraper.WDTK_HIGH_WATER_FILE, encoding="utf-8") as f:
+        return json.load(f)["adoption"]
+
+
+def summary_urls():
+    with open(scraper.SUMMARY_CSV_FILE, newline="", encoding="utf-8") as f:
+        return {row["Request URL"] for row in csv.DictReader(f)}
+
+
+def test_incremental_run_stops_at_page_of_known_requests(requested):
+    old = [f"old_{i}" for i in range(12)]
+    record_wdtk_term("adoption", listings(old))
+    scrape()
+    assert high_water_mark()["complete"]
+    assert len(high_water_mark()["known_urls"]) == 12
+
+    # one new request since, listed first, pushing the others down a place
+    record_wdtk_term("adoption", listings(["new_0"] + old))
+    requested.clear()
+    scrape("--incremental")
+
+    assert requested == [wdtk_search_url("adoption", 1), wdtk_search_url("adoption", 2)] # page 2 only known requests
+    assert len(summary_urls()) == 13 # new request merged with the stored ones
+    assert "https://www.whatdotheyknow.com/request/new_0" in high_water_mark()["known_urls"]
+
+
+def test_term_only_stops_early_once_fully_paginated(requested):
+    record_wdtk_term("adoption", listings([f"old_{i}" for i in range(12)]))
+    scrape("--max-pages", "1")
+    assert not high_water_mark()["complete"] # older pages never seen
+
+    requested.clear()
+    scrape("--incremental")
+    assert len(requested) == 3 # page 1 all known, but not stop eligible yet
+    assert high_water_mark()["complete"]
+
+    requested.clear()
+    scrape("--incremental")
+    assert requested == [wdtk_search_url("adoption", 1)]
@@ -0,0 +1,118 @@
+import os
+
+import foi_csc_scrape_tool as scraper
+from conftest import record_wdtk_term, run_main, wdtk_listing
+
+SHARD_DIR = scraper.SITE_SHARD_DIR
+SINGLE_PAGES = ["docs/foi_requests_summary_v1.md", "docs/foi_requests_summary_v2.md"]
+
+
+def scrape(leeds_status="Successful", authorities=("Kent County Council", "Leeds City Council", "Barnet Council")):
+    results = {
+        "Kent County Council": [wdtk_listing("kent_adoption", "Adoption orders", "Kent County Council", "2023-05-01"),
+                                wdtk_listing("kent_fostering", "Adoption and fostering", "Kent County Council", "2022-05-01")],
+        "Leeds City Council": [wdtk_listing("leeds_adoption", "Adoption support", "Leeds City Council", "2024-01-10", leeds_status)],
+        "Barnet Council": [wdtk_listing("barnet_adoption", "Adoption panel", "Barnet Council", "2021-07-01")],
+    }
+    record_wdtk_term("adoption", [listing for authority in authorities for listing in results[authority]])
+    run_main("scrape", "--offline", "--sources", "WhatDoTheyKnow", "--terms", "adoption")
+
+
+def docs_snapshot():
+    """docs/ file path -> (mtime, content), to tell which files a run (re)wrote."""
+    snapshot = {}
+    for root, _, files in os.walk("docs"):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                snapshot[path] = (os.stat(path).st_mtime_ns, f.read())
+    return snapshot
+
+
+def changed_files(before, after):
+    return sorted(path for path in set(before) | set(after) if before.get(path) != after.get(path))
+
+
+def test_first_run_writes_all_outputs(workdir):
+    scrape()
+
+    assert sorted(scraper.OUTPUT_CHANGES["written"]) == sorted([
+        scraper.SUMMARY_CSV_FILE, *SINGLE_PAGES, f"{SHARD_DIR}/b.md", f"{SHARD_DIR}/k.md", f"{SHARD_DIR}/l.md", f"{SHARD_DIR}/index.md"])
+    assert scraper.OUTPUT_CHANGES["unchanged"] == []
+
+
+def test_unchanged_records_write_nothing(workdir):
+    scrape()
+    before = docs_snapshot()
+
+    run_main("regenerate")
+    assert scraper.OUTPUT_CHANGES["written"] == []
+    assert len(scraper.OUTPUT_CHANGES["unchanged"]) == 7
+
+    scrape() # same pages scraped again
+    assert scraper.OUTPUT_CHANGES["written"] == []
+    assert changed_files(before, docs_snapshot()) == []
+
+
+def test_changed_record_rewrites_only_its_outputs(workdir):
+    scrape()
+    before = docs_snapshot()
+
+    scrape(leeds_status="Refused")
+
+    # single pages hold every record, so are rewritten too
+    assert sorted(scraper.OUTPUT_CHANGES["written"]) == sorted([scraper.SUMMARY_CSV_FILE, *SINGLE_PAGES, f"{SHARD_DIR}/l.md", f"{SHARD_DIR}/index.md"])
+    changed = changed_files(before, docs_snapshot())
+    assert f"{SHARD_DIR}/k.md" not in changed and f"{SHARD_DIR}/b.md" not in changed
+    assert {path for path in changed if not path.startswith(scraper.SEARCH_INDEX_DIR)} == {
+        scraper.SUMMARY_CSV_FILE, *SINGLE_PAGES, f"{SHARD_DIR}/l.md", f"{SHARD_DIR}/index.md"}
+    with open(f"{SHARD_DIR}/l.md", encoding="utf-8") as f:
+        assert "Refused" in f.read()
+
+
+def test_shard_no_longer_in_data_removed(workdir):
+    scrape()
+    scraper.delete_records(["https://www.whatdotheyknow.com/request/barnet_adoption"]) # Barnet's request gone
+
+    scrape(authorities=("Kent County Council", "Leeds City Council"))
+
+    assert not os.path.exists(f"{SHARD_DIR}/b.md")
+    assert f"{SHARD_DIR}/b.md" not in scraper.OutputManifest(scraper.OUTPUTS_MANIFEST_FILE).hashes
+    with open(f"{SHARD_DIR}/index.md", encoding="utf-8") as f:
+        assert "(b.md)" not in f.read()
+
+
+def test_force_outputs_and_format_version_rewrite_everything(workdir, monkeypatch):
+    scrape()
+
+    run_main("regenerate", "--force-outputs")
+    assert len(scraper.OUTPUT_CHANGES["written"]) == 7
+
+    run_main("regenerate")
+    assert scraper.OUTPUT_CHANGES["written"] == []
+
+    monkeypatch.setattr(scraper, "OUTPUT_FORMAT_VERSION", scraper.OUTPUT_FORMAT_VERSION + 1) # rendering changed
+    run_main("regenerate")
+    assert len(scraper.OUTPUT_CHANGES["written"]) == 7
+
+
+def test_deleted_output_rewritten(workdir):
+    scrape()
+    os.remove(f"{SHARD_DIR}/k.md")
+
+    run_main("regenerate")
+
+    assert scraper.OUTPUT_CHANGES["written"] == [f"{SHARD_DIR}/k.md"]
+    assert os.path.exists(f"{SHARD_DIR}/k.md")
+
+
+def test_sharded_pages_written_alongside_single_pages(workdir):
+    scrape()
+    with open("docs/foi_requests_summary_v1.md", encoding="utf-8") as f:
+        assert "Kent County Council" in f.read() # grouped by LA view still published
+
+    run_main("regenerate", "--no-single-page-views", "--force-outputs")
+
+    assert not set(SINGLE_PAGES) & set(scraper.OUTPUT_CHANGES["written"])
+    assert all(os.path.exists(path) for path in SINGLE_PAGES) # left as published
+    assert f"{SHARD_DIR}/k.md" in scraper.OUTPUT_CHANGES["written"]
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+import foi_csc_scrape_tool as scraper
+
+
+def test_token_bucket_allows_burst_then_paces_at_rate():
+    bucket = scraper.TokenBucket(rate=20, burst=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.04 # burst, back-to-back
+
+    for _ in range(4):
+        bucket.acquire()
+    assert time.monotonic() - start >= 4 / 20 * 0.9 # one token per 1/rate s once the burst is used
+
+
+def test_token_bucket_caps_rate_across_threads():
+    bucket = scraper.TokenBucket(rate=50, burst=1)
+    acquired = []
+
+    def worker():
+        for _ in range(5):
+            bucket.acquire()
+            acquired.append(time.monotonic())
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(acquired) == 20
+    assert max(acquired) - start >= 19 / 50 * 0.9 # 4 threads share the host's 50 requests/s
+
+
+def test_rate_limiter_shared_per_host(workdir, monkeypatch):
+    monkeypatch.setattr(scraper, "ADAPTIVE_RATE", False)
+
+    whatdotheyknow = scraper.get_rate_limiter("https://www.whatdotheyknow.com/search/adoption?page=1")
+    assert whatdotheyknow is scraper.get_rate_limiter("https://www.whatdotheyknow.com/request/other")
+    assert whatdotheyknow.rate == scraper.WhatDoTheyKnowAdapter.rate_limit["rate"] # source adapter's host limit
+    assert whatdotheyknow.capacity == scraper.WhatDoTheyKnowAdapter.rate_limit["burst"]
+
+    other_host = scraper.get_rate_limiter("https://foi.example.org/page")
+    assert other_host is not whatdotheyknow
+    assert other_host.rate == scraper.DEFAULT_RATE_LIMIT["rate"]
+
+
+def test_adaptive_rate_ramps_up_to_max_on_success():
+    bucket = scraper.TokenBucket(rate=1.0, burst=1, max_rate=1.2, min_rate=0.1)
+
+    for _ in range(3):
+        bucket.record_success()
+    assert bucket.rate == pytest.approx(1.0 + 3 * scraper.ADAPTIVE_RATE_STEP)
+
+    for _ in range(10):
+        bucket.record_success()
+    assert bucket.rate == 1.2
+
+
+def test_pushback_cuts_rate_to_min_and_pauses_every_thread():
+    bucket = scraper.TokenBucket(rate=100, burst=5, max_rate=400, min_rate=30)
+
+    bucket.record_pushback(0.2)
+    assert bucket.rate == 100 * scraper.ADAPTIVE_RATE_BACKOFF
+    bucket.record_pushback(0.2)
+    assert bucket.rate == 30 # not below min_rate
+
+    # other threads wait out the pause too, and get no burst straight after it
+    acquired = []
+    start = time.monotonic()
+    threads = [threading.Thread(target=lambda: (bucket.acquire(), acquired.append(time.monotonic()))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert min(acquired) - start >= 0.2 * 0.9
+    assert max(acquired) - start >= 0.2 + 2 / 30 * 0.9
+
+
+def test_rate_limiter_adaptive_range(workdir, monkeypatch):
+    monkeypatch.setattr(scraper, "ADAPTIVE_RATE", True)
+
+    limiter = scraper.get_rate_limiter("https://foi.example.org/page")
+
+    assert limiter.rate == scraper.DEFAULT_RATE_LIMIT["rate"]
+    assert limiter.max_rate == scraper.DEFAULT_RATE_LIMIT["rate"] * scraper.ADAPTIVE_MAX_RATE_FACTOR
+    assert limiter.min_rate == scraper.ADAPTIVE_MIN_RATE
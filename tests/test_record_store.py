@@ -0,0 +1,124 @@
+import collections
+import csv
+import json
+import os
+import shutil
+import sqlite3
+
+import pandas as pd
+
+import foi_csc_scrape_tool as scraper
+from conftest import PUBLISHED_CSV, record_wdtk_term, run_main, wdtk_listing
+
+
+def make_record(url, status="Successful", source="WhatDoTheyKnow", request_date="01/05/2023", title="Adoption orders"):
+    return {"Source": source, "Search Term": "adoption", "Matched Terms": "adoption", "FOIR": "1001", "Request Title": title,
+            "Request URL": url, "Request URL Cleaned": "", "Authority Name": "Kent County Council", "Authority URL": "",
+            "Authority ID": "kent_county_council", "Status": status, "Request Date": request_date}
+
+
+def stored_runs(url):
+    with sqlite3.connect(scraper.RECORD_STORE_FILE) as conn:
+        return conn.execute("SELECT status, first_run_id, last_run_id FROM foi_records WHERE record_key = ?", (url,)).fetchall()
+
+
+def test_upsert_updates_fields_keeps_first_seen_run(workdir):
+    url = "https://www.whatdotheyknow.com/request/adoption_orders"
+    assert scraper.upsert_records([make_record(url, "Awaiting response")], "run1") == 1
+    scraper.upsert_records([make_record(url, "Successful")], "run2")
+
+    assert stored_runs(url) == [("Successful", "run1", "run2")]
+
+
+def test_load_filters_source_newest_first(workdir):
+    scraper.upsert_records([
+        make_record("https://www.whatdotheyknow.com/request/older", request_date="01/05/2022"),
+        make_record("https://www.whatdotheyknow.com/request/newer", request_date="01/05/2024"),
+        make_record("https://www.hastings.gov.uk/foi?id=FOIR-1", source="Hastings Council", request_date="01/05/2025"),
+    ], "run1")
+
+    records_df = scraper.load_records_from_store("WhatDoTheyKnow")
+
+    assert records_df["Request URL"].tolist() == ["https://www.whatdotheyknow.com/request/newer", "https://www.whatdotheyknow.com/request/older"]
+    assert records_df["Status"].tolist() == ["Successful", "Successful"]
+    assert len(scraper.load_records_from_store()) == 3
+
+
+def test_record_without_url_keyed_by_content(workdir):
+    record = make_record("")
+    key = scraper.record_key(record)
+    assert key.startswith("sha1:")
+    assert key == scraper.record_key(dict(record, Status="Refused")) # status isn't part of the key, so updates the same record
+
+    scraper.upsert_records([record], "run1")
+    assert scraper.delete_records([key]) == 1
+    assert scraper.load_records_from_store().empty
+
+
+def test_outputs_merge_records_across_runs(workdir):
+    record_wdtk_term("adoption", [
+        wdtk_listing("adoption_orders", "Adoption orders", "Kent County Council", "2023-05-01", "Awaiting response"),
+        wdtk_listing("adoption_support", "Adoption support", "Leeds City Council", "2023-06-01"),
+    ])
+    run_main("scrape", "--offline", "--sources", "WhatDoTheyKnow", "--terms", "adoption")
+
+    # next run's results no longer list Leeds' request, and Kent's has been answered
+    record_wdtk_term("adoption", [wdtk_listing("adoption_orders", "Adoption orders", "Kent County Council", "2023-05-01", "Successful")])
+    run_main("scrape", "--offline", "--sources", "WhatDoTheyKnow", "--terms", "adoption")
+
+    with open(scraper.SUMMARY_CSV_FILE, newline="", encoding="utf-8") as f:
+        statuses = {row["Request URL"]: row["Status"] for row in csv.DictReader(f)}
+    assert statuses == {"https://www.whatdotheyknow.com/request/adoption_orders": "Successful",
+                        "https://www.whatdotheyknow.com/request/adoption_support": "Successful"}
+
+
+def summary_rows(filename=scraper.SUMMARY_CSV_FILE):
+    with open(filename, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_regenerate_on_fresh_checkout_keeps_published_records(workdir):
+    shutil.copy(PUBLISHED_CSV, scraper.SUMMARY_CSV_FILE) # as committed, no state/ yet
+    published = summary_rows(PUBLISHED_CSV)
+
+    run_main("regenerate")
+
+    rows = summary_rows()
+    assert len(rows) == len(published)
+    assert collections.Counter((row["Source"], row["Request URL"]) for row in rows) == collections.Counter(
+        (row["Source"], row["Request URL"]) for row in published)
+    assert stored_runs(published[0]["Request URL"])[0][1] == "published"
+
+    with open(os.path.join(scraper.SEARCH_INDEX_DIR, "manifest.json"), encoding="utf-8") as f:
+        assert json.load(f)["records"] == len(published)
+    with open(os.path.join(scraper.SITE_SHARD_DIR, "a.md"), encoding="utf-8") as f:
+        assert "Aberdeen City Council" in f.read()
+
+
+def test_subset_scrape_on_fresh_store_keeps_published_sources(workdir):
+    shutil.copy(PUBLISHED_CSV, scraper.SUMMARY_CSV_FILE)
+    published_sources = collections.Counter(row["Source"] for row in summary_rows(PUBLISHED_CSV))
+    record_wdtk_term("adoption", [wdtk_listing("new_adoption_request", "Adoption orders 2025", "Kent County Council", "2025-05-01")])
+
+    run_main("scrape", "--offline", "--sources", "WhatDoTheyKnow", "--terms", "adoption")
+
+    sources = collections.Counter(row["Source"] for row in summary_rows())
+    assert sources["Hastings Council"] == published_sources["Hastings Council"]
+    assert sources["WhatDoTheyKnow"] == published_sources["WhatDoTheyKnow"] + 1
+
+
+def test_no_records_dont_replace_published_outputs(workdir, monkeypatch):
+    shutil.copy(PUBLISHED_CSV, scraper.SUMMARY_CSV_FILE)
+    with open(scraper.SUMMARY_CSV_FILE, "rb") as f:
+        published = f.read()
+
+    scraper.build_outputs({"WhatDoTheyKnow": pd.DataFrame()})
+
+    with open(scraper.SUMMARY_CSV_FILE, "rb") as f:
+        assert f.read() == published
+    assert not os.path.exists(scraper.SITE_SHARD_DIR)
+
+    monkeypatch.setattr(scraper, "ALLOW_EMPTY_OUTPUTS", True) # --allow-empty-outputs
+    scraper.build_outputs({"WhatDoTheyKnow": pd.DataFrame()})
+
+    assert summary_rows() == []
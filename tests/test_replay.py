@@ -0,0 +1,70 @@
+import csv
+import json
+import os
+
+import foi_csc_scrape_tool as scraper
+from conftest import FakeResponse, FakeSession, record_hastings_year, record_wdtk_term, run_main, wdtk_listing
+
+
+def read_summary_csv():
+    with open(scraper.SUMMARY_CSV_FILE, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_record_mode_saves_fixtures_replay_serves_them(workdir, monkeypatch):
+    url = "https://foi.example.org/search/adoption?page=1"
+
+    session = FakeSession(FakeResponse(200, b"<html>recorded</html>"))
+    monkeypatch.setitem(scraper.RATE_LIMITS, "foi.example.org", {"rate": 1000, "burst": 10})
+    monkeypatch.setattr(scraper, "get_http_session", lambda: session)
+    monkeypatch.setattr(scraper, "HTTP_MODE", "record")
+    assert scraper.fetch_page(url) == b"<html>recorded</html>"
+
+    with open(os.path.join(scraper.FIXTURES_DIR, "index.jsonl"), encoding="utf-8") as f:
+        assert [json.loads(line)["url"] for line in f] == [url]
+
+    # replay never touches the network
+    monkeypatch.setattr(scraper, "get_http_session", lambda: None)
+    monkeypatch.setattr(scraper, "HTTP_MODE", "replay")
+    assert scraper.fetch_page(url) == b"<html>recorded</html>"
+    assert scraper.fetch_page(url + "&page=2") is None # not recorded, treated as no such page
+    assert scraper.FETCH_STATS["requests"] == 1
+    assert scraper.FETCH_STATS["bytes_replayed"] == len(b"<html>recorded</html>")
+
+
+def test_offline_scrape_from_fixtures(workdir):
+    record_wdtk_term("care leavers", [
+        wdtk_listing("leaving_care_grants", "Leaving care grants", "Kent County Council", "2023-05-01", foi_id=1001),
+        wdtk_listing("care_leaver_housing", "Care leaver housing", "Leeds City Council", "2024-02-11", foi_id=1002),
+        wdtk_listing("school_care_leavers", "Care leavers at school", "Some Primary School", "2024-03-01", foi_id=1003),
+    ])
+    record_wdtk_term("adoption", [
+        wdtk_listing("adoption_orders", "Adoption orders", "Kent County Council", "2022-01-20", "Awaiting classification", foi_id=1004),
+        wdtk_listing("care_leaver_housing", "Care leaver housing", "Leeds City Council", "2024-02-11", foi_id=1002),
+    ])
+    record_hastings_year(2023, [("FOIR-2023001", "Adoption support", "1 May 2023", "Information not held"),
+                                ("FOIR-2023002", "Parking permits", "2 May 2023", "Provided")])
+
+    run_main("scrape", "--offline", "--terms", "care leavers", "adoption")
+
+    rows = {row["Request URL"]: row for row in read_summary_csv()}
+    assert sorted(rows) == [
+        "https://www.hastings.gov.uk/my-council/freedom-of-information/date/?id=FOIR-2023001",
+        "https://www.whatdotheyknow.com/request/adoption_orders",
+        "https://www.whatdotheyknow.com/request/care_leaver_housing",
+        "https://www.whatdotheyknow.com/request/leaving_care_grants",
+    ] # school excluded, Hastings request not matching a term not fetched
+
+    housing = rows["https://www.whatdotheyknow.com/request/care_leaver_housing"]
+    assert (housing["Authority Name"], housing["Request Date"], housing["FOIR"]) == ("Leeds City Council", "11/02/2024", "1002")
+    assert (housing["Search Term"], housing["Matched Terms"]) == ("care leavers", "care leavers; adoption")
+
+    kent = rows["https://www.whatdotheyknow.com/request/adoption_orders"]
+    assert (kent["Status"], kent["CSC FOIs on this LA"]) == ("Awaiting classification", "2")
+
+    hastings = rows["https://www.hastings.gov.uk/my-council/freedom-of-information/date/?id=FOIR-2023001"]
+    assert (hastings["Source"], hastings["Authority Name"], hastings["Status"], hastings["Request Date"], hastings["FOIR"]) == (
+        "Hastings Council", "Hastings Borough Council", "Information not held", "01/05/2023", "2023001")
+
+    assert scraper.FETCH_STATS["requests"] == 0 # all pages replayed
+    assert os.path.exists(os.path.join(scraper.SITE_SHARD_DIR, "k.md"))
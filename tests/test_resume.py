@@ -0,0 +1,147 @@
+import os
+import threading
+
+import pytest
+
+import foi_csc_scrape_tool as scraper
+from conftest import record_hastings_year, record_wdtk_term, run_main, wdtk_listing, wdtk_search_url
+
+AUTHORITIES = ["Kent County Council", "Leeds City Council", "Barnet Council", "Bristol City Council", "Essex County Council"]
+TERMS = ["care leavers", "adoption"]
+
+
+class Crash(BaseException):
+    """Process dying mid-run, not an error the scrape handles (as it does a source failing)."""
+
+
+def record_pages():
+    for term, count in [("care leavers", 12), ("adoption", 8)]:
+        record_wdtk_term(term, [
+            wdtk_listing(f"{term.replace(' ', '_')}_{i}", f"{term.title()} question {i}", AUTHORITIES[i % len(AUTHORITIES)],
+                         f"202{i % 4}-0{1 + i % 9}-1{i % 9}", foi_id=1000 + i)
+            for i in range(count)
+        ])
+    record_hastings_year(2023, [(f"FOIR-2023{i:03d}", f"Care leavers support {i}", f"{1 + i} May 2023", "Provided") for i in range(3)])
+    record_hastings_year(2022, [(f"FOIR-2022{i:03d}", f"Adoption panel {i}", f"{1 + i} June 2022", "Refused") for i in range(2)])
+
+
+class CrashingFetch:
+    """fetch_page that notes urls it returned content for, and crashes on crash_url and every fetch after it."""
+
+    def __init__(self, fetch_page):
+        self.fetch_page = fetch_page
+        self.crash_url = None
+        self.crashed = False
+        self.urls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url, *args, **kwargs):
+        with self.lock:
+            self.crashed = self.crashed or url == self.crash_url
+            if self.crashed:
+                raise Crash(url)
+        content = self.fetch_page(url, *args, **kwargs)
+        if content is not None:
+            with self.lock:
+                self.urls.append(url)
+        return content
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    crashing_fetch = CrashingFetch(scraper.fetch_page)
+    monkeypatch.setattr(scraper, "fetch_page", crashing_fetch)
+    return crashing_fetch
+
+
+def test_resumed_run_matches_uninterrupted_run(workdir, fetched, monkeypatch):
+    os.makedirs("full/docs/downloads")
+    monkeypatch.chdir("full")
+    record_pages()
+    run_main("scrape", "--offline", "--terms", *TERMS)
+    with open(scraper.SUMMARY_CSV_FILE, encoding="utf-8") as f:
+        uninterrupted_csv = f.read()
+    all_pages = len(fetched.urls)
+
+    os.makedirs("../resumed/docs/downloads")
+    monkeypatch.chdir("../resumed")
+    record_pages()
+    fetched.urls.clear()
+    fetched.crash_url = wdtk_search_url("care leavers", 3) # term's last page
+    with pytest.raises(Crash):
+        run_main("scrape", "--offline", "--terms", *TERMS)
+    crashed_run_id = scraper.RUN_ID
+    fetched_before_crash = list(fetched.urls)
+    assert not os.path.exists(scraper.SUMMARY_CSV_FILE)
+
+    # killed mid-write of its last checkpoint line
+    with open(scraper.CHECKPOINT_FILE, "a", encoding="utf-8") as f:
+        f.write('{"unit": ["WhatDoTheyKnow", "adoption", 7], "da')
+
+    fetched.urls.clear()
+    fetched.crash_url, fetched.crashed = None, False
+    run_main("scrape", "--offline", "--resume")
+
+    assert scraper.RUN_ID == crashed_run_id # same run, with the crashed run's terms
+    with open(scraper.SUMMARY_CSV_FILE, encoding="utf-8") as f:
+        assert f.read() == uninterrupted_csv
+    assert not os.path.exists(scraper.CHECKPOINT_FILE) # outputs written, nothing left to resume
+
+    # results pages completed before the crash weren't fetched again
+    wdtk_pages = [url for url in fetched_before_crash if url.startswith(scraper.BASE_URLS["WhatDoTheyKnow"])]
+    assert wdtk_search_url("care leavers", 1) in wdtk_pages
+    assert not set(wdtk_pages) & set(fetched.urls)
+    assert len(fetched.urls) < all_pages
+
+
+def test_resume_without_checkpoint_starts_new_run(workdir):
+    record_pages()
+
+    run_main("scrape", "--offline", "--resume", "--sources", "WhatDoTheyKnow", "--terms", "adoption")
+
+    with open(scraper.SUMMARY_CSV_FILE, encoding="utf-8") as f:
+        assert sum(1 for _ in f) == 1 + 8
+    assert not os.path.exists(scraper.CHECKPOINT_FILE)
+
+
+def test_checkpoint_drops_half_written_line(workdir):
+    checkpoint = scraper.ScrapeCheckpoint(scraper.CHECKPOINT_FILE)
+    checkpoint.start({"run_id": "run1"})
+    checkpoint.complete(("WhatDoTheyKnow", "adoption", 1), {"urls": ["u1"]})
+    checkpoint.file.write(b'{"unit": ["WhatDoTheyKnow", "adoption", 2], "data": {"ur')
+    checkpoint.file.close()
+
+    resumed = scraper.ScrapeCheckpoint(scraper.CHECKPOINT_FILE)
+    assert resumed.resume() == {"run_id": "run1"}
+    assert resumed.get("WhatDoTheyKnow", "adoption", 1) == {"urls": ["u1"]}
+    assert resumed.get("WhatDoTheyKnow", "adoption", 2) is None
+
+    # carries on appending on a line of its own
+    resumed.complete(("WhatDoTheyKnow", "adoption", 2), {"urls": ["u2"]})
+    resumed.file.close()
+    again = scraper.ScrapeCheckpoint(scraper.CHECKPOINT_FILE)
+    again.resume()
+    assert again.get("WhatDoTheyKnow", "adoption", 2) == {"urls": ["u2"]}
+    again.clear()
+
+
+def test_checkpoint_reads_unit_data_back_from_file(workdir):
+    checkpoint = scraper.ScrapeCheckpoint(scraper.CHECKPOINT_FILE)
+    checkpoint.start({"run_id": "run1"})
+    page = {"urls": ["u1"], "records": [{"Request URL": "u1", "Request Title": "Adoption orders"}]}
+    checkpoint.complete(("WhatDoTheyKnow", "adoption", 1), page)
+    checkpoint.complete(("HastingsCouncil", 2023, "end"), {"foi_ids": []})
+    checkpoint.complete(("WhatDoTheyKnow", "adoption", "end"), {"reached_end": True})
+
+    assert all(isinstance(offset, int) for offset in checkpoint.units.values()) # keys + file offsets only, no records
+    assert checkpoint.done("WhatDoTheyKnow", "adoption", 1) and not checkpoint.done("WhatDoTheyKnow", "adoption", 2)
+    assert checkpoint.get("WhatDoTheyKnow", "adoption", 1) == page
+    assert list(checkpoint.unit_data("WhatDoTheyKnow")) == [
+        (("WhatDoTheyKnow", "adoption", 1), page), (("WhatDoTheyKnow", "adoption", "end"), {"reached_end": True})]
+    checkpoint.file.close()
+
+    resumed = scraper.ScrapeCheckpoint(scraper.CHECKPOINT_FILE)
+    resumed.resume()
+    assert resumed.get("HastingsCouncil", 2023, "end") == {"foi_ids": []}
+    assert list(resumed.unit_data("WhatDoTheyKnow"))[0] == (("WhatDoTheyKnow", "adoption", 1), page)
+    resumed.clear()
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+import foi_csc_scrape_tool as scraper
+
+OUT_DIR = "search_index"
+RECORDS = [
+    ["Adoption of the IHRA definition", "Kent County Council", "Successful", "01/05/2023", "https://www.whatdotheyknow.com/request/ihra"],
+    ["Adoption support allowances", "Leeds City Council", "Refused", "02/06/2022", "https://www.whatdotheyknow.com/request/adoption_support"],
+    ["Care leavers housing", "Kent County Council", "Successful", "", "https://www.whatdotheyknow.com/request/care_leavers"],
+]
+
+
+def frame(records=RECORDS):
+    return pd.DataFrame(records, columns=["Request Title", "Authority Name", "Status", "Request Date", "Request URL"])
+
+
+def record_id(url):
+    # as the site links a result back to its record, sha1 of the record key (its url)
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+
+
+def load(path):
+    with open(os.path.join(OUT_DIR, path), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def lookup(token):
+    """Record ids for a token, as foi-search.js looks it up (terms shard named by the token's first 2 chars)."""
+    if not os.path.exists(os.path.join(OUT_DIR, "terms", f"{token[:2]}.json")):
+        return set()
+    return set(load(f"terms/{token[:2]}.json").get(token, []))
+
+
+def test_tokens_sharded_by_prefix_records_by_id(workdir):
+    scraper.build_search_index(frame(), out_dir=OUT_DIR)
+
+    # every token in the shard its first 2 chars name, so the client knows which shard to fetch
+    for name in os.listdir(os.path.join(OUT_DIR, "terms")):
+        assert all(token[:2] == name[:-5] for token in load(f"terms/{name}"))
+
+    ihra, adoption_support, care_leavers = (record_id(record[4]) for record in RECORDS)
+    assert lookup("adoption") == {ihra, adoption_support}
+    assert lookup("kent") & lookup("adoption") == {ihra}
+    assert lookup("year:2022") == {adoption_support}
+    assert lookup("status:successful") == {ihra, care_leavers}
+    assert lookup("of") == set() and lookup("the") == set() # stopwords
+    assert set(load("terms/le.json")) == {"leavers", "leeds"}
+
+    # record details in the shard named by the id's first char, in the order the client reads them
+    assert load(f"records/{ihra[0]}.json")[ihra] == RECORDS[0]
+    assert sum(len(load(f"records/{name}")) for name in os.listdir(os.path.join(OUT_DIR, "records"))) == 3
+
+    manifest = load("manifest.json")
+    assert manifest["records"] == 3
+    assert set(manifest["shards"]) == {f"{folder}/{name}" for folder in ["terms", "records"] for name in os.listdir(os.path.join(OUT_DIR, folder))}
+
+
+def test_only_changed_shards_rewritten(workdir):
+    scraper.build_search_index(frame(), out_dir=OUT_DIR)
+    assert scraper.build_search_index(frame(), out_dir=OUT_DIR)["written"] == []
+
+    changes = scraper.build_search_index(frame(RECORDS[:2]), out_dir=OUT_DIR) # care leavers request gone
+
+    assert "terms/ho.json" in changes["removed"] # housing was the only token of its shard
+    assert not os.path.exists(os.path.join(OUT_DIR, "terms", "ho.json"))
+    assert "terms/le.json" in changes["written"] # leavers dropped, leeds kept
+    assert set(load("terms/le.json")) == {"leeds"}
+    assert "terms/ad.json" not in changes["written"] # adoption ids unchanged
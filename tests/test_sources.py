@@ -0,0 +1,49 @@
+import csv
+
+import foi_csc_scrape_tool as scraper
+from conftest import record_hastings_year, record_wdtk_term, run_main, wdtk_listing
+
+KENT_URL = "https://www.whatdotheyknow.com/request/adoption_orders"
+LEEDS_URL = "https://www.whatdotheyknow.com/request/adoption_support"
+HASTINGS_URL = "https://www.hastings.gov.uk/my-council/freedom-of-information/date/?id=FOIR-2023001"
+
+
+def record_sources(wdtk_slugs=("adoption_orders",)):
+    authorities = {"adoption_orders": "Kent County Council", "adoption_support": "Leeds City Council"}
+    record_wdtk_term("adoption", [wdtk_listing(slug, f"Adoption {slug}", authorities[slug], foi_id=1001 + i) for i, slug in enumerate(wdtk_slugs)])
+    record_hastings_year(2023, [("FOIR-2023001", "Adoption support", "1 May 2023", "Information not held")])
+
+
+def summary_sources():
+    with open(scraper.SUMMARY_CSV_FILE, newline="", encoding="utf-8") as f:
+        return {row["Request URL"]: row["Source"] for row in csv.DictReader(f)}
+
+
+def test_source_timing_out_leaves_other_sources_intact(workdir, monkeypatch):
+    record_sources()
+    run_main("scrape", "--offline", "--terms", "adoption")
+    assert set(summary_sources()) == {KENT_URL, HASTINGS_URL}
+
+    # a new WhatDoTheyKnow request, while Hastings is already past its deadline
+    record_sources(wdtk_slugs=("adoption_support", "adoption_orders"))
+    monkeypatch.setattr(scraper.SOURCE_ADAPTERS["HastingsCouncil"], "timeout", -1)
+    run_main("scrape", "--offline", "--terms", "adoption")
+
+    assert "SourceTimeoutError" in scraper.SOURCE_ERRORS["HastingsCouncil"]
+    assert set(scraper.SOURCE_ERRORS) == {"HastingsCouncil"}
+    assert summary_sources() == {
+        LEEDS_URL: "WhatDoTheyKnow", KENT_URL: "WhatDoTheyKnow", HASTINGS_URL: "Hastings Council", # Hastings from the previous run
+    }
+
+
+def test_source_raising_leaves_other_sources_intact(workdir, monkeypatch):
+    record_sources(wdtk_slugs=("adoption_support", "adoption_orders"))
+
+    def broken_fetch_records(*args, **kwargs):
+        raise RuntimeError("results page layout changed")
+
+    monkeypatch.setattr(scraper.SOURCE_ADAPTERS["WhatDoTheyKnow"], "fetch_records", broken_fetch_records)
+    run_main("scrape", "--offline", "--terms", "adoption")
+
+    assert scraper.SOURCE_ERRORS == {"WhatDoTheyKnow": "RuntimeError('results page layout changed')"}
+    assert summary_sources() == {HASTINGS_URL: "Hastings Council"}
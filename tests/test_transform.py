@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+import foi_csc_scrape_tool as scraper
+from conftest import PUBLISHED_CSV
+
+HTML_COLUMNS = ["FOIR", "Status", "Request Date", "CSC FOIs on this LA", "Authority Name", "Request Title", "LAs with same Request", "Request URL", "SSD-FOIR"]
+
+
+def row_by_row_transform(df):
+    """transform_foi_data_list_format as it was before being vectorised, per LA lambda + iterrows."""
+
+    df = df.sort_values(by=["Authority Name", "Request Date"], ascending=[True, False])
+    return (
+        df.groupby(["Authority Name", "CSC FOIs on this LA"], as_index=False)
+        .apply(
+            lambda x: pd.Series({
+                "FOI Requests": "<ul>" + "".join([
+                    f'<li><b>{row["Request Date"]}</b>: {row["Status"]} - {row["Request Title"]} '
+                    f'({int(row["LAs with same Request"]) if not pd.isna(row["LAs with same Request"]) else 0} requests) '
+                    f'<a href="{row["Request URL"]}" target="_blank">View FOI</a></li>'
+                    for _, row in x.sort_values(by="Request Date", ascending=False).iterrows()
+                ]) + "</ul>"
+            }),
+            include_groups=False
+        )
+        .reset_index(drop=True)
+    )
+
+
+def assert_same_html(df):
+    expected = row_by_row_transform(df)
+    actual = scraper.transform_foi_data_list_format(df)
+
+    assert list(actual.columns) == ["Authority Name", "CSC FOIs on this LA", "FOI Requests"]
+    assert actual["Authority Name"].tolist() == expected["Authority Name"].tolist()
+    assert actual["CSC FOIs on this LA"].tolist() == expected["CSC FOIs on this LA"].tolist()
+    assert "".join(actual["FOI Requests"]).encode("utf-8") == "".join(expected["FOI Requests"]).encode("utf-8")
+    assert actual["FOI Requests"].tolist() == expected["FOI Requests"].tolist()
+
+
+def test_published_summary_byte_identical():
+    df = pd.read_csv(PUBLISHED_CSV, keep_default_na=False, na_values=[""])
+    for column in ["FOIR", "Status", "Request Date", "Authority Name", "Request Title", "Request URL", "SSD-FOIR"]:
+        df[column] = df[column].fillna("").astype(str)
+
+    assert len(df) > 1000
+    assert_same_html(df[HTML_COLUMNS])
+
+
+def test_date_ties_and_missing_counts_byte_identical():
+    df = pd.DataFrame({
+        "FOIR": ["1", "2", "3", "4", "5", "6"],
+        "Status": ["Successful", "Refused", "Successful", "Long overdue", "Successful", "Partially successful"],
+        "Request Date": ["01/05/2023", "01/05/2023", "12/11/2022", "01/05/2023", "30/01/2024", "01/05/2023"],
+        "CSC FOIs on this LA": [4, 4, 4, 4, 2, 2],
+        "Authority Name": ["Kent County Council"] * 4 + ["Leeds City Council"] * 2,
+        "Request Title": ["Adoption & fostering", "Care <leavers>", "Caseloads", "Caseloads 2", "SEND", "CIN"],
+        "LAs with same Request": [3, None, 1.0, 2, 5, float("nan")],
+        "Request URL": [f"https://www.whatdotheyknow.com/request/r{i}" for i in range(6)],
+        "SSD-FOIR": [""] * 6,
+    })
+
+    assert_same_html(df)
+
+
+@pytest.mark.parametrize("categorical", [False, True])
+def test_categorical_columns_same_html(categorical):
+    df = pd.read_csv(PUBLISHED_CSV, keep_default_na=False, na_values=[""], nrows=300)[HTML_COLUMNS]
+    df = df.fillna({"Status": "", "Request Date": "", "Request Title": "", "Request URL": ""})
+    expected = row_by_row_transform(df)
+
+    if categorical:
+        df = scraper.categorise_columns(df) # as records are held through the pipeline
+    assert scraper.transform_foi_data_list_format(df)["FOI Requests"].tolist() == expected["FOI Requests"].tolist()
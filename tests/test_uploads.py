@@ -0,0 +1,95 @@
+import csv
+import os
+
+import foi_csc_scrape_tool as scraper
+from conftest import run_main
+
+UPLOAD_HEADER = ["FOI Ref", "Date Received", "Authority Name", " request  title ", "Notes"]
+
+
+def write_upload(path, rows, header=UPLOAD_HEADER):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def ingest(manifest):
+    stale_keys = []
+    records = list(scraper.ingest_la_uploads(scraper.UPLOADS_DIR, manifest, stale_keys))
+    return records, stale_keys
+
+
+def test_read_upload_maps_columns_and_skips_bad_rows(workdir):
+    write_upload("uploads/kent.csv", [
+        ["K1", "01/03/2024", "Kent County Council", "Care leavers housing", "ignored"],
+        ["K2", "2024-03-02", "Kent County Council", "Adoption support", ""],
+        ["K3", "sometime", "Kent County Council", "Bad date", ""],
+        ["K4", "01/03/2024", "", "No authority", ""],
+        ["", "", "", "", ""],
+    ])
+
+    records = scraper.read_la_upload("uploads/kent.csv")
+
+    assert [(record["FOIR"], record["Request Date"], record["Request Title"]) for record in records] == [
+        ("K1", "01/03/2024", "Care leavers housing"), ("K2", "02/03/2024", "Adoption support")]
+    assert records[0]["Source"] == "LA Submitted"
+
+
+def test_unchanged_files_skipped_changed_files_reingested(workdir):
+    write_upload("uploads/kent.csv", [["K1", "01/03/2024", "Kent County Council", "Care leavers housing", ""]])
+    write_upload("uploads/leeds/2024.csv", [["L1", "05/03/2024", "Leeds City Council", "Adoption support", ""],
+                                            ["L2", "06/03/2024", "Leeds City Council", "Fostering allowances", ""]])
+    manifest = {}
+
+    records, _ = ingest(manifest)
+    assert len(records) == 3
+    assert sorted(manifest) == ["uploads/kent.csv", "uploads/leeds/2024.csv"]
+
+    # nothing changed
+    assert ingest(manifest) == ([], [])
+
+    # touched, same content, skipped by hash (and manifest mtime updated)
+    os.utime("uploads/kent.csv", (1, 1))
+    assert ingest(manifest) == ([], [])
+    assert manifest["uploads/kent.csv"]["mtime"] == 1
+
+    # one row replaced, only that file re-read, its dropped row is stale
+    write_upload("uploads/leeds/2024.csv", [["L1", "05/03/2024", "Leeds City Council", "Adoption support", ""]])
+    records, stale_keys = ingest(manifest)
+    assert [record["FOIR"] for record in records] == ["L1"]
+    assert len(stale_keys) == 1
+    assert stale_keys[0] == scraper.record_key({"Source": "LA Submitted", "Authority Name": "Leeds City Council",
+                                                "Request Title": "Fostering allowances", "Request Date": "06/03/2024", "FOIR": "L2"})
+
+    # file removed, all its rows stale
+    os.remove("uploads/kent.csv")
+    records, stale_keys = ingest(manifest)
+    assert records == []
+    assert len(stale_keys) == 1
+    assert "uploads/kent.csv" not in manifest
+
+
+def test_invalid_file_recorded_not_retried_until_changed(workdir):
+    write_upload("uploads/bad.csv", [["Kent", "01/03/2024"]], header=["Council", "Date"])
+    manifest = {}
+
+    assert ingest(manifest) == ([], [])
+    assert "missing column(s) Authority Name, Request Title" in manifest["uploads/bad.csv"]["error"]
+    assert ingest(manifest) == ([], [])
+
+
+def test_scrape_stores_uploads_and_drops_removed_rows(workdir):
+    write_upload("uploads/kent.csv", [["K1", "01/03/2024", "Kent County Council", "Care leavers housing", ""],
+                                      ["K2", "02/03/2024", "Kent County Council", "Adoption support", ""]])
+    run_main("scrape", "--offline", "--sources", "LASubmitted")
+    assert len(scraper.load_records_from_store("LA Submitted")) == 2
+
+    write_upload("uploads/kent.csv", [["K1", "01/03/2024", "Kent County Council", "Care leavers housing", ""]])
+    os.utime("uploads/kent.csv", (2, 2)) # rewritten within the same second as the first run's copy
+    run_main("scrape", "--offline", "--sources", "LASubmitted")
+
+    assert scraper.load_records_from_store("LA Submitted")["FOIR"].tolist() == ["K1"]
+    with open(scraper.SUMMARY_CSV_FILE, newline="", encoding="utf-8") as f:
+        assert [row["FOIR"] for row in csv.DictReader(f)] == ["K1"]
@@ -0,0 +1,144 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import foi_csc_scrape_tool as scraper
+from conftest import record_wdtk_term, run_main, wdtk_listing, wdtk_search_url
+
+
+@pytest.fixture
+def replayed(workdir, monkeypatch):
+    """Replay mode, urls of the pages requested (recorded or not) in request order."""
+
+    monkeypatch.setattr(scraper, "HTTP_MODE", "replay")
+    requested = []
+    load_fixture = scraper.load_fixture
+
+    def recording_load_fixture(url):
+        requested.append(url)
+        return load_fixture(url)
+
+    monkeypatch.setattr(scraper, "load_fixture", recording_load_fixture)
+    return requested
+
+
+def listings(term, count):
+    return [wdtk_listing(f"{term}_{i}", f"{term} request {i}", "Kent County Council", foi_id=1000 + i) for i in range(count)]
+
+
+def scrape_term(term, max_pages=None):
+    with ThreadPoolExecutor(max_workers=scraper.PAGE_WORKERS) as page_executor:
+        return scraper.scrape_whatdotheyknow_term(term, scraper.BASE_URLS["WhatDoTheyKnow"], max_pages, page_executor=page_executor)
+
+
+def test_fan_out_fetches_pages_up_to_total(replayed):
+    record_wdtk_term("adoption", listings("adoption", 23))
+
+    urls, reached_end = scrape_term("adoption")
+
+    assert reached_end
+    assert urls == [f"https://www.whatdotheyknow.com/request/adoption_{i}" for i in range(23)] # result order
+    assert sorted(replayed) == sorted(wdtk_search_url("adoption", page) for page in range(1, 6)) # nothing past page 5
+
+
+def test_over_estimated_total_costs_at_most_one_batch(replayed):
+    record_wdtk_term("adoption", listings("adoption", 12), total="about 2,000")
+
+    urls, reached_end = scrape_term("adoption")
+
+    assert reached_end # stopped on the short page 3
+    assert len(urls) == 12
+    assert len(replayed) <= 1 + scraper.PAGE_WORKERS
+
+
+def test_under_estimated_total_paginates_to_short_page(replayed, monkeypatch):
+    monkeypatch.setattr(scraper, "PAGE_WORKERS", 2)
+    record_wdtk_term("adoption", listings("adoption", 33), total="about 10")
+
+    urls, reached_end = scrape_term("adoption")
+
+    assert reached_end
+    assert len(urls) == 33 # 7 pages, in batches of 2 past the 2 pages the total gives
+
+
+def test_page_size_from_listings_not_parsed_results(replayed):
+    # an unparseable listing (no link) still counts towards its page's size, so page 2 isn't taken for the last page
+    broken = '<div class="request_listing"><span class="head">withdrawn</span></div>'
+    record_wdtk_term("adoption", listings("adoption", 9) + [broken] + listings("fostering", 5))
+
+    urls, reached_end = scrape_term("adoption")
+
+    assert reached_end
+    assert len(urls) == 14
+
+
+def test_fan_out_stops_at_max_pages(replayed):
+    record_wdtk_term("adoption", listings("adoption", 40))
+
+    urls, reached_end = scrape_term("adoption", max_pages=3)
+
+    assert not reached_end
+    assert len(urls) == 15
+    assert len(replayed) == 3
+
+
+def test_request_attributed_to_first_matching_term(replayed):
+    shared = wdtk_listing("shared", "Adoption and fostering allowances", "Kent County Council", foi_id=999)
+    record_wdtk_term("adoption", listings("adoption", 5) + [shared]) # page 2
+    record_wdtk_term("fostering", [shared] + listings("fostering", 2))
+
+    records = {}
+    for record in scraper.scrape_whatdotheyknow(["adoption", "fostering"], scraper.BASE_URLS["WhatDoTheyKnow"], None):
+        records[record["Request URL"]] = record # latest version wins
+
+    assert len(records) == 8
+    shared_record = records["https://www.whatdotheyknow.com/request/shared"]
+    assert (shared_record["Search Term"], shared_record["Matched Terms"]) == ("adoption", "adoption; fostering")
+    assert scraper.TERM_OVERLAP["fostering"] == {"requests": 3, "unique": 2, "overlap_pct": 33.3}
+
+
+def test_term_overlap_in_run_report(workdir):
+    shared = wdtk_listing("shared", "Adoption and fostering allowances", "Kent County Council", foi_id=999)
+    record_wdtk_term("adoption", listings("adoption", 2) + [shared])
+    record_wdtk_term("fostering", [shared])
+
+    run_main("scrape", "--offline", "--sources", "WhatDoTheyKnow", "--terms", "adoption", "fostering")
+
+    with open(scraper.RUN_REPORT_FILE, encoding="utf-8") as f:
+        report = json.loads(f.readlines()[-1])
+    assert report["term_overlap"] == {
+        "adoption": {"requests": 3, "unique": 2, "overlap_pct": 33.3},
+        "fostering": {"requests": 1, "unique": 0, "overlap_pct": 100.0},
+    }
+
+
+def test_records_written_as_pages_complete(replayed, monkeypatch):
+    monkeypatch.setattr(scraper, "STORE_BATCH_SIZE", 1)
+    record_wdtk_term("adoption", listings("adoption", 12))
+    last_page = wdtk_search_url("adoption", 3)
+    load_fixture = scraper.load_fixture
+    written_before_last_page = {}
+
+    def raw_rows():
+        with open(scraper.RAW_RECORDS_FILE, encoding="utf-8") as f:
+            return sum(1 for _ in f) - 1 # less header
+
+    def written():
+        return {"raw": raw_rows(), "stored": len(scraper.load_records_from_store("WhatDoTheyKnow"))}
+
+    def slow_last_page(url):
+        if url == last_page:
+            # earlier pages' records are in the raw csv + store while the term is still being scraped
+            deadline = time.monotonic() + 5
+            while written() != {"raw": 10, "stored": 10} and time.monotonic() < deadline:
+                time.sleep(0.01)
+            written_before_last_page.update(written())
+        return load_fixture(url)
+
+    monkeypatch.setattr(scraper, "load_fixture", slow_last_page)
+    run_main("scrape", "--offline", "--sources", "WhatDoTheyKnow", "--terms", "adoption")
+
+    assert written_before_last_page == {"raw": 10, "stored": 10}
+    assert raw_rows() == 12